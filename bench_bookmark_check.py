@@ -0,0 +1,149 @@
+"""
+bench_bookmark_check.py
+
+Benchmark for bookmark_cleanup's link checkers against a local HTTP server
+with randomised latency.
+
+Starts an aiohttp server in a background thread, generates synthetic
+bookmarks spread across several loopback "hosts" (127.0.0.1 … 127.0.0.N,
+all served by the same socket) plus some on unresolvable and refusing
+hosts, then runs the threaded requests checker
+(check_all_threaded) and the asyncio checker (check_all_async) over the
+same set and reports URLs/sec, the peak number of simultaneous requests
+any one host saw, and whether both engines produced the same
+OK/DEAD/SUSPECT labels.
+
+Usage:
+    python bench_bookmark_check.py                  # 2000 URLs, 20 hosts
+    python bench_bookmark_check.py --urls 10000 --hosts 50 --max-latency 0.8
+    python bench_bookmark_check.py --skip-threads   # async engine only
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+
+# bookmark_cleanup reads these at import time (browser profile paths)
+os.environ.setdefault("LOCALAPPDATA", ".")
+os.environ.setdefault("USERPROFILE", ".")
+
+import aiohttp
+from aiohttp import web
+
+import bookmark_cleanup as bc
+
+# Path suffix -> response status; everything else is 200
+STATUS_PATHS = {"gone": 404, "removed": 410, "blocked": 403, "broken": 500}
+
+
+class LatencyServer:
+    """aiohttp app on 0.0.0.0:port answering every path after a random delay."""
+
+    def __init__(self, port: int, min_latency: float, max_latency: float):
+        self.port        = port
+        self.min_latency = min_latency
+        self.max_latency = max_latency
+        self.active: dict[str, int] = defaultdict(int)   # host -> requests in progress
+        self.peak:   dict[str, int] = defaultdict(int)   # host -> max seen
+        self.ready  = threading.Event()
+
+    async def handle(self, request: web.Request) -> web.Response:
+        host = request.host.split(":")[0]
+        self.active[host] += 1
+        self.peak[host] = max(self.peak[host], self.active[host])
+        try:
+            await asyncio.sleep(random.uniform(self.min_latency, self.max_latency))
+            kind = request.path.rsplit("/", 1)[-1]
+            return web.Response(status=STATUS_PATHS.get(kind, 200), text="ok")
+        finally:
+            self.active[host] -= 1
+
+    def run(self) -> None:
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        app = web.Application()
+        app.router.add_route("*", "/{tail:.*}", self.handle)
+        runner = web.AppRunner(app, access_log=None)
+        loop.run_until_complete(runner.setup())
+        loop.run_until_complete(web.TCPSite(runner, "0.0.0.0", self.port, backlog=4096).start())
+        self.ready.set()
+        loop.run_forever()
+
+
+def make_entries(n: int, hosts: int, port: int) -> list[dict]:
+    """
+    Synthetic merged.json entries: a few percent dead/blocked/broken pages,
+    plus about 3% on unresolvable (.invalid) hosts and 1% on a closed port.
+    """
+    rng = random.Random(42)
+    kinds = ["page"] * 90 + ["gone"] * 4 + ["removed"] + ["blocked"] * 3 + ["broken"] * 2
+    entries = []
+    for i in range(n):
+        roll = rng.random()
+        if roll < 0.03:
+            url = f"http://gone-{rng.randint(1, 5)}.invalid/bm/{i}"
+        elif roll < 0.04:
+            url = f"http://127.0.0.1:1/bm/{i}"
+        else:
+            url = f"http://127.0.0.{rng.randint(1, hosts)}:{port}/bm/{i}/{rng.choice(kinds)}"
+        entries.append({"url": url, "title": f"Bookmark {i}"})
+    return entries
+
+
+def run_engine(name: str, entries: list[dict], server: LatencyServer) -> dict:
+    """Run one checker over entries; return {url: status} and print throughput."""
+    server.peak.clear()
+    labels: dict[str, str] = {}
+
+    def record(entry, status, detail):
+        labels[entry["url"]] = status
+
+    start = time.perf_counter()
+    if name == "threads":
+        bc.check_all_threaded(entries, record)
+    else:
+        asyncio.run(bc.check_all_async(entries, record))
+    elapsed = time.perf_counter() - start
+
+    peak = max(server.peak.values(), default=0)
+    print(f"  {name:8s}: {len(entries) / elapsed:9,.1f} URLs/sec  "
+          f"({elapsed:6.1f}s, peak {peak} concurrent per host)  {dict(Counter(labels.values()))}")
+    return labels
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("--urls", type=int, default=2000)
+    parser.add_argument("--hosts", type=int, default=20)
+    parser.add_argument("--port", type=int, default=8791)
+    parser.add_argument("--min-latency", type=float, default=0.05)
+    parser.add_argument("--max-latency", type=float, default=0.5)
+    parser.add_argument("--skip-threads", action="store_true",
+                        help="Only time the async engine")
+    args = parser.parse_args()
+
+    server = LatencyServer(args.port, args.min_latency, args.max_latency)
+    threading.Thread(target=server.run, daemon=True).start()
+    server.ready.wait()
+
+    entries = make_entries(args.urls, args.hosts, args.port)
+    print(f"{args.urls} URLs on {args.hosts} hosts, latency "
+          f"{args.min_latency}-{args.max_latency}s "
+          f"(threads: {bc.HTTP_WORKERS}; async: {bc.ASYNC_MAX_IN_FLIGHT} max, "
+          f"{bc.ASYNC_PER_HOST}/host)")
+
+    async_labels = run_engine("async", entries, server)
+    if not args.skip_threads:
+        thread_labels = run_engine("threads", entries, server)
+        diffs = sum(1 for url, s in thread_labels.items() if async_labels.get(url) != s)
+        print(f"  label differences between engines: {diffs}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,140 @@
+"""
+bench_bookmark_classify.py
+
+Benchmark for bookmark_organize.classify against the original linear
+rule scan it replaced.
+
+Generates synthetic check_results entries whose folders are drawn from the
+TAXONOMY_RULES prefixes (in original and mixed case, with and without
+deeper sub-levels), from unrelated folders, or are empty so the URL-based
+DOMAIN_FALLBACK routing applies. URLs mix fallback domains, their
+subdomains, fragments buried in paths and query strings, and unrelated
+hosts. Both classifiers run over the same entries; the script reports
+entries/sec for each and the number of entries where they disagree.
+
+Usage:
+    python bench_bookmark_classify.py                    # 100k entries
+    python bench_bookmark_classify.py --entries 500000 --seed 7
+    python bench_bookmark_classify.py --results check_results.json
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from urllib.parse import urlparse
+
+# bookmark_organize reads these at import time (browser profile paths)
+os.environ.setdefault("LOCALAPPDATA", ".")
+os.environ.setdefault("USERPROFILE", ".")
+
+import bookmark_organize as bo
+
+OTHER_FOLDERS = ["Recipes", "Music > Guitar", "Old Stuff", "Computers", "News > Local"]
+OTHER_HOSTS   = ["example.com", "news.ycombinator.com", "en.wikipedia.org",
+                 "notgoogle.com", "mygithub.io", "blog.example.org"]
+
+
+def classify_linear(entry):
+    """The pre-compilation classify(): one pass over every rule per entry."""
+    orig_chrome = bo.strip_root(entry.get("folder_chrome", "") or "")
+    orig_brave  = bo.strip_root(entry.get("folder_brave", "") or "")
+    orig = orig_chrome or orig_brave
+
+    for prefix, new_folder in bo.TAXONOMY_RULES:
+        if orig == prefix or orig.startswith(prefix + " > "):
+            return new_folder + orig[len(prefix):]
+        if orig.lower() == prefix.lower() or orig.lower().startswith(prefix.lower() + " > "):
+            return new_folder + orig[len(prefix):]
+
+    url    = entry.get("url", "").lower()
+    domain = urlparse(url).netloc.lower()
+    for fragment, folder in bo.DOMAIN_FALLBACK:
+        if fragment in domain or fragment in url:
+            return folder
+    return "Misc"
+
+
+def random_case(text: str, rng: random.Random) -> str:
+    return "".join(c.upper() if rng.random() < 0.3 else c.lower() for c in text)
+
+
+def make_folder(rng: random.Random) -> str:
+    roll = rng.random()
+    if roll < 0.45:
+        prefix = rng.choice(bo.TAXONOMY_RULES)[0]
+        if rng.random() < 0.2:
+            prefix = random_case(prefix, rng)
+        if rng.random() < 0.5:
+            prefix += " > Sub" + str(rng.randint(1, 20))
+        return rng.choice(["Bookmarks bar > ", "Bookmarks > ", ""]) + prefix
+    if roll < 0.6:
+        return "Bookmarks bar > " + rng.choice(OTHER_FOLDERS)
+    return rng.choice(["", "Bookmarks bar", "Bookmarks"])
+
+
+def make_url(rng: random.Random, i: int) -> str:
+    roll = rng.random()
+    if roll < 0.6:
+        host = rng.choice(bo.DOMAIN_FALLBACK)[0]
+        if "." not in host:
+            host += ".com"
+        if rng.random() < 0.3:
+            host = "www." + host
+        return f"https://{host}/page/{i}"
+    if roll < 0.7:
+        buried = rng.choice(bo.DOMAIN_FALLBACK)[0]
+        return f"https://{rng.choice(OTHER_HOSTS)}/search?q={buried}&n={i}"
+    return f"https://{rng.choice(OTHER_HOSTS)}/item/{i}"
+
+
+def make_entries(count: int, seed: int) -> list:
+    rng = random.Random(seed)
+    entries = []
+    for i in range(count):
+        folder = make_folder(rng)
+        chrome, brave = (folder, "") if rng.random() < 0.7 else ("", folder)
+        entries.append({"url": make_url(rng, i), "title": f"Bookmark {i}",
+                        "folder_chrome": chrome, "folder_brave": brave})
+    return entries
+
+
+def timed(label: str, func, entries: list) -> list:
+    start = time.perf_counter()
+    out = [func(e) for e in entries]
+    elapsed = time.perf_counter() - start
+    print(f"  {label:9s} {elapsed:7.3f}s  {len(entries) / elapsed:12,.0f} entries/sec")
+    return out
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("--entries", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--results", help="Classify a real check_results.json instead")
+    args = parser.parse_args()
+
+    if args.results:
+        with open(args.results, "r", encoding="utf-8") as fh:
+            entries = json.load(fh)
+        print(f"{len(entries)} entries from {args.results}")
+    else:
+        entries = make_entries(args.entries, args.seed)
+        print(f"{len(entries)} synthetic entries ({len(bo.TAXONOMY_RULES)} path rules, "
+              f"{len(bo.DOMAIN_FALLBACK)} domain rules)")
+
+    linear   = timed("linear", classify_linear, entries)
+    compiled = timed("compiled", bo.classify, entries)
+
+    diffs = [(e, a, b) for e, a, b in zip(entries, linear, compiled) if a != b]
+    print(f"  differences: {len(diffs)}")
+    for entry, a, b in diffs[:10]:
+        print(f"    {entry['url']} [{entry['folder_chrome'] or entry['folder_brave']}]: "
+              f"{a!r} != {b!r}")
+    return 1 if diffs else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
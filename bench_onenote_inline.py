@@ -0,0 +1,163 @@
+"""
+bench_onenote_inline.py
+
+Benchmark and equivalence check for the inline HTML → Markdown step of
+onenote_converter (the content of every <one:T> run).
+
+Compares the single-pass _InlineMarkdownParser path now used by
+ContentConverter._html_to_markdown() against the previous nine-regex
+implementation (frozen below as legacy_html_to_markdown) and reports
+runs/sec for each plus any run whose output differs.
+
+Usage:
+    python bench_onenote_inline.py                     # built-in sample runs
+    python bench_onenote_inline.py page1.xml page2.xml # recorded pages
+    python bench_onenote_inline.py --repeat 50 *.xml
+
+Recorded pages are raw GetPageContent XML, e.g. as saved by
+dump_page_xml.py.  Differences are expected only for markup the legacy
+regexes got wrong (nested spans, spans carrying several styles).
+"""
+
+import argparse
+import html as html_mod
+import re
+import sys
+import time
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+from onenote_converter import ONE_NS, ContentConverter
+
+# Representative <one:T> payloads as OneNote 2016/2021 emits them
+SAMPLE_RUNS = [
+    "Plain paragraph text with no markup at all.",
+    "Meeting notes  for the   quarterly review",
+    "<span style='font-weight:bold'>Action items</span>",
+    "Call <span style='font-style:italic'>before</span> Friday &amp; confirm",
+    "<a href=\"https://example.com/a?b=1&amp;c=2\">Example link</a> for details",
+    "<span style='font-weight:bold'>Bold</span> then <span "
+    "style='text-decoration:line-through'>struck</span> text",
+    "<span lang=en-US style='font-family:Calibri;font-weight:bold'>Heading-ish</span>",
+    "<b>old-style</b> and <i>tags</i> and <strong>strong</strong> <em>em</em>",
+    "Price &lt; 10 &gt; 5 &nbsp;non-breaking",
+    "<a href='onenote:#Page&amp;section-id={X}'>Internal <span "
+    "style='font-weight:bold'>link</span></a>",
+    "<span style='color:#C00000'>red text</span> stays plain",
+    "<span style='font-weight:bold'>outer <span style='color:red'>inner</span> tail</span>",
+    "<span style='font-weight:bold;font-style:italic'>both styles</span>",
+]
+
+
+# ---------------------------------------------------------------------------
+# Legacy implementation (the nine-regex version, kept for comparison)
+# ---------------------------------------------------------------------------
+
+def _strip_html_tags(html_str: str) -> str:
+    """Remove every HTML tag from *html_str*, leaving only text content."""
+    return re.sub(r"<[^>]+>", "", html_str)
+
+
+def legacy_html_to_markdown(html_str: str) -> str:
+    """The pre-tokenizer ContentConverter._html_to_markdown(), verbatim."""
+    s = html_str
+    s = re.sub(
+        r'<a\s+[^>]*href=["\']([^"\']*)["\'][^>]*>(.*?)</a>',
+        lambda m: f"[{_strip_html_tags(m.group(2))}]({m.group(1)})",
+        s, flags=re.IGNORECASE | re.DOTALL,
+    )
+    s = re.sub(
+        r"<span\s+[^>]*font-weight\s*:\s*bold[^>]*>(.*?)</span>",
+        lambda m: f"**{_strip_html_tags(m.group(1))}**",
+        s, flags=re.IGNORECASE | re.DOTALL,
+    )
+    s = re.sub(
+        r"<(?:b|strong)\b[^>]*>(.*?)</(?:b|strong)>",
+        lambda m: f"**{m.group(1)}**",
+        s, flags=re.IGNORECASE | re.DOTALL,
+    )
+    s = re.sub(
+        r"<span\s+[^>]*font-style\s*:\s*italic[^>]*>(.*?)</span>",
+        lambda m: f"*{_strip_html_tags(m.group(1))}*",
+        s, flags=re.IGNORECASE | re.DOTALL,
+    )
+    s = re.sub(
+        r"<(?:i|em)\b[^>]*>(.*?)</(?:i|em)>",
+        lambda m: f"*{m.group(1)}*",
+        s, flags=re.IGNORECASE | re.DOTALL,
+    )
+    s = re.sub(
+        r"<span\s+[^>]*text-decoration\s*:\s*line-through[^>]*>(.*?)</span>",
+        lambda m: f"~~{_strip_html_tags(m.group(1))}~~",
+        s, flags=re.IGNORECASE | re.DOTALL,
+    )
+    s = _strip_html_tags(s)
+    s = html_mod.unescape(s)
+    s = re.sub(r" {2,}", " ", s).strip()
+    return s
+
+
+# ---------------------------------------------------------------------------
+# Benchmark
+# ---------------------------------------------------------------------------
+
+def load_runs(xml_paths: list[Path]) -> list[str]:
+    """Return the stripped text of every <one:T> element in the given pages."""
+    runs: list[str] = []
+    t_tag = f"{{{ONE_NS}}}T"
+    for path in xml_paths:
+        root = ET.parse(path).getroot()
+        for t_el in root.iter(t_tag):
+            raw = (t_el.text or "").strip()
+            if raw:
+                runs.append(raw)
+    return runs
+
+
+def time_runs(func, runs: list[str], repeat: int) -> float:
+    """Return runs/sec for calling func on every run, *repeat* times over."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for run in runs:
+            func(run)
+    elapsed = time.perf_counter() - start
+    return len(runs) * repeat / elapsed if elapsed else float("inf")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("xml_files", nargs="*", type=Path,
+                        help="Recorded GetPageContent XML files")
+    parser.add_argument("--repeat", type=int, default=0,
+                        help="Passes over the run set (default: auto)")
+    args = parser.parse_args()
+
+    runs = load_runs(args.xml_files) if args.xml_files else list(SAMPLE_RUNS)
+    if not runs:
+        print("No <one:T> runs found.")
+        return 1
+    repeat = args.repeat or max(1, 200_000 // len(runs))
+
+    converter = ContentConverter(Path("."), Path("."), "bench")
+    new_func  = converter._html_to_markdown
+
+    # --- Equivalence check ---
+    diffs = [(r, legacy_html_to_markdown(r), new_func(r)) for r in runs
+             if legacy_html_to_markdown(r) != new_func(r)]
+
+    # --- Throughput ---
+    legacy_rate = time_runs(legacy_html_to_markdown, runs, repeat)
+    new_rate    = time_runs(new_func, runs, repeat)
+
+    source = f"{len(args.xml_files)} file(s)" if args.xml_files else "built-in samples"
+    print(f"Runs: {len(runs)} from {source}, {repeat} passes")
+    print(f"  legacy regex   : {legacy_rate:12,.0f} runs/sec")
+    print(f"  tokenizer      : {new_rate:12,.0f} runs/sec  ({new_rate / legacy_rate:.2f}x)")
+    print(f"  identical      : {len(runs) - len(diffs)}/{len(runs)}")
+    for run, old, new in diffs:
+        print(f"\n  input  : {run}\n  legacy : {old}\n  new    : {new}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
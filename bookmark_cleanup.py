@@ -4,20 +4,37 @@ bookmark_cleanup.py
 Phases:
   --phase merge   : parse Chrome + Brave Bookmarks, union-merge, save merged.json
   --phase check   : HTTP-check every URL in merged.json, save check_results.json
+                    (asyncio + aiohttp with per-host limits when installed,
+                    else a thread pool; --engine picks one explicitly).
+                    Results are cached in check_cache.jsonl as they arrive:
+                    recent OKs are skipped (--ttl), DEAD/SUSPECT rechecked on
+                    a backoff schedule, --resume continues an interrupted run.
   --phase report  : print dead/suspect/ok summary from check_results.json
   --phase write   : read approved_final.json, build tree, write to both browsers
+  --phase vault   : write live bookmarks from check_results.json to the vault,
+                    filed by bookmark_organize's taxonomy (--folder limits it),
+                    as one note per bookmark plus folder MOCs (--vault-style
+                    notes) or as MOC link lists only (--vault-style moc).
+                    Page title/description/og:image are fetched concurrently
+                    for OK pages only, cached in meta_cache.jsonl, and files
+                    are rewritten only when their content changed.
 """
 
 import argparse          # CLI argument parsing
+import asyncio           # Async link checker event loop
+import hashlib           # Disambiguate colliding vault note names
 import json              # Bookmarks files are JSON
 import os                # File paths, environment variables
+import socket            # gaierror = DNS failure in the async checker
 import sys               # Exit on fatal errors
 import time              # Timestamp for progress display
 import re                # Regex for URL/title keyword matching
+import threading         # Per-host limits in the threaded metadata fetcher
 from collections import defaultdict  # Domain clustering
 from concurrent.futures import ThreadPoolExecutor, as_completed  # Parallel HTTP checks
 from pathlib import Path  # Path manipulation
-from urllib.parse import urlparse  # Parse URL components for domain extraction
+from html.parser import HTMLParser  # <head> metadata for vault notes
+from urllib.parse import urljoin, urlparse  # Parse URL components for domain extraction
 
 import requests  # HTTP requests for link validity checking
 from requests.exceptions import (
@@ -28,6 +45,14 @@ from requests.exceptions import (
     RequestException                        # Base class for all requests errors
 )
 
+from obsidian_yaml import yaml_quote  # Frontmatter values for vault notes
+from url_canon import UrlIndex, dedup_key, strip_tracking  # URL dedup for merge/check
+
+try:
+    import aiohttp  # Async HTTP client for the high-concurrency checker (optional)
+except ImportError:
+    aiohttp = None  # phase_check falls back to the thread pool
+
 # ─── Constants ────────────────────────────────────────────────────────────────
 
 # Browser Bookmarks file paths
@@ -41,12 +66,32 @@ WORK_DIR = Path(os.environ["USERPROFILE"]) / "bookmark_work"
 MERGED_JSON       = WORK_DIR / "merged.json"         # union of all bookmarks
 CHECK_RESULTS     = WORK_DIR / "check_results.json"  # HTTP check outcomes
 APPROVED_FINAL    = WORK_DIR / "approved_final.json" # user-edited approved set
+CHECK_CACHE       = WORK_DIR / "check_cache.jsonl"   # per-page check history (append-only)
 
 # HTTP check settings
 HTTP_TIMEOUT      = 10     # seconds per request
 HTTP_WORKERS      = 25     # concurrent threads
 HTTP_MAX_RETRIES  = 1      # retry count on timeout/connection error
 
+# Check result cache: OK results are trusted for CHECK_TTL_DAYS; DEAD/SUSPECT
+# results are rechecked after RECHECK_BASE_HOURS, doubling per repeat failure
+CHECK_TTL_DAYS     = 30
+RECHECK_BASE_HOURS = 12
+
+# Async checker settings (used when aiohttp is installed)
+ASYNC_MAX_IN_FLIGHT = 1000  # open connections across all hosts
+ASYNC_PER_HOST      = 4     # open connections to any one host
+
+# Host pre-probe: each distinct host is resolved (and TCP-probed) once per run
+HOST_PROBE_CONCURRENCY = 64   # simultaneous DNS lookups / TCP probes
+
+# getaddrinfo errors meaning the name definitely doesn't exist (NXDOMAIN / no
+# address), as opposed to a transient failure (EAI_AGAIN) worth an HTTP retry.
+# 11001/11004 are Winsock's WSAHOST_NOT_FOUND / WSANO_DATA.
+DNS_NOT_FOUND_ERRNOS = {
+    getattr(socket, name) for name in ("EAI_NONAME", "EAI_NODATA") if hasattr(socket, name)
+} | {11001, 11004}
+
 # Fake browser User-Agent to avoid bot-rejection false positives
 USER_AGENT = (
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
@@ -61,6 +106,22 @@ SKIP_SCHEMES = {"chrome", "chrome-extension", "edge", "brave", "file", "data",
 # Status codes that firmly indicate a dead link
 DEAD_CODES = {404, 410}
 
+# ─── Vault export (--phase vault) ────────────────────────────────────────────
+
+# Vault folder for bookmark notes and folder MOCs; created if absent
+VAULT_BOOKMARKS = Path(r"C:\Users\awt\Sync\Obsidian\01\Bookmarks")
+
+META_CACHE     = WORK_DIR / "meta_cache.jsonl"    # per-page metadata (append-only)
+VAULT_MANIFEST = WORK_DIR / "vault_manifest.json" # note and MOC paths written (for renames/pruning)
+
+# Page metadata fetching: only the <head> is needed, so reads stop early
+META_MAX_IN_FLIGHT = 200          # simultaneous fetches across all hosts (per-host: ASYNC_PER_HOST)
+META_MAX_BYTES     = 256 * 1024   # bytes of HTML read per page at most
+META_TTL_DAYS      = 30           # refetch cached metadata older than this
+
+# Characters Windows / Obsidian won't accept in note and folder names
+UNSAFE_FILENAME_RE = re.compile(r'[<>:"/\\|?*#^\[\]\x00-\x1f]')
+
 # ─── Phase 1: Parse & Merge ───────────────────────────────────────────────────
 
 def walk_tree(node, folder_path, entries, browser_name):
@@ -115,63 +176,73 @@ def parse_bookmarks(file_path, browser_name):
     return entries
 
 
+def richer_title(t1, t2):
+    """Return the longer of two titles, preferring non-generic ones."""
+    generic = {"New Tab", "Untitled", ""}
+    if t1 in generic and t2 not in generic:
+        return t2
+    if t2 in generic and t1 not in generic:
+        return t1
+    return t1 if len(t1) >= len(t2) else t2
+
+
+def prefer_https(existing, url):
+    """Switch a merged entry to url if it is the https variant of an http URL."""
+    if existing["url"].lower().startswith("http:") and url.lower().startswith("https:"):
+        existing["url"] = url
+
+
 def union_merge(chrome_entries, brave_entries):
     """
     Produce a deduplicated union of two bookmark lists.
-    Dedup key = normalized URL (lowercased, trailing-slash stripped).
+    Dedup key = url_canon.dedup_key() (scheme, www., tracking parameters,
+    fragments, default ports and query order don't matter); the stored URL
+    is the first one seen with tracking parameters stripped, and otherwise
+    as bookmarked (its https form if any variant used https).
     When both browsers have the same URL, prefer the longer/more-descriptive title
-    and keep both folder paths for organization analysis.
+    and keep both folder paths for organization analysis.  Duplicates inside
+    one browser collapse the same way, keeping the first folder.
     Returns a list of merged bookmark dicts.
     """
-    # Build lookup by normalized URL for Chrome entries
-    seen = {}  # normalized_url -> merged entry dict
-
-    def normalize_url(url):
-        """Strip trailing slash and lowercase scheme+host for dedup comparison."""
-        return url.rstrip("/").lower()
-
-    def richer_title(t1, t2):
-        """Return the longer of two titles, preferring non-generic ones."""
-        generic = {"New Tab", "Untitled", ""}
-        if t1 in generic and t2 not in generic:
-            return t2
-        if t2 in generic and t1 not in generic:
-            return t1
-        return t1 if len(t1) >= len(t2) else t2
+    seen = UrlIndex()  # dedup_key -> merged entry dict
 
     for entry in chrome_entries:
-        key = normalize_url(entry["url"])
         merged = {
-            "url":              entry["url"],
+            "url":              strip_tracking(entry["url"]),
             "title":            entry["title"],
             "folder_chrome":    entry["folder"],
             "folder_brave":     "",
             "date_added":       entry["date_added"],
             "source":           "chrome",
         }
-        seen[key] = merged
+        existing = seen.add(entry["url"], merged)
+        if existing is not None:
+            # Same page bookmarked twice in Chrome — keep one, best title
+            existing["title"] = richer_title(existing["title"], entry["title"])
+            prefer_https(existing, merged["url"])
 
     for entry in brave_entries:
-        key = normalize_url(entry["url"])
-        if key in seen:
-            # URL exists in both — merge metadata
-            existing = seen[key]
-            existing["title"]        = richer_title(existing["title"], entry["title"])
-            existing["folder_brave"] = entry["folder"]
-            existing["source"]       = "both"
+        existing = seen.get(entry["url"])
+        if existing is not None:
+            # URL exists already — merge metadata
+            existing["title"] = richer_title(existing["title"], entry["title"])
+            prefer_https(existing, strip_tracking(entry["url"]))
+            if not existing["folder_brave"]:
+                existing["folder_brave"] = entry["folder"]
+            if existing["source"] == "chrome":
+                existing["source"] = "both"
         else:
             # Brave-only entry
-            merged = {
-                "url":              entry["url"],
+            seen.add(entry["url"], {
+                "url":              strip_tracking(entry["url"]),
                 "title":            entry["title"],
                 "folder_chrome":    "",
                 "folder_brave":     entry["folder"],
                 "date_added":       entry["date_added"],
                 "source":           "brave",
-            }
-            seen[key] = merged
+            })
 
-    return list(seen.values())
+    return seen.values()
 
 
 def phase_merge():
@@ -194,6 +265,7 @@ def phase_merge():
     total  = len(merged)
 
     print(f"\nMerge summary:")
+    print(f"  Input bookmark entries : {len(chrome_entries) + len(brave_entries)}")
     print(f"  Total unique bookmarks : {total}")
     print(f"  In both browsers       : {both}")
     print(f"  Chrome-only            : {chrome}")
@@ -220,6 +292,21 @@ def phase_merge():
 
 # ─── Phase 2: HTTP Validity Check ────────────────────────────────────────────
 
+def status_for_code(code):
+    """
+    Classify a final HTTP status code.
+    Returns (status_label, detail); 5xx is SUSPECT (callers retry it first).
+    """
+    if code in DEAD_CODES:
+        return ("DEAD", str(code))
+    elif code >= 500:
+        return ("SUSPECT", f"HTTP {code}")
+    elif code == 403:
+        return ("SUSPECT", "HTTP 403 (bot-blocked?)")
+    else:
+        return ("OK", str(code))
+
+
 def check_url(entry):
     """
     Check a single URL for validity.
@@ -254,17 +341,10 @@ def check_url(entry):
 
             code = resp.status_code
 
-            if code in DEAD_CODES:
-                return (entry, "DEAD", str(code))
-            elif code >= 500:
-                if attempt <= HTTP_MAX_RETRIES:
-                    time.sleep(1)
-                    continue
-                return (entry, "SUSPECT", f"HTTP {code}")
-            elif code == 403:
-                return (entry, "SUSPECT", "HTTP 403 (bot-blocked?)")
-            else:
-                return (entry, "OK", str(code))
+            if code >= 500 and code not in DEAD_CODES and attempt <= HTTP_MAX_RETRIES:
+                time.sleep(1)
+                continue
+            return (entry, *status_for_code(code))
 
         except ReqSSLError as e:
             return (entry, "SUSPECT", f"SSL error: {str(e)[:80]}")
@@ -290,8 +370,365 @@ def check_url(entry):
     return (entry, "SUSPECT", "Unknown (retries exhausted)")
 
 
-def phase_check():
-    """Load merged.json, HTTP-check every URL, save check_results.json."""
+async def check_url_async(session, entry):
+    """
+    Async twin of check_url(): same HEAD-then-GET probing, retries and
+    OK/DEAD/SUSPECT/SKIP labels, using a shared aiohttp session.
+    Returns a tuple: (entry, status_label, http_code_or_error_msg)
+    """
+    url    = entry["url"]
+    scheme = urlparse(url).scheme.lower()
+
+    if scheme in SKIP_SCHEMES:
+        return (entry, "SKIP", scheme)
+
+    attempt = 0
+    while attempt <= HTTP_MAX_RETRIES:
+        attempt += 1
+        try:
+            # HEAD first; fall back to GET (headers only) if HEAD is refused with 405
+            async with session.head(url, allow_redirects=True, max_redirects=30) as resp:
+                code = resp.status
+            if code == 405:
+                async with session.get(url, allow_redirects=True, max_redirects=30) as resp:
+                    code = resp.status
+
+            if code >= 500 and code not in DEAD_CODES and attempt <= HTTP_MAX_RETRIES:
+                await asyncio.sleep(1)
+                continue
+            return (entry, *status_for_code(code))
+
+        except aiohttp.TooManyRedirects:
+            return (entry, "DEAD", "Redirect loop")
+        except (aiohttp.ClientSSLError, aiohttp.ServerFingerprintMismatch) as e:
+            return (entry, "SUSPECT", f"SSL error: {str(e)[:80]}")
+        except asyncio.TimeoutError:
+            if attempt <= HTTP_MAX_RETRIES:
+                continue
+            return (entry, "SUSPECT", "Timeout after retry")
+        except aiohttp.ClientConnectorError as e:
+            # DNS failure = dead; connection refused could be dead or down
+            if isinstance(e.os_error, socket.gaierror):
+                return (entry, "DEAD", "DNS failure")
+            if isinstance(e.os_error, ConnectionRefusedError):
+                return (entry, "DEAD", "Connection refused")
+            return (entry, "SUSPECT", f"Connection error: {str(e)[:80]}")
+        except (aiohttp.ClientError, ValueError) as e:
+            # ValueError: URL aiohttp can't parse (e.g. bad IDN label)
+            return (entry, "SUSPECT", f"Request error: {str(e)[:80]}")
+
+    return (entry, "SUSPECT", "Unknown (retries exhausted)")
+
+
+def host_port(url):
+    """(hostname, port) a URL connects to; None for URLs without a host."""
+    try:
+        parsed = urlparse(url)
+        host   = parsed.hostname
+        port   = parsed.port or (443 if parsed.scheme.lower() == "https" else 80)
+    except ValueError:
+        return None  # malformed port / netloc — leave it to the HTTP check
+    return (host, port) if host else None
+
+
+async def probe_host(host, port, resolve):
+    """
+    Resolve host once and try a TCP connect to each of its addresses in
+    turn until one accepts.  The host counts as refusing only if every
+    address refuses; any other failure (timeout, unreachable) is "unknown",
+    so an unreachable IPv6 address can't mark a working host DEAD.
+    resolve: async (host, port) -> list of IP strings (raises socket.gaierror)
+    Returns (health, detail): "ok", "nxdomain", "refused" or "unknown".
+    """
+    try:
+        addrs = await resolve(host, port)
+    except socket.gaierror as e:
+        if e.errno in DNS_NOT_FOUND_ERRNOS:
+            return ("nxdomain", "DNS failure")
+        return ("unknown", f"DNS error: {e}")
+    except (OSError, UnicodeError) as e:
+        return ("unknown", f"DNS error: {e}")
+    if not addrs:
+        return ("nxdomain", "DNS failure")
+
+    refused, error = 0, None
+    addrs = list(dict.fromkeys(addrs))   # getaddrinfo repeats addresses per protocol
+    for addr in addrs:
+        try:
+            _, writer = await asyncio.wait_for(
+                asyncio.open_connection(addr, port), HTTP_TIMEOUT
+            )
+        except ConnectionRefusedError:
+            refused += 1
+            continue
+        except (OSError, asyncio.TimeoutError) as e:
+            error = e
+            continue
+        writer.close()
+        return ("ok", addr)
+    if refused == len(addrs):
+        return ("refused", "Connection refused")
+    return ("unknown", f"Probe failed: {error}")
+
+
+async def short_circuit_dead_hosts(entries, on_result, resolve):
+    """
+    Probe every distinct (host, port) in entries once, concurrently.
+
+    URLs on hosts that don't resolve (NXDOMAIN) or refuse connections are
+    reported DEAD through on_result() right away — one lookup instead of
+    one failed request per bookmark.  Returns the entries still to check.
+    """
+    targets = {hp for hp in map(host_port, (e["url"] for e in entries)) if hp}
+    loop = asyncio.get_running_loop()
+    loop.set_default_executor(ThreadPoolExecutor(max_workers=HOST_PROBE_CONCURRENCY))
+    sem = asyncio.Semaphore(HOST_PROBE_CONCURRENCY)
+
+    async def limited(hp):
+        async with sem:
+            return hp, await probe_host(*hp, resolve)
+
+    health = dict(await asyncio.gather(*(limited(hp) for hp in targets)))
+
+    remaining = []
+    dead_urls = 0
+    for entry in entries:
+        state, detail = health.get(host_port(entry["url"]), ("ok", ""))
+        if state in ("nxdomain", "refused"):
+            on_result(entry, "DEAD", detail)
+            dead_urls += 1
+        else:
+            remaining.append(entry)
+
+    nx      = sum(1 for st, _ in health.values() if st == "nxdomain")
+    refused = sum(1 for st, _ in health.values() if st == "refused")
+    print(f"Probed {len(targets)} hosts for {len(entries)} URLs: {nx} unresolvable, "
+          f"{refused} refusing — {dead_urls} URLs marked DEAD without an HTTP request.\n")
+    return remaining
+
+
+async def getaddrinfo_ips(host, port):
+    """Plain asyncio resolver for probe_host(): list of IP strings for host."""
+    infos = await asyncio.get_running_loop().getaddrinfo(host, port, type=socket.SOCK_STREAM)
+    return [info[4][0] for info in infos]
+
+
+if aiohttp is not None:
+    class CachingResolver(aiohttp.ThreadedResolver):
+        """
+        aiohttp resolver that remembers successful lookups for the whole run,
+        so the host pre-probe's resolutions are reused by every request.
+        """
+
+        def __init__(self):
+            super().__init__()
+            self._resolved = {}   # (host, port, family) -> list of ResolveResult
+
+        async def resolve(self, host, port=0, family=socket.AF_INET):
+            key = (host, port, family)
+            if key not in self._resolved:
+                self._resolved[key] = await super().resolve(host, port, family)
+            return self._resolved[key]
+
+        async def resolve_ips(self, host, port):
+            """probe_host() adapter: resolve with the connector's family (any)."""
+            return [r["host"] for r in await self.resolve(host, port, socket.AF_UNSPEC)]
+
+
+async def check_all_async(entries, on_result):
+    """
+    Check every entry concurrently on one event loop.
+
+    A single TCPConnector is shared by all requests: keep-alive pools,
+    at most ASYNC_MAX_IN_FLIGHT open connections overall and ASYNC_PER_HOST
+    per host, so big sites queue behind their own cap instead of being
+    hammered.  Timeouts apply per connect/read, not to time spent queued.
+    Hosts are pre-probed once (short_circuit_dead_hosts) with the same
+    CachingResolver the connector uses, so live hosts are not looked up again.
+    on_result(entry, status, detail) is called as each check finishes.
+    """
+    resolver = CachingResolver()
+    entries  = await short_circuit_dead_hosts(entries, on_result, resolver.resolve_ips)
+    connector = aiohttp.TCPConnector(
+        limit=ASYNC_MAX_IN_FLIGHT,
+        limit_per_host=ASYNC_PER_HOST,
+        ssl=False,             # same as verify=False in the threaded checker
+        resolver=resolver,
+        family=socket.AF_UNSPEC,
+    )
+    timeout = aiohttp.ClientTimeout(
+        total=None, sock_connect=HTTP_TIMEOUT, sock_read=HTTP_TIMEOUT
+    )
+    async with aiohttp.ClientSession(
+        connector=connector, timeout=timeout, headers={"User-Agent": USER_AGENT}
+    ) as session:
+        tasks = [asyncio.create_task(check_url_async(session, e)) for e in entries]
+        for task in asyncio.as_completed(tasks):
+            on_result(*await task)
+
+
+def run_on_threads(func, items, on_result, workers=HTTP_WORKERS):
+    """
+    Call func(item) for every item on a thread pool, passing each result
+    tuple to on_result(*result) as it completes.  On Ctrl-C the queued
+    calls are cancelled (only those already running finish) before the
+    interrupt propagates, so callers can flush their caches promptly.
+    """
+    pool = ThreadPoolExecutor(max_workers=workers)
+    try:
+        futures = [pool.submit(func, item) for item in items]
+        for future in as_completed(futures):
+            on_result(*future.result())
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def check_all_threaded(entries, on_result):
+    """
+    Check every entry with check_url() on HTTP_WORKERS threads, after
+    short-circuiting URLs on unresolvable / refusing hosts.
+    """
+    entries = asyncio.run(short_circuit_dead_hosts(entries, on_result, getaddrinfo_ips))
+    run_on_threads(check_url, entries, on_result)
+
+
+class JsonlCache:
+    """
+    Append-only JSONL store of records keyed by one field (KEY_FIELD).
+
+    Each record is appended and flushed as soon as it is stored, so an
+    interrupted run loses nothing.  On load later lines win and a torn last
+    line is skipped; close() compacts the file to one line per key, after
+    any header_records().
+    """
+
+    KEY_FIELD = "url"
+
+    def __init__(self, path, ttl_days):
+        self.path     = path
+        self.ttl_secs = ttl_days * 86400
+        self.entries  = {}     # key -> latest record
+        self._fh      = None
+        if path.exists():
+            with open(path, "r", encoding="utf-8") as fh:
+                for line in fh:
+                    try:
+                        rec = json.loads(line)
+                    except ValueError:
+                        continue  # torn last line from an interrupted run
+                    self.load_record(rec)
+
+    def load_record(self, rec):
+        """Take one line read from the file; subclasses handle marker lines."""
+        if self.KEY_FIELD in rec:
+            self.entries[rec[self.KEY_FIELD]] = rec
+
+    def header_records(self):
+        """Lines kept ahead of the records when the file is compacted."""
+        return []
+
+    def open(self):
+        """Open the file for appending, if not already open."""
+        if self._fh is None:
+            self._fh = open(self.path, "a", encoding="utf-8")
+
+    def _append(self, rec):
+        self.open()
+        self._fh.write(json.dumps(rec, ensure_ascii=False) + "\n")
+        self._fh.flush()
+
+    def put(self, rec):
+        """Store and immediately persist one record."""
+        self.entries[rec[self.KEY_FIELD]] = rec
+        self._append(rec)
+
+    def close(self):
+        """Rewrite the file with one line per key."""
+        if self._fh:
+            self._fh.close()
+            self._fh = None
+        tmp = self.path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as fh:
+            for rec in self.header_records() + list(self.entries.values()):
+                fh.write(json.dumps(rec, ensure_ascii=False) + "\n")
+        os.replace(tmp, self.path)
+
+
+class CheckCache(JsonlCache):
+    """
+    Append-only JSONL history of link-check results (check_cache.jsonl).
+
+    One line per finished check: {"key", "url", "status", "detail",
+    "checked_at", "failures"} keyed by dedup_key, so any variant of a URL
+    finds the result; failures counts consecutive non-OK results.  A line
+    {"run_started": ts} marks the start of each --phase check run so
+    --resume can tell which URLs the interrupted run already covered.
+    Later lines win; the file is compacted to one line per key on close().
+    """
+
+    KEY_FIELD = "key"
+
+    def __init__(self, path, ttl_days=CHECK_TTL_DAYS):
+        self.run_started = None   # start time of the most recent run
+        super().__init__(path, ttl_days)
+
+    def load_record(self, rec):
+        if "run_started" in rec:
+            self.run_started = rec["run_started"]
+        else:
+            if "key" not in rec and "url" in rec:
+                rec["key"] = dedup_key(rec["url"])   # line from a URL-keyed cache
+            super().load_record(rec)
+
+    def header_records(self):
+        return [{"run_started": self.run_started}] if self.run_started is not None else []
+
+    def start_run(self, resume):
+        """Open for appending; a fresh run (not --resume) writes a new run marker."""
+        self.open()
+        if not resume or self.run_started is None:
+            self.run_started = time.time()
+            self._append({"run_started": self.run_started})
+
+    def is_fresh(self, key, resume, now):
+        """
+        True if the cached result for dedup_key key can be reused instead of
+        rechecking:
+          - --resume and it was checked during the interrupted run, or
+          - OK and younger than the TTL, or
+          - DEAD/SUSPECT and still inside its backoff window.
+        """
+        rec = self.entries.get(key)
+        if not rec:
+            return False
+        age = now - rec["checked_at"]
+        if resume and rec["checked_at"] >= self.run_started:
+            return True
+        if rec["status"] == "OK":
+            return age < self.ttl_secs
+        backoff = RECHECK_BASE_HOURS * 3600 * 2 ** max(0, rec.get("failures", 1) - 1)
+        return age < min(backoff, self.ttl_secs)
+
+    def record(self, key, url, status, detail):
+        """Store and immediately persist one finished check of url (dedup_key key)."""
+        prev = self.entries.get(key)
+        failures = 0
+        if status != "OK":
+            failures = prev.get("failures", 0) + 1 if prev and prev["status"] != "OK" else 1
+        self.put({"key": key, "url": url, "status": status, "detail": detail,
+                  "checked_at": time.time(), "failures": failures})
+
+
+def phase_check(engine="auto", resume=False, ttl_days=CHECK_TTL_DAYS):
+    """
+    Load merged.json, HTTP-check every URL, save check_results.json.
+    engine: "async" (aiohttp), "threads" (requests pool) or "auto" (async if installed)
+
+    Each result is appended to check_cache.jsonl as soon as it arrives, so an
+    interrupted run loses nothing.  URLs whose cached result is still fresh
+    (see CheckCache.is_fresh) are not requested again; resume=True also
+    reuses everything checked by the interrupted run.
+    """
     if not MERGED_JSON.exists():
         print(f"ERROR: {MERGED_JSON} not found. Run --phase merge first.")
         sys.exit(1)
@@ -303,32 +740,84 @@ def phase_check():
     to_check = [m for m in merged
                 if urlparse(m["url"]).scheme.lower() not in SKIP_SCHEMES]
     skip_count = len(merged) - len(to_check)
-    total      = len(to_check)
 
-    print(f"Checking {total} URLs ({skip_count} non-HTTP skipped)...")
-    print(f"Using {HTTP_WORKERS} threads, {HTTP_TIMEOUT}s timeout, {HTTP_MAX_RETRIES} retry.")
-    print("This will take several minutes. Progress shown below.\n")
+    # Check each distinct page once; results fan out to every entry sharing
+    # its dedup_key (merged.json files from before URL canonicalisation can
+    # still hold variants of the same URL)
+    groups = defaultdict(list)  # dedup_key -> entries
+    for m in to_check:
+        groups[dedup_key(m["url"])].append(m)
+    to_check  = [members[0] for members in groups.values()]
+    dup_count = sum(len(members) - 1 for members in groups.values())
 
-    results   = []
-    done      = 0
-    ok_count  = dead_count = suspect_count = 0
-
-    with ThreadPoolExecutor(max_workers=HTTP_WORKERS) as pool:
-        futures = {pool.submit(check_url, entry): entry for entry in to_check}
-        for future in as_completed(futures):
-            entry, status, detail = future.result()
-            result = {**entry, "status": status, "status_detail": detail}
-            results.append(result)
-            done += 1
+    # Reuse cached results that are still fresh
+    WORK_DIR.mkdir(exist_ok=True)
+    cache = CheckCache(CHECK_CACHE, ttl_days)
+    if resume and cache.run_started is None:
+        print("Nothing to resume — starting a fresh run.")
+    cache.start_run(resume)
+    now = time.time()
+    cached   = [m for m in to_check if cache.is_fresh(dedup_key(m["url"]), resume, now)]
+    cached_urls = {m["url"] for m in cached}
+    to_check = [m for m in to_check if m["url"] not in cached_urls]
+    total    = len(to_check)
+
+    if engine == "auto":
+        engine = "async" if aiohttp is not None else "threads"
+    if engine == "async" and aiohttp is None:
+        print("ERROR: --engine async needs aiohttp (pip install aiohttp).")
+        sys.exit(1)
 
-            if status == "OK":      ok_count      += 1
-            elif status == "DEAD":  dead_count    += 1
-            elif status == "SUSPECT": suspect_count += 1
+    print(f"Checking {total} URLs ({len(cached)} cached results reused, "
+          f"{dup_count} duplicate URLs folded, {skip_count} non-HTTP skipped)...")
+    if engine == "async":
+        print(f"Using asyncio: {ASYNC_MAX_IN_FLIGHT} connections max, {ASYNC_PER_HOST} per host, "
+              f"{HTTP_TIMEOUT}s timeout, {HTTP_MAX_RETRIES} retry.")
+    else:
+        print(f"Using {HTTP_WORKERS} threads, {HTTP_TIMEOUT}s timeout, {HTTP_MAX_RETRIES} retry.")
+    print("This will take several minutes. Progress shown below.\n")
 
-            # Progress line every 50 URLs
-            if done % 50 == 0 or done == total:
-                pct = done / total * 100
-                print(f"  {done}/{total} ({pct:.0f}%)  OK:{ok_count}  DEAD:{dead_count}  SUSPECT:{suspect_count}")
+    results   = []
+    counts    = {"done": 0, "OK": 0, "DEAD": 0, "SUSPECT": 0}
+    started   = time.time()
+
+    def fan_out(entry, status, detail):
+        """Add one result for every entry sharing entry's dedup_key."""
+        members = groups[dedup_key(entry["url"])]
+        for member in members:
+            results.append({**member, "status": status, "status_detail": detail})
+        if status in counts:
+            counts[status] += len(members)
+
+    def record(entry, status, detail):
+        """Collect and persist one result; print a progress line every 50 URLs."""
+        fan_out(entry, status, detail)
+        cache.record(dedup_key(entry["url"]), entry["url"], status, detail)
+        counts["done"] += 1
+        done = counts["done"]
+        if done % 50 == 0 or done == total:
+            pct = done / total * 100
+            print(f"  {done}/{total} ({pct:.0f}%)  OK:{counts['OK']}  "
+                  f"DEAD:{counts['DEAD']}  SUSPECT:{counts['SUSPECT']}")
+
+    try:
+        if engine == "async":
+            asyncio.run(check_all_async(to_check, record))
+        else:
+            check_all_threaded(to_check, record)
+    except KeyboardInterrupt:
+        cache.close()
+        print(f"\nInterrupted after {counts['done']}/{total} — "
+              f"run --phase check --resume to continue.")
+        sys.exit(130)
+    cache.close()
+    elapsed = time.time() - started
+
+    # Fold the reused cached results into the output and the summary
+    for m in cached:
+        rec = cache.entries[dedup_key(m["url"])]
+        fan_out(m, rec["status"], rec["detail"])
+    ok_count, dead_count, suspect_count = counts["OK"], counts["DEAD"], counts["SUSPECT"]
 
     # Also add back skipped entries as "SKIP"
     for m in merged:
@@ -339,7 +828,8 @@ def phase_check():
     with open(CHECK_RESULTS, "w", encoding="utf-8") as fh:
         json.dump(results, fh, ensure_ascii=False, indent=2)
 
-    print(f"\nDone. Results saved to {CHECK_RESULTS}")
+    rate = total / elapsed if elapsed else 0
+    print(f"\nDone in {elapsed:.0f}s ({rate:.1f} URLs/sec). Results saved to {CHECK_RESULTS}")
     print(f"\nSummary:")
     print(f"  OK      : {ok_count}")
     print(f"  DEAD    : {dead_count}")
@@ -537,6 +1027,478 @@ def phase_write():
     print(f"\nDone. {total} bookmarks in {len(bookmarks_by_folder)} folders written to both browsers.")
 
 
+# ─── Phase 5: Vault Export ────────────────────────────────────────────────────
+
+# <meta name=/property=> keys PageMetaParser keeps
+META_KEYS = {"description", "og:title", "og:description", "og:image",
+             "twitter:description", "twitter:image"}
+
+
+class PageMetaParser(HTMLParser):
+    """Collect <title> and the META_KEYS <meta> tags from a page's <head>."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.found  = {}     # "title" / meta key -> first value seen
+        self._title = None   # text pieces while inside <title>
+        self._done  = False  # set at </head> or <body>
+
+    def handle_starttag(self, tag, attrs):
+        if self._done:
+            return
+        if tag == "body":
+            self._done = True
+        elif tag == "title" and "title" not in self.found:
+            self._title = []
+        elif tag == "meta":
+            a = dict(attrs)
+            key = (a.get("property") or a.get("name") or "").lower()
+            if key in META_KEYS and a.get("content") and key not in self.found:
+                self.found[key] = " ".join(a["content"].split())
+
+    def handle_data(self, data):
+        if self._title is not None:
+            self._title.append(data)
+
+    def handle_endtag(self, tag):
+        if tag == "title" and self._title is not None:
+            self.found["title"] = " ".join("".join(self._title).split())
+            self._title = None
+        elif tag == "head":
+            self._done = True
+
+
+def decode_page(data, content_type):
+    """Decode HTML bytes using the Content-Type or <meta charset>, else UTF-8."""
+    m = re.search(r"charset=[\"']?([\w.:-]+)", content_type, re.I) \
+        or re.search(rb"<meta[^>]+charset=[\"']?([\w.:-]+)", data[:4096], re.I)
+    charset = m.group(1) if m else "utf-8"
+    if isinstance(charset, bytes):
+        charset = charset.decode("ascii")
+    try:
+        return data.decode(charset, errors="replace")
+    except LookupError:
+        return data.decode("utf-8", errors="replace")
+
+
+def parse_page_meta(html, base_url):
+    """
+    Return {"title", "description", "image"} from the <head> of html ("" where
+    absent). Open Graph tags win over <title> / description; a relative
+    og:image is resolved against base_url.
+    """
+    head_end = html.lower().find("</head>")
+    parser = PageMetaParser()
+    parser.feed(html if head_end < 0 else html[:head_end + 7])
+    parser.close()
+    f = parser.found
+    image = f.get("og:image") or f.get("twitter:image") or ""
+    return {
+        "title":       f.get("og:title") or f.get("title", ""),
+        "description": (f.get("og:description") or f.get("description")
+                        or f.get("twitter:description", "")),
+        "image":       urljoin(base_url, image) if image else "",
+    }
+
+
+EMPTY_META = {"title": "", "description": "", "image": ""}
+
+
+async def fetch_meta_async(session, entry):
+    """
+    GET entry's page (at most META_MAX_BYTES of it) and parse its metadata.
+    Non-HTML pages (PDFs, images) succeed with empty metadata.
+    Returns a tuple: (entry, meta_dict or None on failure, error detail)
+    """
+    url = entry["url"]
+    try:
+        async with session.get(url, allow_redirects=True, max_redirects=30) as resp:
+            if resp.status >= 400:
+                return (entry, None, f"HTTP {resp.status}")
+            ctype = resp.headers.get("Content-Type", "")
+            if ctype and "html" not in ctype.lower():
+                return (entry, dict(EMPTY_META), "")
+            data = b""
+            while len(data) < META_MAX_BYTES:
+                chunk = await resp.content.read(META_MAX_BYTES - len(data))
+                if not chunk:
+                    break
+                data += chunk
+            final_url = str(resp.url)
+    except asyncio.TimeoutError:
+        return (entry, None, "Timeout")
+    except (aiohttp.ClientError, ValueError) as e:
+        return (entry, None, f"Request error: {str(e)[:80]}")
+    return (entry, parse_page_meta(decode_page(data, ctype), final_url), "")
+
+
+class HostSlots:
+    """Per-host semaphores so the thread pool sends at most per_host requests to one host."""
+
+    def __init__(self, per_host):
+        self._sems = defaultdict(lambda: threading.Semaphore(per_host))
+        self._lock = threading.Lock()
+
+    def for_url(self, url):
+        with self._lock:
+            return self._sems[urlparse(url).hostname or ""]
+
+
+def fetch_meta(entry, slots):
+    """Threaded twin of fetch_meta_async() using requests; same return tuple."""
+    url = entry["url"]
+    with slots.for_url(url):
+        try:
+            with requests.get(url, headers={"User-Agent": USER_AGENT}, timeout=HTTP_TIMEOUT,
+                              allow_redirects=True, stream=True, verify=False) as resp:
+                if resp.status_code >= 400:
+                    return (entry, None, f"HTTP {resp.status_code}")
+                ctype = resp.headers.get("Content-Type", "")
+                if ctype and "html" not in ctype.lower():
+                    return (entry, dict(EMPTY_META), "")
+                data = b""
+                for chunk in resp.iter_content(64 * 1024):
+                    data += chunk
+                    if len(data) >= META_MAX_BYTES:
+                        break
+                final_url = resp.url
+        except RequestException as e:
+            return (entry, None, f"Request error: {str(e)[:80]}")
+    return (entry, parse_page_meta(decode_page(data[:META_MAX_BYTES], ctype), final_url), "")
+
+
+async def fetch_all_meta_async(entries, on_result):
+    """
+    Fetch metadata for every entry on one event loop: META_MAX_IN_FLIGHT
+    connections overall, ASYNC_PER_HOST per host.
+    on_result(entry, meta, detail) is called as each fetch finishes.
+    """
+    connector = aiohttp.TCPConnector(
+        limit=META_MAX_IN_FLIGHT, limit_per_host=ASYNC_PER_HOST, ssl=False
+    )
+    timeout = aiohttp.ClientTimeout(
+        total=None, sock_connect=HTTP_TIMEOUT, sock_read=HTTP_TIMEOUT
+    )
+    async with aiohttp.ClientSession(
+        connector=connector, timeout=timeout, headers={"User-Agent": USER_AGENT}
+    ) as session:
+        tasks = [asyncio.create_task(fetch_meta_async(session, e)) for e in entries]
+        for task in asyncio.as_completed(tasks):
+            on_result(*await task)
+
+
+def fetch_all_meta_threaded(entries, on_result):
+    """Fetch metadata with fetch_meta() on HTTP_WORKERS threads, ASYNC_PER_HOST per host."""
+    slots = HostSlots(ASYNC_PER_HOST)
+    run_on_threads(lambda entry: fetch_meta(entry, slots), entries, on_result)
+
+
+class MetaCache(JsonlCache):
+    """
+    Append-only JSONL of fetched page metadata (meta_cache.jsonl), one line
+    per successful fetch: {"key", "url", "title", "description", "image",
+    "fetched_at"} keyed by dedup_key.  Failed fetches aren't stored, so they
+    are retried next run.  Later lines win; close() compacts the file.
+    """
+
+    KEY_FIELD = "key"
+
+    def __init__(self, path, ttl_days=META_TTL_DAYS):
+        super().__init__(path, ttl_days)
+
+    def get(self, key, now):
+        """Cached metadata for key if younger than the TTL, else None."""
+        rec = self.entries.get(key)
+        if rec and now - rec["fetched_at"] < self.ttl_secs:
+            return rec
+        return None
+
+    def record(self, key, url, meta):
+        """Store and immediately persist one successful fetch."""
+        self.put({"key": key, "url": url, **meta, "fetched_at": time.time()})
+
+
+def safe_name(text):
+    """Strip characters that aren't allowed in note / folder names."""
+    return " ".join(UNSAFE_FILENAME_RE.sub(" ", text).split()).strip(" .")
+
+
+def link_text(text):
+    """Make text safe inside [...] and [[...|...]] links."""
+    return text.replace("[", "(").replace("]", ")").replace("|", "-")
+
+
+def md_url(url):
+    """Markdown link destination for url: <...> keeps spaces and parentheses intact."""
+    return "<" + url.replace("<", "%3C").replace(">", "%3E") + ">"
+
+
+def vault_root(path):
+    """The Obsidian vault holding path (nearest folder with .obsidian), else path itself."""
+    path = path.resolve()
+    for folder in (path, *path.parents):
+        if (folder / ".obsidian").is_dir():
+            return folder
+    return path
+
+
+def moc_name(folder):
+    """'Computers > Software' -> 'Bookmarks - Computers - Software'."""
+    return "Bookmarks - " + " - ".join(safe_name(p) for p in folder.split(" > "))
+
+
+def fallback_title(url):
+    """Title for untitled bookmarks: host and path."""
+    parsed = urlparse(url)
+    return (parsed.netloc + parsed.path).rstrip("/") or url
+
+
+def render_bookmark_note(entry, meta):
+    """Note text for one bookmark; contains no timestamps so reruns compare equal."""
+    title = entry["title"] or meta["title"] or fallback_title(entry["url"])
+    lines = ["---", f"title: {yaml_quote(title)}", f"url: {yaml_quote(entry['url'])}"]
+    if meta["title"] and meta["title"] != title:
+        lines.append(f"page_title: {yaml_quote(meta['title'])}")
+    if meta["description"]:
+        lines.append(f"description: {yaml_quote(meta['description'])}")
+    if meta["image"]:
+        lines.append(f"image: {yaml_quote(meta['image'])}")
+    lines.append(f"folder: {yaml_quote(entry['vault_folder'])}")
+    lines.extend(["tags:", "  - bookmark", "---", "", f"# {title}", "",
+                  f"[Open page]({md_url(entry['url'])})", ""])
+    if meta["description"]:
+        lines.extend([f"> {meta['description']}", ""])
+    if meta["image"]:
+        lines.extend([f"![]({meta['image']})", ""])
+    lines.append(f"Folder: [[{moc_name(entry['vault_folder'])}]]")
+    return "\n".join(lines) + "\n"
+
+
+def render_folder_moc(folder, items, style, root):
+    """
+    MOC text for one folder. items: list of (entry, meta, note_path or None).
+    notes style links the bookmark notes by their path under root (the vault),
+    since titles repeat across folders; moc style links the pages directly.
+    """
+    lines = ["---", "tags:", "  - bookmarks", "  - moc", "---", "",
+             f"# Bookmarks: {folder}", ""]
+    rows = []
+    for entry, meta, note in items:
+        title = link_text(entry["title"] or meta["title"] or fallback_title(entry["url"]))
+        if style == "notes":
+            link = f"[[{note.resolve().relative_to(root).with_suffix('').as_posix()}|{title}]]"
+        else:
+            link = f"[{title}]({md_url(entry['url'])})"
+        desc  = f" — {meta['description']}" if meta["description"] else ""
+        rows.append((title.lower(), f"- {link}{desc}"))
+    lines.extend(row for _, row in sorted(rows))
+    return "\n".join(lines) + "\n"
+
+
+def write_if_changed(path, text):
+    """Write text to path unless it already holds exactly that; returns 'new'/'updated'/'unchanged'."""
+    if path.exists():
+        if path.read_text(encoding="utf-8") == text:
+            return "unchanged"
+        outcome = "updated"
+    else:
+        outcome = "new"
+        path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+    return outcome
+
+
+def plan_note_paths(entries, vault_dir):
+    """
+    Assign each entry a note path: <vault>/<folder path>/<title>.md.
+    Titles that collide inside a folder get a short hash of the URL key;
+    entries are taken in a fixed order so the same input gives the same paths.
+    """
+    taken = set()
+    for entry in sorted(entries, key=lambda e: (e["vault_folder"], e["title"], e["key"])):
+        folder_dir = vault_dir.joinpath(*(safe_name(p) or "_" for p in entry["vault_folder"].split(" > ")))
+        stem = safe_name(entry["title"] or fallback_title(entry["url"]))[:120] or "Untitled"
+        path = folder_dir / f"{stem}.md"
+        if str(path).lower() in taken:
+            digest = hashlib.sha1(entry["key"].encode("utf-8")).hexdigest()[:6]
+            path = folder_dir / f"{stem} ({digest}).md"
+        taken.add(str(path).lower())
+        entry["note_path"] = path
+
+
+def phase_vault(style="moc", folder=None, engine="auto", vault_dir=VAULT_BOOKMARKS):
+    """
+    Export live bookmarks from check_results.json to the vault.
+
+    Bookmarks are filed by bookmark_organize.classify(); folder limits the
+    export to one taxonomy folder (and its sub-folders).  Only pages the
+    check phase found OK are fetched for metadata — DEAD pages are dropped
+    and SUSPECT ones exported with their bookmark title, so no page is
+    probed again just to learn it's down.  Fresh metadata comes from
+    meta_cache.jsonl; the rest is fetched concurrently and, in notes
+    style, each note is written as soon as its page arrives.  Every file
+    is written only if its content changed.  vault_manifest.json records
+    the notes and MOCs written, so a renamed bookmark's old note and the
+    notes / MOCs of bookmarks and folders that no longer exist are removed.
+    """
+    from bookmark_organize import classify  # taxonomy rules live with the organizer
+
+    if not CHECK_RESULTS.exists():
+        print(f"ERROR: {CHECK_RESULTS} not found. Run --phase check first.")
+        sys.exit(1)
+    if engine == "auto":
+        engine = "async" if aiohttp is not None else "threads"
+    if engine == "async" and aiohttp is None:
+        print("ERROR: --engine async needs aiohttp (pip install aiohttp).")
+        sys.exit(1)
+
+    with open(CHECK_RESULTS, "r", encoding="utf-8") as fh:
+        results = json.load(fh)
+
+    # Live bookmarks, one per page, filed into the new taxonomy
+    index = UrlIndex()
+    for r in results:
+        if r["status"] in ("OK", "SUSPECT"):
+            index.add(r["url"], r)
+    entries      = []
+    live_keys    = set()   # every live bookmark, --folder or not (for pruning)
+    live_folders = set()
+    for r in index.values():
+        vault_folder = classify(r)
+        key = dedup_key(r["url"])
+        live_keys.add(key)
+        live_folders.add(vault_folder)
+        if folder and not (vault_folder.lower() == folder.lower()
+                           or vault_folder.lower().startswith(folder.lower() + " > ")):
+            continue
+        entries.append({**r, "key": key, "vault_folder": vault_folder})
+    if not entries:
+        print(f"No live bookmarks{' in ' + folder if folder else ''} to export.")
+        return
+    if style == "notes":
+        plan_note_paths(entries, vault_dir)
+
+    WORK_DIR.mkdir(exist_ok=True)
+    cache    = MetaCache(META_CACHE)
+    manifest = {"notes": {}, "mocs": {}}   # dedup_key -> note path, folder -> MOC path
+    if VAULT_MANIFEST.exists():
+        with open(VAULT_MANIFEST, "r", encoding="utf-8") as fh:
+            saved = json.load(fh)
+        # Older manifests were a flat dedup_key -> note path map
+        manifest = saved if "notes" in saved else {"notes": saved, "mocs": {}}
+    notes_manifest = manifest["notes"]
+
+    def save_manifest():
+        with open(VAULT_MANIFEST, "w", encoding="utf-8") as fh:
+            json.dump(manifest, fh, ensure_ascii=False, indent=2)
+
+    outcomes = defaultdict(int)   # new / updated / unchanged / moved / removed
+    metas    = {}                 # dedup_key -> metadata used for the entry
+    # Note paths this run writes: an old path another bookmark now claims
+    # (collision suffixes can swap) must not be deleted
+    planned  = {str(e["note_path"]) for e in entries} if style == "notes" else set()
+
+    def emit(entry, meta):
+        """Keep entry's metadata; in notes style write its note right away."""
+        metas[entry["key"]] = meta
+        if style != "notes":
+            return
+        note = entry["note_path"]
+        outcomes[write_if_changed(note, render_bookmark_note(entry, meta))] += 1
+        old = notes_manifest.get(entry["key"])
+        if old and old != str(note) and old not in planned and Path(old).exists():
+            Path(old).unlink()  # title or folder changed since the last export
+            outcomes["moved"] += 1
+        notes_manifest[entry["key"]] = str(note)
+
+    # Reuse cached metadata; fetch only OK pages without it
+    now      = time.time()
+    to_fetch = []
+    for entry in entries:
+        rec = cache.get(entry["key"], now)
+        if rec:
+            emit(entry, {k: rec[k] for k in EMPTY_META})
+        elif entry["status"] == "OK":
+            to_fetch.append(entry)
+        else:
+            emit(entry, dict(EMPTY_META))
+    total  = len(to_fetch)
+    counts = {"done": 0, "failed": 0}
+    print(f"Exporting {len(entries)} bookmarks as {style} to {vault_dir} "
+          f"({len(entries) - total} from cache or check results, {total} pages to fetch)...")
+
+    def record(entry, meta, detail):
+        """Cache a fetched page and emit it; failures fall back to the bookmark title."""
+        if meta is None:
+            counts["failed"] += 1
+            meta = dict(EMPTY_META)
+        else:
+            cache.record(entry["key"], entry["url"], meta)
+        emit(entry, meta)
+        counts["done"] += 1
+        done = counts["done"]
+        if done % 50 == 0 or done == total:
+            print(f"  {done}/{total} fetched  ({counts['failed']} failed)")
+
+    started = time.time()
+    try:
+        if to_fetch and engine == "async":
+            asyncio.run(fetch_all_meta_async(to_fetch, record))
+        elif to_fetch:
+            fetch_all_meta_threaded(to_fetch, record)
+    except KeyboardInterrupt:
+        print(f"\nInterrupted after {counts['done']}/{total} — rerun to continue "
+              f"(fetched pages are cached).")
+        sys.exit(130)
+    finally:
+        cache.close()
+        save_manifest()
+    elapsed = time.time() - started
+
+    # Notes of bookmarks that are gone (deleted, or now DEAD)
+    for key, old in list(notes_manifest.items()):
+        if key not in live_keys:
+            if old not in planned and Path(old).exists():
+                Path(old).unlink()
+                outcomes["removed"] += 1
+            del notes_manifest[key]
+
+    # Folder MOCs (and the top-level index when exporting everything)
+    by_folder = defaultdict(list)
+    for entry in entries:
+        by_folder[entry["vault_folder"]].append((entry, metas[entry["key"]], entry.get("note_path")))
+    moc_outcomes = defaultdict(int)
+    root = vault_root(vault_dir)
+    for name, items in by_folder.items():
+        path = vault_dir / f"{moc_name(name)}.md"
+        moc_outcomes[write_if_changed(path, render_folder_moc(name, items, style, root))] += 1
+        manifest["mocs"][name] = str(path)
+    # MOCs of folders left without live bookmarks
+    written_mocs = {str(vault_dir / f"{moc_name(name)}.md") for name in by_folder}
+    for name, old in list(manifest["mocs"].items()):
+        if name not in live_folders:
+            if old not in written_mocs and Path(old).exists():
+                Path(old).unlink()
+                moc_outcomes["removed"] += 1
+            del manifest["mocs"][name]
+    save_manifest()
+    if not folder:
+        lines = ["---", "tags:", "  - bookmarks", "  - moc", "---", "", "# Bookmarks", ""]
+        lines.extend(f"- [[{moc_name(name)}|{name}]] ({len(by_folder[name])})"
+                     for name in sorted(by_folder, key=str.lower))
+        moc_outcomes[write_if_changed(vault_dir / "Bookmarks.md", "\n".join(lines) + "\n")] += 1
+
+    rate = total / elapsed if elapsed and total else 0
+    print(f"\nDone in {elapsed:.0f}s ({rate:.1f} pages/sec, {counts['failed']} fetch failures).")
+    if style == "notes":
+        print(f"  Notes : {outcomes['new']} new, {outcomes['updated']} updated, "
+              f"{outcomes['unchanged']} unchanged, {outcomes['moved']} renamed/moved, "
+              f"{outcomes['removed']} removed")
+    print(f"  MOCs  : {moc_outcomes['new']} new, {moc_outcomes['updated']} updated, "
+          f"{moc_outcomes['unchanged']} unchanged, {moc_outcomes['removed']} removed "
+          f"({len(by_folder)} folders)")
+
+
 # ─── Entry Point ──────────────────────────────────────────────────────────────
 
 def main():
@@ -547,10 +1509,36 @@ def main():
     parser = argparse.ArgumentParser(description="Bookmark cleanup and sync tool")
     parser.add_argument(
         "--phase",
-        choices=["merge", "check", "report", "write"],
+        choices=["merge", "check", "report", "write", "vault"],
         required=True,
         help="Which phase to run"
     )
+    parser.add_argument(
+        "--engine",
+        choices=["auto", "async", "threads"],
+        default="auto",
+        help="HTTP engine for --phase check / vault (default: async if aiohttp is installed)"
+    )
+    parser.add_argument(
+        "--resume", action="store_true",
+        help="--phase check: continue an interrupted run, skipping URLs it already checked"
+    )
+    parser.add_argument(
+        "--ttl", type=float, default=CHECK_TTL_DAYS, metavar="DAYS",
+        help=f"--phase check: reuse OK results younger than this (default {CHECK_TTL_DAYS}; 0 = recheck all)"
+    )
+    parser.add_argument(
+        "--vault-style", choices=["moc", "notes"], default="moc",
+        help="--phase vault: MOC link lists only, or one note per bookmark plus MOCs (default moc)"
+    )
+    parser.add_argument(
+        "--folder", metavar="PATH",
+        help="--phase vault: export only this taxonomy folder, e.g. \"Computers > Software\""
+    )
+    parser.add_argument(
+        "--vault-dir", type=Path, default=VAULT_BOOKMARKS,
+        help=f"--phase vault: output folder (default {VAULT_BOOKMARKS})"
+    )
     args = parser.parse_args()
 
     if args.phase == "merge":
@@ -559,11 +1547,15 @@ def main():
         # Suppress SSL warnings (many sites have cert issues but are still "alive")
         import urllib3
         urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
-        phase_check()
+        phase_check(args.engine, resume=args.resume, ttl_days=args.ttl)
     elif args.phase == "report":
         phase_report()
     elif args.phase == "write":
         phase_write()
+    elif args.phase == "vault":
+        import urllib3
+        urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+        phase_vault(args.vault_style, args.folder, args.engine, args.vault_dir)
 
 
 if __name__ == "__main__":
@@ -10,11 +10,13 @@ Usage: python bookmark_organize.py [--dry-run]
 import argparse      # CLI flags
 import json          # JSON I/O
 import os            # Env vars
+import re            # Host extraction for domain fallback
 import sys           # stdout encoding + exit
 import uuid          # GUIDs for bookmark nodes
 from collections import defaultdict  # Folder grouping
 from pathlib import Path             # File paths
-from urllib.parse import urlparse    # Domain extraction for fallback routing
+
+from url_canon import UrlIndex, strip_tracking  # Collapse URL variants before writing
 
 sys.stdout.reconfigure(encoding="utf-8", errors="replace")
 sys.stderr.reconfigure(encoding="utf-8", errors="replace")
@@ -185,6 +187,92 @@ def strip_root(path):
     return path.strip()
 
 
+# ─── Compiled Matchers ────────────────────────────────────────────────────────
+# classify() used to loop over every rule per bookmark. Both tables are
+# compiled once at import instead; "first match wins" is kept by recording
+# each rule's position and taking the lowest one that matches.
+
+PATH_SEP = " > "   # Folder path separator used in check_results.json
+
+
+def compile_rule_trie(rules):
+    """
+    Build a trie over lowercased folder-path segments from TAXONOMY_RULES.
+    Each node is {"children": {segment: node}, "rule": (index, prefix, new_folder)}
+    where "rule" is present only on nodes that end a prefix (first rule wins
+    when two prefixes differ only in case).
+    """
+    root = {"children": {}}
+    for index, (prefix, new_folder) in enumerate(rules):
+        node = root
+        for segment in prefix.lower().split(PATH_SEP):
+            node = node["children"].setdefault(segment, {"children": {}})
+        node.setdefault("rule", (index, prefix, new_folder))
+    return root
+
+
+def compile_domain_suffixes(fallback):
+    """
+    Map each DOMAIN_FALLBACK fragment, read as a host suffix, to the position
+    of the first rule that uses it.
+    """
+    suffixes = {}
+    for index, (fragment, _) in enumerate(fallback):
+        suffixes.setdefault(fragment, index)
+    return suffixes
+
+
+RULE_TRIE       = compile_rule_trie(TAXONOMY_RULES)
+DOMAIN_SUFFIXES = compile_domain_suffixes(DOMAIN_FALLBACK)
+
+# Host part of a URL: after "scheme://" and any user@, before a port, "/", "?" or "#"
+HOST_RE = re.compile(r"^[a-z][a-z0-9+.-]*://(?:[^/?#@]*@)?([^/?#:]*)")
+
+
+def match_rule(orig):
+    """
+    Return the new folder for the first TAXONOMY_RULES prefix that orig equals
+    or sits under (case-insensitive), keeping deeper sub-levels; None if none.
+    """
+    node, best = RULE_TRIE, None
+    for segment in orig.lower().split(PATH_SEP):
+        node = node["children"].get(segment)
+        if node is None:
+            break
+        rule = node.get("rule")
+        if rule is not None and (best is None or rule[0] < best[0]):
+            best = rule
+    if best is None:
+        return None
+    _, prefix, new_folder = best
+    # Preserve deeper sub-levels beyond the matched prefix, e.g. "" or " > SubSub"
+    return new_folder + orig[len(prefix):]
+
+
+def match_domain(url):
+    """
+    Return the folder of the first DOMAIN_FALLBACK fragment found in url, or None.
+
+    Walks the host from its last label (reversed-domain order) looking each
+    suffix up in DOMAIN_SUFFIXES, which settles the usual case of a bookmark
+    on a listed site. Fragments are plain substrings of the whole URL, so
+    the rules ahead of that hit (all of them if there was none) are still
+    checked with "in" to keep first-match-wins.
+    """
+    limit = len(DOMAIN_FALLBACK)
+    m = HOST_RE.match(url)
+    if m:
+        labels = m.group(1).split(".")
+        for i in range(len(labels) - 1, -1, -1):
+            index = DOMAIN_SUFFIXES.get(".".join(labels[i:]))
+            if index is not None and index < limit:
+                limit = index
+    for fragment, folder in DOMAIN_FALLBACK[:limit]:
+        if fragment in url:
+            return folder
+    return DOMAIN_FALLBACK[limit][1] if limit < len(DOMAIN_FALLBACK) else None
+
+
 def classify(entry):
     """
     Return the new folder path for a bookmark entry.
@@ -195,23 +283,15 @@ def classify(entry):
     # Prefer Chrome folder; fall back to Brave
     orig = orig_chrome or orig_brave
 
-    # ── Rule-based path matching ──
-    for prefix, new_folder in TAXONOMY_RULES:
-        if orig == prefix or orig.startswith(prefix + " > "):
-            # Preserve deeper sub-levels beyond the matched prefix
-            remainder = orig[len(prefix):]  # e.g. "" or " > SubSub"
-            return new_folder + remainder
-        # Also try case-insensitive match for Bahá'í (diacriticals may vary)
-        if orig.lower() == prefix.lower() or orig.lower().startswith(prefix.lower() + " > "):
-            remainder = orig[len(prefix):]
-            return new_folder + remainder
+    # ── Rule-based path matching (case-insensitive for Bahá'í diacritic variants) ──
+    folder = match_rule(orig)
+    if folder is not None:
+        return folder
 
     # ── Domain-based fallback (for root-level toolbar items) ──
-    url    = entry.get("url", "").lower()
-    domain = urlparse(url).netloc.lower()
-    for fragment, folder in DOMAIN_FALLBACK:
-        if fragment in domain or fragment in url:
-            return folder
+    folder = match_domain(entry.get("url", "").lower())
+    if folder is not None:
+        return folder
 
     # ── Last resort: keep in Misc ──
     return "Misc"
@@ -236,7 +316,7 @@ def make_url_node(bm):
         "id":              _next_id(),
         "name":            bm.get("title", ""),
         "type":            "url",
-        "url":             bm["url"],
+        "url":             strip_tracking(bm["url"]),
     }
 
 
@@ -318,6 +398,14 @@ def main():
     dead_count = len(results) - len(survivors)
     print(f"Loaded {len(results)} entries. Dropped {dead_count} DEAD. {len(survivors)} surviving.")
 
+    # ── Collapse variants of the same page (http/https, www., tracking params) ──
+    index = UrlIndex()
+    for entry in survivors:
+        index.add(entry["url"], entry)
+    if len(index) < len(survivors):
+        print(f"Folded {len(survivors) - len(index)} duplicate URL variants.")
+    survivors = index.values()
+
     # ── Classify survivors into new taxonomy ──
     folders = defaultdict(list)
     for entry in survivors:
@@ -0,0 +1,29 @@
+#!/usr/bin/env python3
+"""
+obsidian_yaml.py
+Frontmatter value helpers shared by the note writers
+(security_now_to_vault.py, bookmark_cleanup.py --phase vault).
+
+  yaml_quote(value) : a double-quoted YAML scalar that reads back as value
+                      - backslashes and double quotes escaped
+                      - newlines, carriage returns and tabs escaped, so a
+                        multi-line page description stays one frontmatter line
+"""
+
+# ─── Escapes ──────────────────────────────────────────────────────────────────
+
+# Characters that need a backslash escape inside a double-quoted scalar
+_ESCAPES = str.maketrans({
+    "\\": "\\\\",
+    '"':  '\\"',
+    "\n": "\\n",
+    "\r": "\\r",
+    "\t": "\\t",
+})
+
+
+# ─── Quoting ──────────────────────────────────────────────────────────────────
+
+def yaml_quote(value):
+    """Double-quote a frontmatter string value (see module docstring)."""
+    return '"' + value.translate(_ESCAPES) + '"'
@@ -8,22 +8,33 @@ Handles:
   - Quick-style headings (h1–h6) via QuickStyleDef declarations
   - Bullet and numbered lists with arbitrary nesting
   - Inline HTML within <one:T>: bold, italic, hyperlinks, strikethrough
-  - Embedded images (base-64 → saved file → ![[embed]])
+    (single-pass tokenizer, see _InlineMarkdownParser)
+  - Embedded images (base-64 → decoded straight to disk → ![[embed]])
   - Attached files (copied to vault → [[wikilink]])
   - GFM pipe tables
   - OneNote checkbox tags → Markdown task items ([ ] / [x])
 
+The page XML is parsed incrementally (see _StreamingPageBuilder): each
+<one:Data> image payload is base-64-decoded in chunks into a temporary
+file in the images directory, and every top-level page element is
+converted and then discarded.  Peak memory is therefore bounded by the
+page XML string itself plus the largest single outline, rather than by
+every decoded image held at once.
+
 After calling convert(), the caller retrieves:
-    converter.collected_images       — list of (filename, bytes)
+    converter.collected_images       — list of (filename, temp_path)
     converter.collected_attachments  — list of (filename, source_path)
-and passes them to ObsidianWriter for persistence.
+and passes them to ObsidianWriter for persistence.  If the note is not
+written after all, call converter.discard_images() to delete the
+temporary image files.
 """
 
-import base64
+import binascii
 import html as html_mod
 import logging
 import os
 import re
+import tempfile
 import xml.etree.ElementTree as ET
 from pathlib import Path
 
@@ -42,6 +53,26 @@ _ILLEGAL_FILENAME_CHARS = re.compile(r'[<>:"/\\|?*\x00-\x1f]')
 # Type "1" is the standard To Do checkbox; type "3" is a variant.
 _TODO_TAG_TYPES = {"1", "3"}
 
+# Number of XML characters handed to the parser per feed() call
+_FEED_CHUNK_CHARS = 1 << 20
+
+# Attribute set on a <one:Data> element once its payload has been spilled
+# to disk; holds the temp file path (or "" if decoding failed)
+_SPILL_ATTR = "_spill_path"
+
+# Default heading map used when a page declares no <one:QuickStyleDef>.
+# Empirical defaults observed in OneNote 2016/2021 page exports.
+_DEFAULT_STYLE_MAP: dict[int, int | None] = {
+    0: None,  # Normal / Body Text
+    1: 0,     # Page Title — skip
+    2: 1,     # Heading 1
+    3: 2,     # Heading 2
+    4: 3,     # Heading 3
+    5: 4,     # Heading 4
+    6: 5,     # Heading 5
+    7: 6,     # Heading 6
+}
+
 
 # ---------------------------------------------------------------------------
 # Module-level helpers
@@ -65,9 +96,250 @@ def _safe_filename(name: str, max_len: int = 50) -> str:
     return cleaned[:max_len]                            # enforce length limit
 
 
-def _strip_html_tags(html_str: str) -> str:
-    """Remove every HTML tag from *html_str*, leaving only text content."""
-    return re.sub(r"<[^>]+>", "", html_str)
+# ---------------------------------------------------------------------------
+# Inline HTML → Markdown
+# ---------------------------------------------------------------------------
+
+# Runs of two or more spaces, collapsed to one in converted inline text
+_MULTI_SPACE = re.compile(r" {2,}")
+
+# Inline HTML tokenizer: one alternation scanned once left to right.
+#   group 1-3 : a start or end tag  — "/" (end marker), tag name, attributes
+#   group 4   : a text run
+# Any other markup (<!-- comments -->, <!DOCTYPE>, ...) matches the bare
+# "<[^>]+>" branch and is dropped; a lone "<" with no closing ">" is text.
+_INLINE_TOKEN = re.compile(
+    r"<(/?)([A-Za-z][^\s/>]*)([^>]*)>|([^<]+|<(?![^>]*>))|<[^>]+>"
+)
+
+# name="value" / name='value' / name=value inside a start tag
+_TAG_ATTR = re.compile(
+    r"""([^\s=/]+)\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'>]+))"""
+)
+
+# Inline-style declarations OneNote uses for character formatting
+_STYLE_BOLD   = re.compile(r"font-weight\s*:\s*bold")
+_STYLE_ITALIC = re.compile(r"font-style\s*:\s*italic")
+_STYLE_STRIKE = re.compile(r"text-decoration\s*:\s*line-through")
+
+# Plain tags that map directly to a Markdown emphasis marker
+_TAG_MARKERS = {"b": "**", "strong": "**", "i": "*", "em": "*"}
+
+
+def _tag_attr(attr_text: str, name: str) -> str | None:
+    """Return the entity-decoded value of attribute *name*, or None."""
+    for m in _TAG_ATTR.finditer(attr_text):
+        if m.group(1).lower() == name:
+            value = m.group(2) if m.group(2) is not None else (
+                m.group(3) if m.group(3) is not None else m.group(4)
+            )
+            return html_mod.unescape(value)
+    return None
+
+
+class _InlineMarkdownParser:
+    """
+    Single-pass converter from OneNote inline HTML (the content of a
+    <one:T> element) to Markdown.
+
+    The run is tokenised once by _INLINE_TOKEN and Markdown is emitted as
+    tags open and close, using a stack of open elements:
+
+      - <span style="font-weight:bold / font-style:italic /
+        text-decoration:line-through"> and <b>/<strong>/<i>/<em> emit
+        ** / * / ~~ — a span carrying several styles emits all of them,
+        and a marker already open further out is not repeated
+      - <a href="..."> emits [text](url); formatting inside link text is
+        dropped
+      - every other tag is removed, keeping its text
+      - an element left unclosed at the end of the run emits no markers
+
+    Entities in text and attribute values are decoded with html.unescape.
+    """
+
+    def convert(self, html_str: str) -> str:
+        """Convert one inline HTML string to Markdown."""
+        # out: Markdown fragments in emission order
+        out: list[str] = []
+        # stack: (tag, markers opened, index in out of the opening
+        # fragment, link href or None) for every element still open
+        stack: list[tuple[str, tuple[str, ...], int, str | None]] = []
+        # active: marker → number of open elements currently emitting it
+        active = {"**": 0, "*": 0, "~~": 0}
+        in_link = False   # inside an <a href> (suppresses formatting)
+
+        for m in _INLINE_TOKEN.finditer(html_str):
+            text = m.group(4)
+            if text is not None:
+                out.append(html_mod.unescape(text) if "&" in text else text)
+                continue
+
+            tag = m.group(2)
+            if tag is None:
+                continue                      # comment / other markup
+            tag = tag.lower()
+            attr_text = m.group(3)
+
+            if m.group(1):
+                # ---- End tag: close the innermost matching element ----
+                for pos in range(len(stack) - 1, -1, -1):
+                    if stack[pos][0] == tag:
+                        break
+                else:
+                    continue                  # stray end tag
+                while len(stack) > pos:
+                    _tag, markers, _index, href = stack.pop()
+                    if href is not None:
+                        in_link = False
+                        out.append(f"]({href})")
+                    for marker in reversed(markers):
+                        active[marker] -= 1
+                        out.append(marker)
+                continue
+
+            if attr_text.endswith("/"):
+                continue                      # self-closing: <br/>, <img/>
+
+            # ---- Start tag ----
+            index = len(out)
+            if tag == "a":
+                href = _tag_attr(attr_text, "href")
+                if href is not None and not in_link:
+                    in_link = True
+                    out.append("[")
+                    stack.append((tag, (), index, href))
+                else:
+                    out.append("")
+                    stack.append((tag, (), index, None))
+                continue
+
+            markers = () if in_link else self._markers_for(tag, attr_text, active)
+            for marker in markers:
+                active[marker] += 1
+            out.append("".join(markers))
+            stack.append((tag, markers, index, None))
+
+        # Elements never closed: drop their opening fragment
+        for _tag, _markers, index, _href in stack:
+            out[index] = ""
+
+        return _MULTI_SPACE.sub(" ", "".join(out)).strip()
+
+    @staticmethod
+    def _markers_for(tag: str, attr_text: str, active: dict) -> tuple[str, ...]:
+        """Return the Markdown markers a start tag opens (may be empty)."""
+        if tag == "span":
+            style = (_tag_attr(attr_text, "style") or "").lower()
+            if not style:
+                return ()
+            wanted = []
+            if _STYLE_BOLD.search(style):
+                wanted.append("**")
+            if _STYLE_ITALIC.search(style):
+                wanted.append("*")
+            if _STYLE_STRIKE.search(style):
+                wanted.append("~~")
+        else:
+            marker = _TAG_MARKERS.get(tag)
+            wanted = [marker] if marker else []
+        # Don't re-open a marker an outer element already has open
+        return tuple(m for m in wanted if not active[m])
+
+
+# ---------------------------------------------------------------------------
+# Streaming helpers
+# ---------------------------------------------------------------------------
+
+class _Base64Spill:
+    """
+    Incremental base-64 decoder that writes decoded bytes to a temporary
+    file as the encoded text arrives, so a whole image is never held in
+    memory (encoded or decoded).
+
+    directory : where the temp file is created (the vault images folder,
+                so the writer can later rename it into place atomically)
+    """
+
+    def __init__(self, directory: Path):
+        fd, name = tempfile.mkstemp(dir=directory, prefix=".onenote_", suffix=".part")
+        self.path = Path(name)            # temp file receiving decoded bytes
+        self._fh  = os.fdopen(fd, "wb")
+        self._pending = ""                # encoded chars not yet a multiple of 4
+        self.failed = False               # set on the first decode error
+
+    def write(self, text: str):
+        """Decode every complete 4-character group in *text* (plus any
+        leftover from the previous call) and append it to the file."""
+        if self.failed:
+            return
+        buf = self._pending + "".join(text.split())   # drop line breaks
+        usable = len(buf) - len(buf) % 4
+        self._pending = buf[usable:]
+        if usable:
+            try:
+                self._fh.write(binascii.a2b_base64(buf[:usable]))
+            except binascii.Error:
+                self.failed = True
+
+    def close(self) -> bool:
+        """Flush the remainder and close the file.  Returns True on success;
+        on failure the temp file is deleted."""
+        if self._pending and not self.failed:
+            try:
+                self._fh.write(binascii.a2b_base64(self._pending))
+            except binascii.Error:
+                self.failed = True
+        self._fh.close()
+        if self.failed:
+            self.path.unlink(missing_ok=True)
+        return not self.failed
+
+
+class _StreamingPageBuilder(ET.TreeBuilder):
+    """
+    ElementTree builder that converts the page while it is being parsed.
+
+    - Text inside <one:Data> is diverted into a _Base64Spill instead of
+      being accumulated on the element.
+    - When a direct child of <one:Page> closes (QuickStyleDef, Outline,
+      InsertedFile, ...), it is handed to the converter and then removed
+      from the tree so its memory can be reclaimed.
+    """
+
+    def __init__(self, converter: "ContentConverter"):
+        super().__init__()
+        self._converter = converter
+        self._root: ET.Element | None = None   # the <one:Page> element
+        self._depth = 0                        # 1 = inside <one:Page> itself
+        self._spill: _Base64Spill | None = None
+
+    def start(self, tag, attrs):
+        el = super().start(tag, attrs)
+        self._depth += 1
+        if self._root is None:
+            self._root = el
+        elif tag == _onetag("Data"):
+            self._spill = _Base64Spill(self._converter._images_dir)
+        return el
+
+    def data(self, data):
+        if self._spill is not None:
+            self._spill.write(data)
+        else:
+            super().data(data)
+
+    def end(self, tag):
+        el = super().end(tag)
+        self._depth -= 1
+        if self._spill is not None and tag == _onetag("Data"):
+            ok = self._spill.close()
+            el.set(_SPILL_ATTR, str(self._spill.path) if ok else "")
+            self._spill = None
+        elif self._depth == 1:
+            # A complete top-level page element: convert it, then drop it
+            self._converter._handle_page_child(el)
+            self._root.remove(el)
+        return el
 
 
 # ---------------------------------------------------------------------------
@@ -82,8 +354,8 @@ class ContentConverter:
     ----------
     images_dir : Path
         Directory where extracted images will be saved by the writer.
-        (Needed only for filename collision awareness; actual writing
-        is done by ObsidianWriter.)
+        Decoded images are spilled here as hidden temp files during
+        conversion; ObsidianWriter renames them to their final names.
     attachments_dir : Path
         Directory where attachment files will be copied by the writer.
     page_title : str
@@ -105,8 +377,8 @@ class ContentConverter:
         self._att_counter = 0
 
         # Results collected during conversion — read by the caller afterward
-        # Each image entry:      (dest_filename: str, image_bytes: bytes)
-        self.collected_images: list[tuple[str, bytes]] = []
+        # Each image entry:      (dest_filename: str, temp_path: Path)
+        self.collected_images: list[tuple[str, Path]] = []
         # Each attachment entry: (dest_filename: str, source_path: str)
         self.collected_attachments: list[tuple[str, str]] = []
 
@@ -114,6 +386,14 @@ class ContentConverter:
         # 0 means "skip" (page title); None means normal paragraph text.
         self._style_map: dict[int, int | None] = {}
 
+        # _inline_parser: reused for every <one:T> run on the page
+        self._inline_parser = _InlineMarkdownParser()
+
+        # Markdown produced while streaming: one entry per non-empty Outline,
+        # and page-level attachment links (appended after all outlines)
+        self._outline_blocks: list[str] = []
+        self._page_file_links: list[str] = []
+
     # -----------------------------------------------------------------------
     # Public entry point
     # -----------------------------------------------------------------------
@@ -122,72 +402,92 @@ class ContentConverter:
         """
         Convert the OneNote page XML string to a Markdown body string.
 
+        The XML is fed to the parser in chunks; outlines are converted and
+        discarded as they complete (see _StreamingPageBuilder).
+
         page_xml : raw XML string from GetPageContent
         Returns  : Markdown string (no YAML frontmatter)
         """
-        # root: the top-level <one:Page> element
-        root = ET.fromstring(page_xml)
+        self._outline_blocks  = []
+        self._page_file_links = []
 
-        # Build the style index → heading-level map from <one:QuickStyleDef>
-        self._build_style_map(root)
+        parser = ET.XMLParser(target=_StreamingPageBuilder(self))
+        try:
+            for offset in range(0, len(page_xml), _FEED_CHUNK_CHARS):
+                parser.feed(page_xml[offset:offset + _FEED_CHUNK_CHARS])
+            parser.close()
+        except Exception:
+            self.discard_images()   # don't leave temp files behind
+            raise
+
+        # <one:InsertedFile> elements that are direct children of <one:Page>
+        # (OneNote places attached files here, NOT inside any OE) are
+        # appended as separate blocks after the outlines.
+        blocks = self._outline_blocks + self._page_file_links
 
-        # Collect Markdown blocks from every <one:Outline> in document order
-        # outlines: list of Markdown strings, one per Outline element
-        outlines: list[str] = []
-        for outline_el in root.findall(_onetag("Outline")):
-            block = self._process_outline(outline_el)
-            if block.strip():
-                outlines.append(block)
+        # Join outlines with a blank line between them
+        return "\n\n".join(blocks).strip()
 
-        # Also handle <one:InsertedFile> elements that are direct children of
-        # <one:Page> (OneNote places attached files here, NOT inside any OE).
-        # We append each attachment link as a separate block at the end.
-        for file_el in root.findall(_onetag("InsertedFile")):
-            link = self._process_attachment(file_el)
+    def discard_images(self):
+        """Delete the temp files of any collected images not yet written."""
+        for _filename, temp_path in self.collected_images:
+            Path(temp_path).unlink(missing_ok=True)
+        self.collected_images = []
+
+    def _handle_page_child(self, el: ET.Element):
+        """
+        Convert one completed direct child of <one:Page>.  Called by
+        _StreamingPageBuilder in document order.
+
+        el : a <one:QuickStyleDef>, <one:Outline>, <one:InsertedFile>, or
+             any other page-level element (ignored)
+        """
+        if el.tag == _onetag("QuickStyleDef"):
+            self._register_quick_style(el)
+        elif el.tag == _onetag("Outline"):
+            if not self._style_map:
+                # No QuickStyleDef seen before the first outline
+                self._style_map = dict(_DEFAULT_STYLE_MAP)
+            block = self._process_outline(el)
+            if block.strip():
+                self._outline_blocks.append(block)
+        elif el.tag == _onetag("InsertedFile"):
+            link = self._process_attachment(el)
             if link:
-                outlines.append(link)
+                self._page_file_links.append(link)
+        # Anything else (Title, PageSettings, ...) produces no Markdown.
 
-        # Join outlines with a blank line between them
-        return "\n\n".join(outlines).strip()
+        # Delete spilled payloads that did not become an embed (images in
+        # table cells, in the title area, ...)
+        kept = {str(path) for _name, path in self.collected_images}
+        for data_el in el.iter(_onetag("Data")):
+            spill_path = data_el.get(_SPILL_ATTR)
+            if spill_path and spill_path not in kept:
+                Path(spill_path).unlink(missing_ok=True)
 
     # -----------------------------------------------------------------------
     # Style map construction
     # -----------------------------------------------------------------------
 
-    def _build_style_map(self, root: ET.Element):
+    def _register_quick_style(self, qsd: ET.Element):
         """
-        Read <one:QuickStyleDef> elements from the page root and populate
-        self._style_map mapping each integer index to its heading level.
+        Record one <one:QuickStyleDef> in self._style_map, mapping its
+        integer index to a heading level.
 
         quickStyleDef 'name' attribute values we care about:
             "PageTitle" → 0 (skip — already in frontmatter)
             "h1".."h6"  → heading levels 1–6
             "p", "cite" → None (normal text)
         """
-        for qsd in root.findall(_onetag("QuickStyleDef")):
-            idx  = int(qsd.get("index", -1))   # integer style index
-            name = qsd.get("name", "").lower()  # e.g. "h1", "p", "pagetitle"
-
-            if name == "pagetitle":
-                self._style_map[idx] = 0      # 0 = skip in body
-            elif len(name) == 2 and name[0] == "h" and name[1].isdigit():
-                self._style_map[idx] = int(name[1])   # heading level 1-6
-            else:
-                self._style_map[idx] = None   # normal paragraph
-
-        # Fallback: if no QuickStyleDef elements present, use positional defaults
-        if not self._style_map:
-            # Empirical defaults observed in OneNote 2016/2021 page exports
-            self._style_map = {
-                0: None,  # Normal / Body Text
-                1: 0,     # Page Title — skip
-                2: 1,     # Heading 1
-                3: 2,     # Heading 2
-                4: 3,     # Heading 3
-                5: 4,     # Heading 4
-                6: 5,     # Heading 5
-                7: 6,     # Heading 6
-            }
+        idx  = int(qsd.get("index", -1))   # integer style index
+        name = qsd.get("name", "").lower()  # e.g. "h1", "p", "pagetitle"
+
+        if name == "pagetitle":
+            self._style_map[idx] = 0      # 0 = skip in body
+        elif len(name) == 2 and name[0] == "h" and name[1].isdigit():
+            self._style_map[idx] = int(name[1])   # heading level 1-6
+        else:
+            self._style_map[idx] = None   # normal paragraph
 
     # -----------------------------------------------------------------------
     # Outline processing
@@ -388,72 +688,16 @@ class ContentConverter:
             <span style='font-weight:bold'>text</span>
             <a href="https://...">link text</a>
 
-        Processing order matters: hyperlinks are converted first so that
-        any formatting inside link text is handled correctly.
+        Runs with no markup or entities (the common case) skip the
+        tokenizer entirely; the rest go through one _InlineMarkdownParser
+        pass.
 
         html_str: raw HTML string from a <one:T> element
         Returns : Markdown string
         """
-        s = html_str
-
-        # --- 1. Hyperlinks: <a href="url">text</a> → [text](url) ---
-        s = re.sub(
-            r'<a\s+[^>]*href=["\']([^"\']*)["\'][^>]*>(.*?)</a>',
-            lambda m: f"[{_strip_html_tags(m.group(2))}]({m.group(1)})",
-            s,
-            flags=re.IGNORECASE | re.DOTALL,
-        )
-
-        # --- 2. Bold via inline style (font-weight:bold) ---
-        s = re.sub(
-            r"<span\s+[^>]*font-weight\s*:\s*bold[^>]*>(.*?)</span>",
-            lambda m: f"**{_strip_html_tags(m.group(1))}**",
-            s,
-            flags=re.IGNORECASE | re.DOTALL,
-        )
-
-        # --- 3. Bold via <b> or <strong> tags ---
-        s = re.sub(
-            r"<(?:b|strong)\b[^>]*>(.*?)</(?:b|strong)>",
-            lambda m: f"**{m.group(1)}**",
-            s,
-            flags=re.IGNORECASE | re.DOTALL,
-        )
-
-        # --- 4. Italic via inline style (font-style:italic) ---
-        s = re.sub(
-            r"<span\s+[^>]*font-style\s*:\s*italic[^>]*>(.*?)</span>",
-            lambda m: f"*{_strip_html_tags(m.group(1))}*",
-            s,
-            flags=re.IGNORECASE | re.DOTALL,
-        )
-
-        # --- 5. Italic via <i> or <em> tags ---
-        s = re.sub(
-            r"<(?:i|em)\b[^>]*>(.*?)</(?:i|em)>",
-            lambda m: f"*{m.group(1)}*",
-            s,
-            flags=re.IGNORECASE | re.DOTALL,
-        )
-
-        # --- 6. Strikethrough via text-decoration:line-through ---
-        s = re.sub(
-            r"<span\s+[^>]*text-decoration\s*:\s*line-through[^>]*>(.*?)</span>",
-            lambda m: f"~~{_strip_html_tags(m.group(1))}~~",
-            s,
-            flags=re.IGNORECASE | re.DOTALL,
-        )
-
-        # --- 7. Strip all remaining HTML tags ---
-        s = _strip_html_tags(s)
-
-        # --- 8. Decode HTML entities (&amp; &lt; &nbsp; etc.) ---
-        s = html_mod.unescape(s)
-
-        # --- 9. Collapse multiple spaces into one ---
-        s = re.sub(r" {2,}", " ", s).strip()
-
-        return s
+        if "<" not in html_str and "&" not in html_str:
+            return _MULTI_SPACE.sub(" ", html_str).strip()
+        return self._inline_parser.convert(html_str)
 
     # -----------------------------------------------------------------------
     # Image handling
@@ -461,15 +705,17 @@ class ContentConverter:
 
     def _process_image(self, img_el: ET.Element) -> str:
         """
-        Extract a <one:Image> element: decode the base-64 <one:Data> content,
-        record it in self.collected_images, and return an Obsidian embed.
+        Handle a <one:Image> element whose <one:Data> payload has already
+        been decoded to a temp file by the streaming parser: assign the final
+        filename, record it in self.collected_images, and return an
+        Obsidian embed.
 
         img_el  : the <one:Image> element
         Returns : "![[filename.ext]]" or a comment on failure
         """
-        # data_el: the child element holding the base-64 image bytes
+        # data_el: the child element that held the base-64 image bytes
         data_el = img_el.find(_onetag("Data"))
-        if data_el is None or not data_el.text:
+        if data_el is None or data_el.get(_SPILL_ATTR) is None:
             return "<!-- image: no data -->"
 
         # fmt: image format string from the 'format' attribute (default "png")
@@ -484,17 +730,21 @@ class ContentConverter:
         safe_title = _safe_filename(self._page_title, max_len=40)
         filename   = f"{safe_title}_img_{self._img_counter:02d}.{fmt}"
 
-        # Decode the base-64 string to raw bytes
-        try:
-            raw_b64   = data_el.text.strip()   # strip surrounding whitespace
-            img_bytes = base64.b64decode(raw_b64)
-        except Exception as exc:
-            log.warning("Failed to decode image %s: %s", filename, exc)
+        # spill_path: "" when the base-64 payload failed to decode
+        spill_path = data_el.get(_SPILL_ATTR)
+        if not spill_path:
+            log.warning("Failed to decode image %s", filename)
             return "<!-- image: decode failed -->"
 
-        # Record for the writer to persist
-        self.collected_images.append((filename, img_bytes))
-        log.info("Extracted image: %s (%d bytes)", filename, len(img_bytes))
+        temp_path = Path(spill_path)
+        size = temp_path.stat().st_size
+        if size == 0:
+            temp_path.unlink(missing_ok=True)
+            return "<!-- image: no data -->"
+
+        # Record for the writer to move into place
+        self.collected_images.append((filename, temp_path))
+        log.info("Extracted image: %s (%d bytes)", filename, size)
 
         return f"![[{filename}]]"
 
@@ -15,6 +15,7 @@ Usage:
 """
 
 import logging
+import time
 import xml.etree.ElementTree as ET
 from datetime import datetime, timezone
 
@@ -32,9 +33,17 @@ import win32gui          # provided by pywin32; used to read window titles
 ONE_NS = "http://schemas.microsoft.com/office/onenote/2013/onenote"
 
 # HierarchyScope enum values (from the OneNote COM type library).
-# HS_PAGES fetches every level: Notebooks → Sections → Pages.
+# HS_SELF fetches just the requested node (used to re-read one page's
+# lastModifiedTime cheaply); HS_PAGES fetches every level:
+# Notebooks → Sections → Pages.
+HS_SELF  = 0
 HS_PAGES = 4
 
+# How long (seconds) a parsed hierarchy index is reused across exports
+# before GetHierarchy is called again.  Within this window a page whose
+# lastModifiedTime no longer matches the index still forces a rebuild.
+HIERARCHY_TTL_SECS = 60
+
 # PageInfo flags used with GetPageContent.
 # PI_ALL (7) requests text, binary data (images), selection state, and
 # file-type information so that embedded images arrive as base-64 data.
@@ -54,6 +63,40 @@ def _onetag(local: str) -> str:
     return f"{{{ONE_NS}}}{local}"
 
 
+# ---------------------------------------------------------------------------
+# Hierarchy index
+# ---------------------------------------------------------------------------
+class _HierarchyIndex:
+    """
+    The notebook hierarchy parsed once into a dictionary:
+
+        page_id → (page element, section element, notebook element)
+
+    Replaces repeated linear scans of the hierarchy tree with O(1) lookups.
+    """
+
+    def __init__(self, hierarchy_root: ET.Element):
+        # built_at: monotonic timestamp used for the TTL check
+        self.built_at = time.monotonic()
+
+        # pages: page_id → (page_el, section_el, notebook_el)
+        self.pages: dict[str, tuple[ET.Element, ET.Element, ET.Element]] = {}
+
+        # Single walk: Notebook → Section (at any SectionGroup depth) → Page
+        sec_tag = _onetag("Section")
+        pg_tag  = _onetag("Page")
+        for notebook_el in hierarchy_root.iter(_onetag("Notebook")):
+            for section_el in notebook_el.iter(sec_tag):
+                for page_el in section_el.findall(pg_tag):
+                    self.pages[page_el.get("ID", "")] = (
+                        page_el, section_el, notebook_el,
+                    )
+
+    def is_fresh(self) -> bool:
+        """True while the index is younger than HIERARCHY_TTL_SECS."""
+        return time.monotonic() - self.built_at < HIERARCHY_TTL_SECS
+
+
 # ---------------------------------------------------------------------------
 # Main class
 # ---------------------------------------------------------------------------
@@ -68,11 +111,22 @@ class OneNoteInterface:
       - Extract page metadata (title, dates, notebook, section, deep link).
       - Retrieve the full page content XML including embedded binary images.
 
+    The parsed hierarchy is cached at class level (see _HierarchyIndex) so
+    consecutive exports from the tray process skip GetHierarchy entirely
+    while the cache is fresh.
+
     Public API:
         oni = OneNoteInterface()
         content_xml, metadata = oni.get_current_page()
+        page_id               = oni.get_current_page_id()
+        timestamps            = oni.get_page_timestamps()
+        content_xml, metadata = oni.get_page(page_id)
     """
 
+    # _index_cache: shared by every instance in this process; rebuilt when
+    # older than HIERARCHY_TTL_SECS or when a page's timestamp has moved on
+    _index_cache: _HierarchyIndex | None = None
+
     def __init__(self):
         """Connect to OneNote on instantiation."""
         # _app: the live COM Application object; all API calls go through it
@@ -181,47 +235,91 @@ class OneNoteInterface:
         hierarchy_xml: str = self._app.GetHierarchy("", HS_PAGES)
         return ET.fromstring(hierarchy_xml)
 
+    def _get_index(self, refresh: bool = False) -> _HierarchyIndex:
+        """
+        Return the cached hierarchy index, rebuilding it when it has expired
+        or when *refresh* is True.
+        """
+        cls = type(self)
+        if refresh or cls._index_cache is None or not cls._index_cache.is_fresh():
+            log.info("Fetching notebook hierarchy...")
+            cls._index_cache = _HierarchyIndex(self._get_hierarchy())
+        return cls._index_cache
+
+    def _read_page_modified(self, page_id: str) -> str | None:
+        """
+        Return the current lastModifiedTime of one page via an HS_SELF
+        GetHierarchy call (a single small element, not the whole tree).
+        Returns None if the page cannot be read.
+        """
+        try:
+            page_xml: str = self._app.GetHierarchy(page_id, HS_SELF)
+            return ET.fromstring(page_xml).get("lastModifiedTime", "")
+        except Exception as exc:
+            log.warning("Could not read hierarchy entry for %s: %s", page_id, exc)
+            return None
+
+    def _lookup_page(
+        self,
+        page_id: str,
+    ) -> tuple[ET.Element, ET.Element, ET.Element] | None:
+        """
+        Find (page_el, section_el, notebook_el) for *page_id*.
+
+        A fresh cached entry is only trusted if the page's live
+        lastModifiedTime still matches it; otherwise — or if the page is not
+        cached at all (e.g. created since the last build) — the index is
+        rebuilt once.  Returns None if the page is not in any open notebook.
+        """
+        cached = type(self)._index_cache
+        if cached is not None and cached.is_fresh():
+            entry = cached.pages.get(page_id)
+            if entry is not None and (
+                self._read_page_modified(page_id)
+                == entry[0].get("lastModifiedTime", "")
+            ):
+                log.info("Using cached notebook hierarchy.")
+                return entry
+            log.info("Cached hierarchy is stale for page %s; refreshing.", page_id)
+
+        return self._get_index(refresh=True).pages.get(page_id)
+
     def _find_page_element(
         self,
-        hierarchy_root: ET.Element,
+        index: _HierarchyIndex,
         page_title: str,
-    ) -> tuple[str, ET.Element]:
+    ) -> tuple[str, tuple[ET.Element, ET.Element, ET.Element]]:
         """
-        Search the hierarchy tree for a <one:Page> element whose 'name'
+        Search the hierarchy index for a <one:Page> element whose 'name'
         attribute matches *page_title*.
 
         Tries an exact match first, then a case-insensitive match as a
         fallback (useful if the window title casing differs slightly).
 
-        Returns (page_id, page_element).
+        Returns (page_id, (page_el, section_el, notebook_el)).
         Raises RuntimeError if no matching page is found.
         """
-        page_tag = _onetag("Page")          # Clark-notation tag to find
-
         # --- Exact match ---
-        for page_el in hierarchy_root.iter(page_tag):
-            if page_el.get("name", "") == page_title:
-                page_id = page_el.get("ID", "")
+        for page_id, entry in index.pages.items():
+            if entry[0].get("name", "") == page_title:
                 log.info("Found page (exact match), ID=%s", page_id)
-                return page_id, page_el
+                return page_id, entry
 
         # --- Case-insensitive fallback ---
         title_lower = page_title.lower()
-        for page_el in hierarchy_root.iter(page_tag):
-            if page_el.get("name", "").lower() == title_lower:
-                page_id = page_el.get("ID", "")
+        for page_id, entry in index.pages.items():
+            if entry[0].get("name", "").lower() == title_lower:
                 log.info("Found page (case-insensitive), ID=%s", page_id)
-                return page_id, page_el
+                return page_id, entry
 
         # --- Prefix (startswith) fallback ---
         # OneNote truncates long page titles in the window title bar.
         # Match any page whose name starts with the (truncated) title string.
-        for page_el in hierarchy_root.iter(page_tag):
-            name = page_el.get("name", "")
+        for page_id, entry in index.pages.items():
+            name = entry[0].get("name", "")
             if name.lower().startswith(title_lower):
-                page_id = page_el.get("ID", "")
                 log.info("Found page (prefix match '%s'), ID=%s", name, page_id)
-                return page_id, page_el
+                return page_id, entry
 
         raise RuntimeError(
             f"Page '{page_title}' was not found in any open notebook.\n"
@@ -235,17 +333,18 @@ class OneNoteInterface:
     def _extract_metadata(
         self,
         page_el: ET.Element,
-        hierarchy_root: ET.Element,
+        section_el: ET.Element,
+        notebook_el: ET.Element,
     ) -> dict:
         """
-        Build a metadata dictionary from the page's hierarchy element.
-
-        Also walks the hierarchy tree upward to find the parent Section
-        and Notebook names, and requests a OneNote deep-link URL for use
-        as the 'source' field in the Obsidian frontmatter.
+        Build a metadata dictionary from the page's hierarchy element and
+        its parent Section and Notebook elements (from the hierarchy index),
+        and request a OneNote deep-link URL for use as the 'source' field
+        in the Obsidian frontmatter.
 
         Returns a dict with keys:
-            page_id, title, created, modified, notebook, section, onenote_link
+            page_id, title, created, modified, last_modified_time,
+            notebook, section, onenote_link
         """
         # page_id: the GUID that uniquely identifies this page in OneNote
         page_id = page_el.get("ID", "")
@@ -268,21 +367,9 @@ class OneNoteInterface:
         # modified: last edit date (lastModifiedTime attribute)
         modified = _fmt_date(page_el.get("lastModifiedTime", ""))
 
-        # ---- Find parent Section and Notebook ----
-        # Walk every Notebook → Section → Page path in the hierarchy
-        nb_tag  = _onetag("Notebook")
-        sec_tag = _onetag("Section")
-        pg_tag  = _onetag("Page")
-
-        notebook_name = ""   # name of the notebook that owns this page
-        section_name  = ""   # name of the section that owns this page
-
-        for notebook_el in hierarchy_root.iter(nb_tag):
-            for section_el in notebook_el.iter(sec_tag):
-                for child_page_el in section_el.findall(pg_tag):
-                    if child_page_el.get("ID") == page_id:
-                        notebook_name = notebook_el.get("name", "")
-                        section_name  = section_el.get("name", "")
+        # ---- Parent Section and Notebook names ----
+        notebook_name = notebook_el.get("name", "")   # owning notebook
+        section_name  = section_el.get("name", "")    # owning section
 
         # ---- OneNote deep link ----
         # GetHyperlinkToObject returns an "onenote://" URI that opens this
@@ -299,6 +386,8 @@ class OneNoteInterface:
             "title":        page_el.get("name", "Untitled"),
             "created":      created,
             "modified":     modified,
+            # raw timestamp, compared against the export manifest by --sync
+            "last_modified_time": page_el.get("lastModifiedTime", ""),
             "notebook":     notebook_name,
             "section":      section_name,
             "onenote_link": onenote_link,
@@ -330,18 +419,74 @@ class OneNoteInterface:
         return content_xml
 
     # -----------------------------------------------------------------------
-    # Public entry point
+    # Public entry points
     # -----------------------------------------------------------------------
 
+    def get_current_page_id(self) -> str | None:
+        """
+        Return the ID of the page focused in the active OneNote window, or
+        None if it cannot be read.
+
+        app.Windows[1].CurrentPageId is always exact — no truncation issues
+        unlike reading the window title bar — and costs no hierarchy fetch,
+        so the tray calls this at hotkey time to pin down which page to
+        export before the request is queued.
+        """
+        try:
+            windows = self._app.Windows     # IOneNoteWindows collection
+            window  = windows[0]            # first (active) window, 0-indexed in comtypes
+            page_id = window.CurrentPageId
+            log.info("Got CurrentPageId from Windows API: %s", page_id)
+            return page_id or None
+        except Exception as exc:
+            log.warning("Windows API CurrentPageId failed (%s), will use title matching", exc)
+            return None
+
+    def warm_up(self):
+        """Build the hierarchy index now so the next export finds it cached."""
+        self._get_index()
+
+    def get_page_timestamps(self) -> dict[str, str]:
+        """
+        Return {page_id: lastModifiedTime} for every page in the hierarchy.
+
+        Costs a single GetHierarchy call and no GetPageContent calls, so the
+        sync command can decide which pages changed before fetching any.
+        The fresh index is cached, so the get_page() calls that follow reuse it.
+        """
+        index = self._get_index(refresh=True)
+        return {
+            page_id: entry[0].get("lastModifiedTime", "")
+            for page_id, entry in index.pages.items()
+        }
+
+    def get_page(self, page_id: str) -> tuple[str, dict]:
+        """
+        Return (content_xml, metadata) for the page with ID *page_id*.
+
+        Used by the sync command, which already knows the page IDs it
+        wants from the export manifest.
+        Raises RuntimeError if the page is not in any open notebook.
+        """
+        entry = self._lookup_page(page_id)
+        if entry is None:
+            raise RuntimeError(
+                f"Page ID {page_id} was not found in any open notebook."
+            )
+
+        metadata    = self._extract_metadata(*entry)
+        content_xml = self._fetch_page_content(page_id)
+        return content_xml, metadata
+
     def get_current_page(self) -> tuple[str, dict]:
         """
         Identify the currently focused OneNote page and return its
         content and metadata.
 
         Workflow:
-          1. Read the active page title from the OneNote window title bar.
-          2. Fetch the full notebook hierarchy.
-          3. Locate the matching page element in the hierarchy.
+          1. Read the active page ID (or, failing that, the window title).
+          2. Fetch the notebook hierarchy index (cached across exports).
+          3. Locate the matching page element in the index.
           4. Extract metadata (dates, notebook, section, deep link).
           5. Fetch the page content XML with embedded binary images.
 
@@ -349,35 +494,20 @@ class OneNoteInterface:
             (content_xml, metadata)
             content_xml  — raw OneNote page XML string
             metadata     — dict with keys: title, created, modified,
-                           notebook, section, page_id, onenote_link
+                           last_modified_time, notebook, section,
+                           page_id, onenote_link
         """
         # Step 1: get current page ID from the OneNote Windows collection.
-        # app.Windows[1].CurrentPageId is always exact — no truncation issues
-        # unlike reading the window title bar.
-        try:
-            windows    = self._app.Windows     # IOneNoteWindows collection
-            window     = windows[0]            # first (active) window, 0-indexed in comtypes
-            page_id_direct = window.CurrentPageId
-            log.info("Got CurrentPageId from Windows API: %s", page_id_direct)
-        except Exception as exc:
-            log.warning("Windows API CurrentPageId failed (%s), will use title matching", exc)
-            page_id_direct = None
-
-        # Step 2: full hierarchy XML → ElementTree root
-        log.info("Fetching notebook hierarchy...")
-        hierarchy_root = self._get_hierarchy()
+        page_id_direct = self.get_current_page_id()
 
-        # Step 3a: if we have the direct page ID, look it up in the hierarchy
+        # Steps 2-3a: if we have the direct page ID, look it up in the
+        # (possibly cached) hierarchy index
         if page_id_direct:
-            page_tag = _onetag("Page")
-            page_el  = None
-            for el in hierarchy_root.iter(page_tag):
-                if el.get("ID", "") == page_id_direct:
-                    page_el  = el
-                    page_id  = page_id_direct
-                    log.info("Found page by CurrentPageId, ID=%s", page_id)
-                    break
-            if page_el is None:
+            entry = self._lookup_page(page_id_direct)
+            if entry is not None:
+                page_id = page_id_direct
+                log.info("Found page by CurrentPageId, ID=%s", page_id)
+            else:
                 # ID not in hierarchy — fall back to title matching below
                 page_id_direct = None
 
@@ -389,10 +519,13 @@ class OneNoteInterface:
                     "No focused OneNote page was detected.\n"
                     "Click on a page in OneNote, then run the exporter."
                 )
-            page_id, page_el = self._find_page_element(hierarchy_root, page_title)
+            # Title matching is the rare fallback path; use a fresh index so
+            # a just-renamed page is not missed
+            index = self._get_index(refresh=True)
+            page_id, entry = self._find_page_element(index, page_title)
 
         # Step 4: build the metadata dict
-        metadata = self._extract_metadata(page_el, hierarchy_root)
+        metadata = self._extract_metadata(*entry)
 
         # Step 5: fetch page content with binary images
         content_xml = self._fetch_page_content(page_id)
@@ -0,0 +1,185 @@
+"""
+onenote_manifest.py
+
+Persistent record of which OneNote pages have been exported to the vault.
+
+Each entry maps a OneNote page ID to:
+  - note_path      — the exported .md file, relative to the vault root
+  - last_modified  — the page's raw lastModifiedTime at the last export
+  - content_hash   — SHA-256 of the converted Markdown body and its images
+
+The exporter uses the manifest to update an already-exported note in
+place instead of creating 'Title_2.md', and the --sync command uses it to
+re-export only the pages whose hierarchy timestamp has changed.
+
+The manifest is a small JSON file (default: onenote_manifest.json next to
+the scripts; override with the 'manifest_file' config key).
+
+Usage:
+    from onenote_manifest import ExportManifest
+    manifest = ExportManifest.from_config(config)
+    entry = manifest.get(page_id)
+    manifest.record(page_id, note_path, last_modified, body_hash)
+    manifest.save()
+"""
+
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+
+log = logging.getLogger(__name__)
+
+# Default manifest filename, resolved relative to this script's folder
+DEFAULT_MANIFEST_NAME = "onenote_manifest.json"
+
+# Read size when hashing image files
+_HASH_CHUNK = 1024 * 1024
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+def content_hash(text: str, images=()) -> str:
+    """
+    Return the hex SHA-256 digest of *text* encoded as UTF-8, followed by
+    the bytes of each image file.
+
+    images : (filename, temp_path) pairs from converter.collected_images.
+             Embeds are named by position, so a replaced picture leaves the
+             Markdown unchanged; hashing the bytes catches it.  With no
+             images the digest is that of *text* alone.
+    """
+    digest = hashlib.sha256(text.encode("utf-8"))
+    for filename, path in images:
+        digest.update(b"\0" + filename.encode("utf-8") + b"\0")
+        with open(path, "rb") as fh:
+            for chunk in iter(lambda: fh.read(_HASH_CHUNK), b""):
+                digest.update(chunk)
+    return digest.hexdigest()
+
+
+# ---------------------------------------------------------------------------
+# ExportManifest
+# ---------------------------------------------------------------------------
+
+class ExportManifest:
+    """
+    JSON-backed map of OneNote page ID → last export details.
+
+    Parameters
+    ----------
+    path       : location of the manifest JSON file
+    vault_root : Obsidian vault root; note paths are stored relative to it
+    """
+
+    def __init__(self, path: Path, vault_root: Path):
+        self._path  = Path(path)        # manifest file on disk
+        self._vault = Path(vault_root)  # base for relative note paths
+
+        # _pages: page_id → {"note_path", "last_modified", "content_hash"}
+        self._pages: dict[str, dict] = {}
+        self._load()
+
+    @classmethod
+    def from_config(cls, config: dict) -> "ExportManifest":
+        """
+        Build a manifest from the exporter config dict.
+
+        Uses config['manifest_file'] when present (absolute, or relative to
+        this script's folder); otherwise onenote_manifest.json beside it.
+        """
+        script_dir = Path(__file__).parent
+        manifest_path = Path(config.get("manifest_file", DEFAULT_MANIFEST_NAME))
+        if not manifest_path.is_absolute():
+            manifest_path = script_dir / manifest_path
+        return cls(manifest_path, Path(config["vault_path"]))
+
+    # -----------------------------------------------------------------------
+    # Persistence
+    # -----------------------------------------------------------------------
+
+    def _load(self):
+        """Read the manifest file, starting empty if it is missing or corrupt."""
+        if not self._path.exists():
+            return
+        try:
+            data = json.loads(self._path.read_text(encoding="utf-8"))
+            self._pages = data.get("pages", {})
+            log.info("Loaded export manifest (%d pages) from %s",
+                     len(self._pages), self._path)
+        except (OSError, ValueError) as exc:
+            log.warning("Ignoring unreadable manifest %s: %s", self._path, exc)
+            self._pages = {}
+
+    def save(self):
+        """Write the manifest atomically (temp file + os.replace)."""
+        tmp_path = self._path.with_suffix(self._path.suffix + ".tmp")
+        tmp_path.write_text(
+            json.dumps({"version": 1, "pages": self._pages}, indent=2),
+            encoding="utf-8",
+        )
+        os.replace(tmp_path, self._path)
+
+    # -----------------------------------------------------------------------
+    # Lookup / update
+    # -----------------------------------------------------------------------
+
+    @property
+    def page_ids(self) -> list[str]:
+        """IDs of every page recorded in the manifest."""
+        return list(self._pages)
+
+    def get(self, page_id: str) -> dict | None:
+        """Return the manifest entry for *page_id*, or None if never exported."""
+        return self._pages.get(page_id)
+
+    def note_path(self, page_id: str) -> Path | None:
+        """
+        Return the absolute path of the note previously exported for
+        *page_id*, or None if there is no entry or the note has since been
+        deleted or moved out of its recorded location.
+        """
+        entry = self._pages.get(page_id)
+        if not entry:
+            return None
+        path = self._vault / entry["note_path"]
+        return path if path.exists() else None
+
+    def is_current(self, page_id: str, last_modified: str) -> bool:
+        """
+        True when *page_id* was exported at exactly *last_modified* and the
+        note file is still present — i.e. nothing needs to be re-exported.
+        """
+        entry = self._pages.get(page_id)
+        return bool(
+            entry
+            and entry.get("last_modified") == last_modified
+            and self.note_path(page_id) is not None
+        )
+
+    def record(
+        self,
+        page_id: str,
+        note_path: Path,
+        last_modified: str,
+        body_hash: str,
+    ):
+        """
+        Store or replace the entry for *page_id*.
+
+        note_path     : absolute path of the written note (must be in the vault)
+        last_modified : raw lastModifiedTime from the hierarchy XML
+        body_hash     : content_hash() of the converted Markdown body and images
+        """
+        try:
+            rel_path = Path(note_path).relative_to(self._vault)
+        except ValueError:
+            rel_path = Path(note_path)   # outside the vault; keep as-is
+        self._pages[page_id] = {
+            "note_path":     rel_path.as_posix(),
+            "last_modified": last_modified,
+            "content_hash":  body_hash,
+        }
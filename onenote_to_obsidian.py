@@ -11,11 +11,18 @@ Orchestrates the full export pipeline:
     5. Notify the user via a Windows toast notification
     6. Open the new note in Obsidian
 
+Pages are recorded in an export manifest (see onenote_manifest.py), so
+exporting the same page again updates its existing note in place.
+
 Usage:
     python onenote_to_obsidian.py
     — or double-click run_onenote_export.bat —
+
+    python onenote_to_obsidian.py --sync
+    — re-export every previously exported page that changed in OneNote —
 """
 
+import argparse
 import json
 import logging
 import os
@@ -51,6 +58,9 @@ from onenote_converter import ContentConverter
 # ObsidianWriter — writes the Markdown note and assets to the vault
 from onenote_writer import ObsidianWriter
 
+# ExportManifest — remembers which note each OneNote page was exported to
+from onenote_manifest import ExportManifest, content_hash
+
 
 # ---------------------------------------------------------------------------
 # Configuration loader
@@ -246,6 +256,13 @@ def main():
         print(f"\nERROR: {exc}\n")
         return 1
 
+    # manifest: page_id → previously exported note; a known page is
+    # updated in place instead of producing 'Title_2.md'
+    manifest      = ExportManifest.from_config(config)
+    existing_path = manifest.note_path(metadata["page_id"])
+    if existing_path:
+        log.info("Page was exported before; updating %s", existing_path)
+
     # ------------------------------------------------------------------
     # Step 4 — Convert OneNote XML to Markdown
     # ------------------------------------------------------------------
@@ -265,7 +282,7 @@ def main():
         # body_markdown: the converted Markdown body (no frontmatter)
         body_markdown = converter.convert(content_xml)
 
-        # collected_images:      list of (filename, image_bytes)
+        # collected_images:      list of (filename, temp_path)
         # collected_attachments: list of (filename, source_path_str)
         collected_images      = converter.collected_images
         collected_attachments = converter.collected_attachments
@@ -283,14 +300,26 @@ def main():
     print("Writing to vault...")
 
     try:
+        # body_hash: taken before the write moves the spilled images away
+        body_hash = content_hash(body_markdown, collected_images)
+
         # note_path: absolute Path of the newly created .md file
         note_path = writer.write(
             metadata=metadata,
             body_markdown=body_markdown,
             images=collected_images,
             attachments=collected_attachments,
+            note_path=existing_path,
+        )
+        manifest.record(
+            metadata["page_id"],
+            note_path,
+            metadata.get("last_modified_time", ""),
+            body_hash,
         )
+        manifest.save()
     except Exception as exc:
+        converter.discard_images()   # remove any temp images not yet moved
         log.error("Write failed: %s", exc, exc_info=True)
         print(f"\nERROR writing to vault: {exc}\n")
         return 1
@@ -316,6 +345,12 @@ def main():
         detail_parts.append(f"{att_count} attachment{'s' if att_count != 1 else ''}")
     detail = (", ".join(detail_parts) + " copied") if detail_parts else "No images or attachments"
 
+    # Images that were byte-identical to one already in the vault
+    if writer.images_reused:
+        saved_kb = writer.bytes_saved // 1024
+        detail += f" ({writer.images_reused} reused, {saved_kb} KB saved)"
+        print(f"Reused {writer.images_reused} existing image(s), {saved_kb} KB saved.")
+
     _notify(
         title=f"Exported: {page_title}",
         message=detail,
@@ -326,10 +361,147 @@ def main():
     return 0
 
 
+# ---------------------------------------------------------------------------
+# Incremental sync
+# ---------------------------------------------------------------------------
+
+def _sync_page(
+    oni: OneNoteInterface,
+    writer: ObsidianWriter,
+    manifest: ExportManifest,
+    page_id: str,
+) -> bool:
+    """
+    Re-export one changed page into its existing note.
+
+    The note is only rewritten when the converted Markdown or any of its
+    images actually differs from the last export; a timestamp-only change
+    just refreshes the manifest entry.
+
+    Returns True if the note file was rewritten.
+    """
+    content_xml, metadata = oni.get_page(page_id)
+
+    converter = ContentConverter(
+        images_dir=writer.images_dir,
+        attachments_dir=writer.attachments_dir,
+        page_title=metadata.get("title", "Untitled"),
+    )
+    body_markdown = converter.convert(content_xml)
+    # Hashed before the write, which moves the spilled images into place
+    body_hash     = content_hash(body_markdown, converter.collected_images)
+
+    # existing_path: None if the user deleted or moved the note
+    entry         = manifest.get(page_id) or {}
+    existing_path = manifest.note_path(page_id)
+    rewritten     = not (existing_path and entry.get("content_hash") == body_hash)
+
+    if rewritten:
+        try:
+            note_path = writer.write(
+                metadata=metadata,
+                body_markdown=body_markdown,
+                images=converter.collected_images,
+                attachments=converter.collected_attachments,
+                note_path=existing_path,
+            )
+        except Exception:
+            converter.discard_images()   # remove any temp images not yet moved
+            raise
+    else:
+        note_path = existing_path
+        converter.discard_images()   # identical images already on disk
+        log.info("Content unchanged, keeping: %s", note_path)
+
+    manifest.record(
+        page_id, note_path, metadata.get("last_modified_time", ""), body_hash
+    )
+    return rewritten
+
+
+def sync(config: dict) -> int:
+    """
+    Re-export every manifest page whose lastModifiedTime has changed.
+
+    One GetHierarchy call supplies the timestamps for all pages; pages that
+    are unchanged cost no GetPageContent call at all.
+
+    Returns 0 on success, 1 if any page failed to sync.
+    """
+    manifest = ExportManifest.from_config(config)
+    if not manifest.page_ids:
+        print("Nothing to sync: no pages have been exported yet.")
+        return 0
+
+    try:
+        oni        = OneNoteInterface()
+        timestamps = oni.get_page_timestamps()
+        writer     = ObsidianWriter(config)
+    except Exception as exc:
+        log.error("Sync setup failed: %s", exc)
+        print(f"\nERROR: {exc}\n")
+        return 1
+
+    # Counters for the summary line
+    unchanged = updated = refreshed = missing = failed = 0
+
+    for page_id in manifest.page_ids:
+        last_modified = timestamps.get(page_id)
+        if last_modified is None:
+            # Page deleted in OneNote or its notebook is closed
+            log.warning("Page %s not in any open notebook; skipping.", page_id)
+            missing += 1
+            continue
+        if manifest.is_current(page_id, last_modified):
+            unchanged += 1
+            continue
+
+        try:
+            if _sync_page(oni, writer, manifest, page_id):
+                updated += 1
+            else:
+                refreshed += 1
+            manifest.save()   # persist per page so an abort keeps progress
+        except Exception as exc:
+            log.error("Sync failed for page %s: %s", page_id, exc, exc_info=True)
+            failed += 1
+
+    summary = (
+        f"Sync complete: {updated} updated, {refreshed} timestamp-only, "
+        f"{unchanged} unchanged, {missing} missing, {failed} failed"
+    )
+    log.info(summary)
+    print(f"\n{summary}\n")
+    return 1 if failed else 0
+
+
+def _cli() -> int:
+    """Parse command-line flags and dispatch to main() or sync()."""
+    parser = argparse.ArgumentParser(description="OneNote → Obsidian exporter")
+    parser.add_argument(
+        "--sync",
+        action="store_true",
+        help="Re-export previously exported pages that changed in OneNote.",
+    )
+    args = parser.parse_args()
+
+    if not args.sync:
+        return main()
+
+    config_path = Path(__file__).parent / "onenote_config.json"
+    try:
+        config = _load_config(config_path)
+    except (FileNotFoundError, ValueError) as exc:
+        log.error("Configuration error: %s", exc)
+        print(f"\nERROR: {exc}\n")
+        return 1
+    return sync(config)
+
+
 # ---------------------------------------------------------------------------
 # Entry point
 # ---------------------------------------------------------------------------
 
 if __name__ == "__main__":
     # sys.exit propagates the return code so the .bat file can detect failure
-    sys.exit(main())
+    sys.exit(_cli())
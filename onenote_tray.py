@@ -22,6 +22,7 @@ import atexit
 import json
 import logging
 import os
+import queue
 import subprocess
 import sys
 import threading
@@ -47,6 +48,7 @@ if str(_SCRIPT_DIR) not in sys.path:
 from onenote_interface import OneNoteInterface
 from onenote_converter import ContentConverter
 from onenote_writer import ObsidianWriter
+from onenote_manifest import ExportManifest, content_hash
 
 # Log file for diagnosing export failures (written next to this script)
 _LOG_FILE = _SCRIPT_DIR / "onenote_tray.log"
@@ -180,116 +182,244 @@ def _make_icon(size: int = 64) -> Image.Image:
 
 
 # ---------------------------------------------------------------------------
-# Export action
+# Export queue and worker
+#
+# Export requests (hotkey or menu) are queued and serviced by a single
+# long-lived worker thread, so a press made while another export is running
+# is not lost.  The worker keeps its COM connection, the parsed config, the
+# ObsidianWriter and the OneNote hierarchy cache warm between exports.
 # ---------------------------------------------------------------------------
 
-_export_lock = threading.Lock()   # prevent overlapping exports
+# _export_queue: (page_id or None, request time from time.perf_counter())
+_export_queue: "queue.Queue[tuple[str | None, float]]" = queue.Queue()
 
-def _do_export(icon: pystray.Icon, item):
-    """
-    Run the full export pipeline in-process when the user clicks the icon.
+# _pending_pages: page IDs queued but not yet started — a second request for
+# the same page is coalesced into the first.  Guarded by _pending_lock.
+_pending_pages: set[str | None] = set()
+_pending_lock = threading.Lock()
 
-    Running in-process (rather than via subprocess) means this code runs
-    inside the pythonw.exe that lives in the user's desktop session.  That
-    session has access to OneNote's COM Running Object Table, so
-    win32com.client.GetActiveObject("OneNote.Application") succeeds here
-    even though it fails from a terminal spawned by Claude Code.
+# _capture_local: per-thread OneNote connection used only to read the
+# focused page ID at request time (hotkey thread, pystray menu thread)
+_capture_local = threading.local()
 
-    icon : the pystray Icon object (tooltip is updated to show progress)
-    item : the pystray MenuItem that was clicked (not used)
+
+def _capture_page_id() -> str | None:
     """
-    # Only allow one export at a time
-    if not _export_lock.acquire(blocking=False):
-        return
+    Return the ID of the page focused right now, so the queued export
+    targets the page the user was on when they pressed the hotkey.
 
+    Uses a lazily created COM connection owned by the calling thread.
+    Returns None if OneNote cannot be reached; the worker then falls back
+    to whatever page is focused when it runs.
+    """
     try:
-        # CoInitialize must be called on each thread that uses COM.
-        # _do_export runs in a daemon thread, so we initialize COM here
-        # and uninitialize it in the finally block.
-        # Use comtypes (not pythoncom) since onenote_interface now uses comtypes.
-        import comtypes
-        comtypes.CoInitialize()
+        oni = getattr(_capture_local, "oni", None)
+        if oni is None:
+            import comtypes
+            comtypes.CoInitialize()
+            oni = OneNoteInterface()
+            _capture_local.oni = oni
+        return oni.get_current_page_id()
+    except Exception as exc:
+        logging.warning("Could not read focused page at request time: %s", exc)
+        _capture_local.oni = None
+        return None
 
-        icon.title = "Exporting..."
-        logging.info("Export started by user.")
 
-        # --- Load config ---
-        config = json.loads(CONFIG_FILE.read_text(encoding="utf-8"))
+def _request_export(icon: pystray.Icon):
+    """
+    Queue an export of the currently focused page (hotkey or menu click).
 
-        # --- Connect to OneNote and read the focused page ---
-        oni = OneNoteInterface()
-        content_xml, metadata = oni.get_current_page()
-        page_title = metadata.get("title", "Untitled")
-        logging.info("Exporting page: %r", page_title)
-        icon.title = f"Exporting: {page_title}..."
-
-        # --- Set up the vault writer ---
-        writer = ObsidianWriter(config)
-
-        # --- Convert XML to Markdown ---
-        converter = ContentConverter(
-            images_dir=writer.images_dir,
-            attachments_dir=writer.attachments_dir,
-            page_title=page_title,
-        )
-        body_markdown = converter.convert(content_xml)
+    icon : the pystray Icon object (tooltip is updated to show the queue)
+    """
+    requested_at = time.perf_counter()
+    page_id = _capture_page_id()
+
+    with _pending_lock:
+        if page_id in _pending_pages:
+            logging.info("Export of page %s already queued; coalesced.", page_id)
+            return
+        _pending_pages.add(page_id)
 
-        # --- Write the note ---
+    _export_queue.put((page_id, requested_at))
+    depth = _export_queue.qsize()
+    logging.info("Export queued (page %s, %d waiting).", page_id, depth)
+    if depth > 1:
+        icon.title = f"Exporting... ({depth} queued)"
+
+
+class _ExportWorker:
+    """
+    State kept warm across exports by the worker thread.
+
+    oni    : live OneNote COM connection (reconnected after a failure)
+    config : parsed onenote_config.json (reloaded when the file changes)
+    writer : ObsidianWriter for that config (keeps its image index loaded)
+    """
+
+    def __init__(self):
+        self.oni: OneNoteInterface | None = None
+        self.config: dict | None = None
+        self.writer: ObsidianWriter | None = None
+        self._config_mtime = None   # CONFIG_FILE mtime when last loaded
+
+    def ensure_ready(self):
+        """Connect to OneNote and (re)load config/writer as needed."""
+        mtime = CONFIG_FILE.stat().st_mtime_ns
+        if self.config is None or mtime != self._config_mtime:
+            self.config = json.loads(CONFIG_FILE.read_text(encoding="utf-8"))
+            self.writer = ObsidianWriter(self.config)
+            self._config_mtime = mtime
+            logging.info("Config loaded.")
+        if self.oni is None:
+            self.oni = OneNoteInterface()
+            self.oni.warm_up()
+
+
+def _export_page(icon: pystray.Icon, worker: _ExportWorker, page_id: str | None) -> Path:
+    """
+    Run the export pipeline for one page using the worker's warm state.
+
+    page_id : page captured at request time, or None for the focused page
+    Returns the Path of the written note.
+    """
+    worker.ensure_ready()
+    config, writer = worker.config, worker.writer
+
+    # --- Read the requested (or focused) page ---
+    if page_id:
+        content_xml, metadata = worker.oni.get_page(page_id)
+    else:
+        content_xml, metadata = worker.oni.get_current_page()
+    page_title = metadata.get("title", "Untitled")
+    logging.info("Exporting page: %r", page_title)
+    icon.title = f"Exporting: {page_title}..."
+
+    # --- Convert XML to Markdown ---
+    converter = ContentConverter(
+        images_dir=writer.images_dir,
+        attachments_dir=writer.attachments_dir,
+        page_title=page_title,
+    )
+    body_markdown = converter.convert(content_xml)
+
+    # --- Write the note (in place if this page was exported before) ---
+    manifest = ExportManifest.from_config(config)
+    try:
+        # Hashed before the write, which moves the spilled images into place
+        body_hash = content_hash(body_markdown, converter.collected_images)
         note_path = writer.write(
             metadata=metadata,
             body_markdown=body_markdown,
             images=converter.collected_images,
             attachments=converter.collected_attachments,
+            note_path=manifest.note_path(metadata["page_id"]),
+        )
+    except Exception:
+        converter.discard_images()   # remove any temp images not yet moved
+        raise
+    manifest.record(
+        metadata["page_id"],
+        note_path,
+        metadata.get("last_modified_time", ""),
+        body_hash,
+    )
+    manifest.save()
+
+    logging.info("Export complete: %s", note_path)
+    if writer.images_reused:
+        logging.info(
+            "Reused %d existing image(s), %d bytes saved.",
+            writer.images_reused, writer.bytes_saved,
         )
 
-        logging.info("Export complete: %s", note_path)
+    # --- Toast notification ---
+    try:
+        from win10toast import ToastNotifier
+        ToastNotifier().show_toast(
+            f"Exported: {page_title}",
+            str(note_path.name),
+            duration=5,
+            threaded=True,
+        )
+    except Exception:
+        pass  # toast is non-critical
 
-        # --- Toast notification ---
-        try:
-            from win10toast import ToastNotifier
-            ToastNotifier().show_toast(
-                f"Exported: {page_title}",
-                str(note_path.name),
-                duration=5,
-                threaded=True,
-            )
-        except Exception:
-            pass  # toast is non-critical
+    # --- Open in Obsidian ---
+    import urllib.parse
+    vault_name   = config.get("vault_name", "Main")
+    vault_root   = Path(config["vault_path"])
+    rel          = note_path.relative_to(vault_root).with_suffix("")
+    file_param   = urllib.parse.quote(str(rel).replace("\\", "/"))
+    obsidian_uri = f"obsidian://open?vault={urllib.parse.quote(vault_name)}&file={file_param}"
+    if config.get("open_after_export", True):
+        os.startfile(obsidian_uri)
+
+    return note_path
+
+
+def _export_worker(icon: pystray.Icon):
+    """
+    Service the export queue forever (runs in one daemon thread).
+
+    Running in-process (rather than via subprocess) means this code runs
+    inside the pythonw.exe that lives in the user's desktop session.  That
+    session has access to OneNote's COM Running Object Table, so
+    connecting to OneNote.Application succeeds here even though it fails
+    from a terminal spawned by Claude Code.
 
-        # --- Open in Obsidian ---
-        import urllib.parse
-        vault_name   = config.get("vault_name", "Main")
-        vault_root   = Path(config["vault_path"])
-        rel          = note_path.relative_to(vault_root).with_suffix("")
-        file_param   = urllib.parse.quote(str(rel).replace("\\", "/"))
-        obsidian_uri = f"obsidian://open?vault={urllib.parse.quote(vault_name)}&file={file_param}"
-        if config.get("open_after_export", True):
-            os.startfile(obsidian_uri)
+    COM is initialised once for the lifetime of the thread, and the
+    connection is built before the first request arrives.
 
-        icon.title = "OneNote to Obsidian (ready)"
+    icon : the pystray Icon object (tooltip is updated to show progress)
+    """
+    import comtypes
+    comtypes.CoInitialize()
 
+    worker = _ExportWorker()
+    try:
+        worker.ensure_ready()      # pre-warm: connect + cache the hierarchy
+        logging.info("Export worker ready.")
     except Exception as exc:
-        logging.error("Export failed: %s", exc, exc_info=True)
-        # Show a brief error in the tooltip
-        icon.title = f"Error: {str(exc)[:100]}"
+        logging.warning("Export worker pre-warm failed (will retry): %s", exc)
+        worker.oni = None
+
+    while True:
+        page_id, requested_at = _export_queue.get()
+        with _pending_lock:
+            _pending_pages.discard(page_id)   # later presses queue anew
+
+        started_at = time.perf_counter()
+        icon.title = "Exporting..."
         try:
-            import ctypes
-            ctypes.windll.user32.MessageBoxW(
-                0,
-                f"Export failed:\n\n{exc}",
-                "OneNote Obsidian Export",
-                0x10,  # MB_ICONERROR
+            _export_page(icon, worker, page_id)
+            done_at = time.perf_counter()
+            logging.info(
+                "Hotkey-to-note latency: %.0f ms (%.0f ms queued, %.0f ms export)",
+                (done_at - requested_at) * 1000,
+                (started_at - requested_at) * 1000,
+                (done_at - started_at) * 1000,
             )
-        except Exception:
-            pass
+            if _export_queue.empty():
+                icon.title = "OneNote to Obsidian (ready)"
+
+        except Exception as exc:
+            logging.error("Export failed: %s", exc, exc_info=True)
+            worker.oni = None   # OneNote may have restarted; reconnect next time
+            # Show a brief error in the tooltip
+            icon.title = f"Error: {str(exc)[:100]}"
+            try:
+                ctypes.windll.user32.MessageBoxW(
+                    0,
+                    f"Export failed:\n\n{exc}",
+                    "OneNote Obsidian Export",
+                    0x10,  # MB_ICONERROR
+                )
+            except Exception:
+                pass
 
-    finally:
-        # Release COM resources on this thread before the thread exits.
-        try:
-            comtypes.CoUninitialize()
-        except Exception:
-            pass
-        _export_lock.release()
+        finally:
+            _export_queue.task_done()
 
 
 # ---------------------------------------------------------------------------
@@ -362,7 +492,7 @@ def _register_hotkey(icon: pystray.Icon) -> None:
     Runs a Windows message loop in this thread so WM_HOTKEY messages are
     delivered.  Blocks forever (designed to run in a daemon thread).
 
-    icon : the live pystray Icon — passed to _do_export for tooltip updates
+    icon : the live pystray Icon — passed to _request_export for tooltip updates
     """
     try:
         # Read hotkey combo from config; fall back to ctrl+shift+o
@@ -391,10 +521,8 @@ def _register_hotkey(icon: pystray.Icon) -> None:
         msg = ctypes.wintypes.MSG()
         while ctypes.windll.user32.GetMessageW(ctypes.byref(msg), None, 0, 0) != 0:
             if msg.message == _WM_HOTKEY and msg.wParam == HOTKEY_ID:
-                logging.info("Global hotkey (%s) fired — starting export.", combo)
-                threading.Thread(
-                    target=_do_export, args=(icon, None), daemon=True
-                ).start()
+                logging.info("Global hotkey (%s) fired — queueing export.", combo)
+                _request_export(icon)
             ctypes.windll.user32.TranslateMessage(ctypes.byref(msg))
             ctypes.windll.user32.DispatchMessageW(ctypes.byref(msg))
 
@@ -452,9 +580,7 @@ def _build_menu(icon: pystray.Icon) -> pystray.Menu:
         # Default item (activated on left-click or Enter): export
         pystray.MenuItem(
             "Export to Obsidian",
-            lambda i, item: threading.Thread(
-                target=_do_export, args=(i, item), daemon=True
-            ).start(),
+            lambda i, item: _request_export(i),
             default=True,    # bold; also triggered by left-click
         ),
         pystray.Menu.SEPARATOR,
@@ -490,6 +616,11 @@ def run_tray():
     # Assign menu after icon is created so we can pass the icon reference
     icon.menu = _build_menu(icon)
 
+    # Start the export worker first so it can connect to OneNote and cache
+    # the hierarchy before the first hotkey press.
+    worker_thread = threading.Thread(target=_export_worker, args=(icon,), daemon=True)
+    worker_thread.start()
+
     # Start global hotkey listener in a background daemon thread.
     # Daemon=True means it dies automatically when the main thread exits.
     hotkey_thread = threading.Thread(target=_register_hotkey, args=(icon,), daemon=True)
@@ -7,12 +7,19 @@ Responsibilities:
   - Build YAML frontmatter from page metadata
   - Sanitise the page title for use as a filename
   - Avoid duplicate filenames by appending _2, _3, etc.
-  - Save extracted images to the vault images folder
-  - Copy attached files to the vault attachments folder
+  - Overwrite an existing note in place when re-exporting a known page
+  - Save extracted images to the vault images folder, reusing any
+    byte-identical image already there (SHA-256 index of the folder)
+  - Import attached files into the vault attachments folder via the
+    cheapest available strategy (reflink → hardlink → chunked copy),
+    verified by SHA-256 and skipped on later exports when unchanged
   - Write the final .md file with UTF-8 encoding (no BOM)
 """
 
+import hashlib
+import json
 import logging
+import os
 import re
 import shutil
 from pathlib import Path
@@ -22,6 +29,23 @@ log = logging.getLogger(__name__)
 # Characters that cannot appear in Windows filenames
 _ILLEGAL_CHARS = re.compile(r'[<>:"/\\|?*\x00-\x1f]')
 
+# Hash index of the images folder, stored inside that folder.  The leading
+# dot keeps it out of Obsidian's file explorer.
+_IMAGE_INDEX_NAME = ".image_hashes.json"
+
+# Read size used when hashing files
+_HASH_CHUNK = 1 << 20
+
+# Record of imported attachments, stored inside the attachments folder
+_ATTACHMENT_INDEX_NAME = ".attachment_hashes.json"
+
+# Attachment import strategies, tried in order (config key
+# 'attachment_strategies' overrides).  See _import_reflink etc. below.
+DEFAULT_ATTACHMENT_STRATEGIES = ("reflink", "hardlink", "copy")
+
+# Linux FICLONE ioctl request number (copy-on-write clone of a whole file)
+_FICLONE = 0x40049409
+
 
 # ---------------------------------------------------------------------------
 # Helpers (module-level, no class state needed)
@@ -90,6 +114,215 @@ def _build_frontmatter(metadata: dict) -> str:
     return "\n".join(lines)
 
 
+def _sha256_file(path: Path) -> str:
+    """Return the hex SHA-256 of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(_HASH_CHUNK), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+# ---------------------------------------------------------------------------
+# Attachment import strategies
+#
+# Each takes (source, temp_dest) and either creates temp_dest with the
+# source's content and returns its SHA-256, or raises OSError so the next
+# strategy is tried.  The caller renames temp_dest over the final name.
+# ---------------------------------------------------------------------------
+
+def _import_reflink(source: Path, temp_dest: Path) -> str:
+    """
+    Copy-on-write clone (btrfs/XFS via FICLONE).  Shares data blocks with
+    the source without the hardlink caveat that edits to one show up in
+    the other.  Raises OSError where unsupported (including Windows).
+    """
+    try:
+        import fcntl
+    except ImportError:
+        raise OSError("reflink not supported on this platform") from None
+    with open(source, "rb") as src_fh, open(temp_dest, "wb") as dst_fh:
+        try:
+            fcntl.ioctl(dst_fh.fileno(), _FICLONE, src_fh.fileno())
+        except OSError:
+            dst_fh.close()
+            temp_dest.unlink(missing_ok=True)
+            raise
+    shutil.copystat(source, temp_dest)
+    return _sha256_file(source)
+
+
+def _import_hardlink(source: Path, temp_dest: Path) -> str:
+    """
+    Hard link to the source (same volume only).  No bytes are copied, but
+    the vault file and the OneNote cache file are then the same file —
+    remove "hardlink" from attachment_strategies if that is unwanted.
+    """
+    os.link(source, temp_dest)
+    return _sha256_file(source)
+
+
+def _import_copy(source: Path, temp_dest: Path) -> str:
+    """
+    Chunked copy, hashing the source as it is read, then verifying the
+    written file against that hash.  Raises OSError on a mismatch.
+    """
+    digest = hashlib.sha256()
+    with open(source, "rb") as src_fh, open(temp_dest, "wb") as dst_fh:
+        for chunk in iter(lambda: src_fh.read(_HASH_CHUNK), b""):
+            digest.update(chunk)
+            dst_fh.write(chunk)
+    shutil.copystat(source, temp_dest)
+
+    source_hash = digest.hexdigest()
+    if _sha256_file(temp_dest) != source_hash:
+        temp_dest.unlink(missing_ok=True)
+        raise OSError(f"verification failed copying {source}")
+    return source_hash
+
+
+# name → strategy function, used to resolve the configured order
+_ATTACHMENT_STRATEGIES = {
+    "reflink":  _import_reflink,
+    "hardlink": _import_hardlink,
+    "copy":     _import_copy,
+}
+
+
+# ---------------------------------------------------------------------------
+# Image hash index
+# ---------------------------------------------------------------------------
+
+class _ImageIndex:
+    """
+    SHA-256 → filename index of every file in the vault images folder.
+
+    Persisted as JSON ({filename: {size, mtime_ns, sha256}}) inside the
+    folder.  On load the folder is re-stat'ed and only files that are new
+    or whose size/mtime changed are re-hashed; entries for deleted files
+    are dropped.
+
+    images_dir : the vault images folder
+    """
+
+    def __init__(self, images_dir: Path):
+        self._dir  = images_dir
+        self._path = images_dir / _IMAGE_INDEX_NAME
+
+        # _files: filename → {"size", "mtime_ns", "sha256"}
+        self._files: dict[str, dict] = {}
+        # _by_hash: sha256 → filename (first file seen with that content)
+        self._by_hash: dict[str, str] = {}
+
+        self._load_and_refresh()
+
+    def _load_and_refresh(self):
+        """Load the saved index and bring it in line with the folder."""
+        saved: dict[str, dict] = {}
+        if self._path.exists():
+            try:
+                saved = json.loads(self._path.read_text(encoding="utf-8"))
+            except (OSError, ValueError) as exc:
+                log.warning("Rebuilding unreadable image index: %s", exc)
+
+        rehashed = 0
+        for dir_entry in os.scandir(self._dir):
+            name = dir_entry.name
+            if name.startswith(".") or not dir_entry.is_file():
+                continue   # the index itself, temp spill files, subfolders
+            stat = dir_entry.stat()
+            known = saved.get(name)
+            if known and known["size"] == stat.st_size and known["mtime_ns"] == stat.st_mtime_ns:
+                self._files[name] = known
+            else:
+                self._files[name] = {
+                    "size":     stat.st_size,
+                    "mtime_ns": stat.st_mtime_ns,
+                    "sha256":   _sha256_file(Path(dir_entry.path)),
+                }
+                rehashed += 1
+
+        for name in sorted(self._files):
+            self._by_hash.setdefault(self._files[name]["sha256"], name)
+
+        if rehashed or len(saved) != len(self._files):
+            log.info("Image index: %d files (%d hashed)", len(self._files), rehashed)
+            self.save()
+
+    def find(self, sha256: str) -> str | None:
+        """Return the name of an existing image with this hash, if any."""
+        name = self._by_hash.get(sha256)
+        if name and (self._dir / name).exists():
+            return name
+        return None
+
+    def add(self, filename: str, sha256: str):
+        """Record a file just written to the images folder."""
+        stat = (self._dir / filename).stat()
+        old = self._files.get(filename)
+        if old and self._by_hash.get(old["sha256"]) == filename:
+            del self._by_hash[old["sha256"]]   # file was overwritten
+        self._files[filename] = {
+            "size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": sha256,
+        }
+        self._by_hash.setdefault(sha256, filename)
+
+    def save(self):
+        """Write the index atomically (temp file + os.replace)."""
+        tmp_path = self._path.with_name(self._path.name + ".tmp")
+        tmp_path.write_text(json.dumps(self._files), encoding="utf-8")
+        os.replace(tmp_path, self._path)
+
+
+# ---------------------------------------------------------------------------
+# Attachment record
+# ---------------------------------------------------------------------------
+
+class _AttachmentIndex:
+    """
+    What was last imported under each attachment filename:
+
+        filename → {source, source_size, source_mtime_ns,
+                    size, mtime_ns, sha256}
+
+    When the source file and the vault copy both still match their recorded
+    size and mtime, a later export can skip the attachment without reading
+    either file.  Persisted as JSON inside the attachments folder.
+    """
+
+    def __init__(self, attachments_dir: Path):
+        self._path = attachments_dir / _ATTACHMENT_INDEX_NAME
+        # _records: filename → record dict (see class docstring)
+        self._records: dict[str, dict] = {}
+        if self._path.exists():
+            try:
+                self._records = json.loads(self._path.read_text(encoding="utf-8"))
+            except (OSError, ValueError) as exc:
+                log.warning("Ignoring unreadable attachment index: %s", exc)
+
+    def get(self, filename: str) -> dict | None:
+        """Return the record for *filename*, or None."""
+        return self._records.get(filename)
+
+    def record(self, filename: str, source: Path, dest: Path, sha256: str):
+        """Store the stat signatures of *source* and *dest* plus the hash."""
+        src_stat, dst_stat = source.stat(), dest.stat()
+        self._records[filename] = {
+            "source":          str(source),
+            "source_size":     src_stat.st_size,
+            "source_mtime_ns": src_stat.st_mtime_ns,
+            "size":            dst_stat.st_size,
+            "mtime_ns":        dst_stat.st_mtime_ns,
+            "sha256":          sha256,
+        }
+
+    def save(self):
+        """Write the index atomically (temp file + os.replace)."""
+        tmp_path = self._path.with_name(self._path.name + ".tmp")
+        tmp_path.write_text(json.dumps(self._records, indent=1), encoding="utf-8")
+        os.replace(tmp_path, self._path)
+
+
 # ---------------------------------------------------------------------------
 # ObsidianWriter
 # ---------------------------------------------------------------------------
@@ -106,6 +339,9 @@ class ObsidianWriter:
             import_folder       — subfolder for new notes (e.g. "10 - Clippings")
             images_folder       — subfolder for images  (e.g. "00 - Images")
             attachments_folder  — subfolder for attachments
+        Optional:
+            attachment_strategies — import methods to try in order
+                                    (default: reflink, hardlink, copy)
     """
 
     def __init__(self, config: dict):
@@ -127,6 +363,20 @@ class ObsidianWriter:
         for directory in (self._import_dir, self._images_dir, self._attachments_dir):
             directory.mkdir(parents=True, exist_ok=True)
 
+        # _image_index: built on the first write that has images
+        self._image_index: _ImageIndex | None = None
+
+        # _attachment_index: loaded on the first write that has attachments
+        self._attachment_index: _AttachmentIndex | None = None
+
+        # _strategies: ordered (name, function) attachment import methods
+        names = config.get("attachment_strategies", DEFAULT_ATTACHMENT_STRATEGIES)
+        self._strategies = [(n, _ATTACHMENT_STRATEGIES[n]) for n in names]
+
+        # Dedup statistics for the most recent write() call
+        self.images_reused = 0      # images replaced by an existing file
+        self.bytes_saved   = 0      # bytes not written thanks to reuse
+
     # -----------------------------------------------------------------------
     # Properties (for ContentConverter to read)
     # -----------------------------------------------------------------------
@@ -149,8 +399,9 @@ class ObsidianWriter:
         self,
         metadata: dict,
         body_markdown: str,
-        images: list[tuple[str, bytes]],
+        images: list[tuple[str, Path]],
         attachments: list[tuple[str, str]],
+        note_path: Path | None = None,
     ) -> Path:
         """
         Write the complete note to the vault, including all assets.
@@ -159,21 +410,48 @@ class ObsidianWriter:
         ----------
         metadata        : page metadata dict (from OneNoteInterface)
         body_markdown   : converted Markdown body (from ContentConverter)
-        images          : list of (filename, image_bytes) to save
+        images          : list of (filename, temp_path) to move into place
         attachments     : list of (filename, source_path) to copy
+        note_path       : existing note to overwrite (from the export
+                          manifest); None picks a fresh, unused filename
+
+        Byte-identical images already in the images folder are reused: the
+        new copy is discarded and its embed in *body_markdown* is pointed at
+        the existing file.  See images_reused / bytes_saved afterwards.
 
         Returns the Path of the written .md file.
         """
-        # 1. Save every extracted image to the images folder
-        for img_filename, img_bytes in images:
-            self._save_image(img_filename, img_bytes)
-
-        # 2. Copy every attachment to the attachments folder
-        for att_filename, source_path in attachments:
-            self._copy_attachment(att_filename, source_path)
+        # 1. Move every extracted image into the images folder (or reuse)
+        self.images_reused = 0
+        self.bytes_saved   = 0
+        if images:
+            if self._image_index is None:
+                self._image_index = _ImageIndex(self._images_dir)
+            for img_filename, temp_path in images:
+                final_name = self._save_image(img_filename, temp_path)
+                if final_name != img_filename:
+                    body_markdown = body_markdown.replace(
+                        f"![[{img_filename}]]", f"![[{final_name}]]"
+                    )
+            self._image_index.save()
+            if self.images_reused:
+                log.info(
+                    "Reused %d existing image(s), %d bytes not duplicated.",
+                    self.images_reused, self.bytes_saved,
+                )
+
+        # 2. Import every attachment into the attachments folder
+        if attachments:
+            if self._attachment_index is None:
+                self._attachment_index = _AttachmentIndex(self._attachments_dir)
+            for att_filename, source_path in attachments:
+                self._copy_attachment(att_filename, source_path)
+            self._attachment_index.save()
 
         # 3. Determine the output path (handles duplicates with _2, _3, ...)
-        note_path = self._resolve_note_path(metadata["title"])
+        #    unless the caller is updating a previously exported note
+        if note_path is None:
+            note_path = self._resolve_note_path(metadata["title"])
 
         # 4. Build YAML frontmatter
         frontmatter = _build_frontmatter(metadata)
@@ -196,35 +474,104 @@ class ObsidianWriter:
     # Asset saving helpers
     # -----------------------------------------------------------------------
 
-    def _save_image(self, filename: str, image_bytes: bytes):
+    def _save_image(self, filename: str, temp_path: Path) -> str:
         """
-        Write raw image bytes to the vault images directory.
-
-        filename    : destination filename (e.g. "PageTitle_img_01.png")
-        image_bytes : decoded binary image data
+        Move a decoded image from its temp file to its final name in the
+        vault images directory, unless an identical image is already there.
+
+        The converter spills images into the images directory itself, so
+        this is a same-volume rename rather than a copy.
+
+        filename  : destination filename (e.g. "PageTitle_img_01.png")
+        temp_path : temp file written by ContentConverter
+        Returns   : the filename the note should embed — *filename*, the
+                    name of the existing identical image, or, when a
+                    different image already has *filename* (a re-export
+                    in place), *filename* with a hash suffix; an existing
+                    file is never overwritten
         """
+        digest   = _sha256_file(temp_path)
+        existing = self._image_index.find(digest)
+        if existing:
+            size = Path(temp_path).stat().st_size
+            Path(temp_path).unlink()
+            self.images_reused += 1
+            self.bytes_saved   += size
+            log.info("Image %s identical to existing %s; reusing.", filename, existing)
+            return existing
+
         dest_path = self._images_dir / filename
-        dest_path.write_bytes(image_bytes)
-        log.info("Saved image: %s (%d bytes)", dest_path, len(image_bytes))
+        if dest_path.exists():
+            if _sha256_file(dest_path) == digest:
+                Path(temp_path).unlink()
+                self._image_index.add(filename, digest)
+                return filename
+            # Other notes may embed the file under this name (dedup reuse),
+            # so changed content gets a name of its own instead
+            dest_path = dest_path.with_name(f"{dest_path.stem}_{digest[:8]}{dest_path.suffix}")
+            filename  = dest_path.name
+        os.replace(temp_path, dest_path)
+        self._image_index.add(filename, digest)
+        log.info("Saved image: %s (%d bytes)", dest_path, dest_path.stat().st_size)
+        return filename
 
     def _copy_attachment(self, filename: str, source_path: str):
         """
-        Copy an attachment from its OneNote cache location to the vault.
+        Import an attachment from its OneNote cache location to the vault.
+
+        Skipped without reading either file when the source and the vault
+        copy still match the size/mtime recorded at the last import.  If
+        only the source's stat changed, its hash is compared with the
+        recorded one before anything is written.  Otherwise the configured
+        strategies are tried in order into a temp file, which is then
+        renamed over the destination.
 
         filename    : destination filename in the attachments folder
         source_path : absolute path to the cached file on disk
         """
-        dest_path   = self._attachments_dir / filename
-        source      = Path(source_path)
-
-        # Skip if the destination already exists and has the same size,
-        # which is a quick proxy for "already copied, no change"
-        if dest_path.exists() and dest_path.stat().st_size == source.stat().st_size:
-            log.info("Attachment unchanged, skipping: %s", dest_path)
+        dest_path = self._attachments_dir / filename
+        source    = Path(source_path)
+        src_stat  = source.stat()
+        rec       = self._attachment_index.get(filename)
+
+        # dest_intact: vault copy is exactly what we imported last time
+        dest_intact = False
+        if rec and dest_path.exists():
+            dst_stat = dest_path.stat()
+            dest_intact = (dst_stat.st_size == rec["size"]
+                           and dst_stat.st_mtime_ns == rec["mtime_ns"])
+
+        if dest_intact:
+            if (rec["source"] == str(source)
+                    and rec["source_size"] == src_stat.st_size
+                    and rec["source_mtime_ns"] == src_stat.st_mtime_ns):
+                log.info("Attachment unchanged, skipping: %s", dest_path)
+                return
+            if rec["size"] == src_stat.st_size and _sha256_file(source) == rec["sha256"]:
+                # Same bytes from a touched or relocated cache file
+                self._attachment_index.record(filename, source, dest_path, rec["sha256"])
+                log.info("Attachment content unchanged, skipping: %s", dest_path)
+                return
+
+        temp_path = dest_path.with_name(f".{filename}.part")
+        temp_path.unlink(missing_ok=True)
+        same_volume = src_stat.st_dev == self._attachments_dir.stat().st_dev
+
+        for name, strategy in self._strategies:
+            if name in ("reflink", "hardlink") and not same_volume:
+                continue
+            try:
+                digest = strategy(source, temp_path)
+            except OSError as exc:
+                log.debug("Attachment strategy %s failed for %s: %s", name, filename, exc)
+                temp_path.unlink(missing_ok=True)
+                continue
+            os.replace(temp_path, dest_path)
+            self._attachment_index.record(filename, source, dest_path, digest)
+            log.info("Imported attachment (%s): %s → %s", name, source_path, dest_path)
             return
 
-        shutil.copy2(source_path, dest_path)
-        log.info("Copied attachment: %s → %s", source_path, dest_path)
+        raise OSError(f"Could not import attachment {source_path} → {dest_path}")
 
     # -----------------------------------------------------------------------
     # Filename / duplicate resolution
@@ -1,18 +1,36 @@
 ﻿# parse_mbox_to_obsidian.py
 # Parses Gmail mbox export into Obsidian markdown files
 # Creates recipe files in 01/Recipes when recipe content is detected
+# Saves attachments once per distinct content to 09 - Attachments and links them
+# Messages are located by byte offset, then converted in parallel worker processes
+# Replies are grouped by thread (Message-ID / In-Reply-To / References) into one note
 
-import mailbox
+import argparse
+import binascii
+import mmap
 import os
 import re
+import shutil
+import time
 import email
+import email.header
+import hashlib
+import json
+import mimetypes
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from email.parser import BytesHeaderParser, BytesParser
 from email.utils import parsedate_to_datetime
-from datetime import datetime
+from itertools import repeat
+from datetime import datetime, timezone
 from html.parser import HTMLParser
 from html import unescape
 import urllib.request
 import urllib.error
 import ssl
+import sqlite3
+import threading
+import urllib.parse
+from collections import Counter, deque
 
 # ==================== CONFIGURATION ====================
 # Path to the mbox file to parse
@@ -21,6 +39,31 @@ MBOX_PATH = r"C:\Users\awt\takeout-20260203T200710Z-3-001\Takeout\Mail\Receipts.
 GMAIL_OUTPUT_DIR = r"C:\Users\awt\Sync\Obsidian\04 - GMail"
 # Output directory for recipe markdown files
 RECIPE_OUTPUT_DIR = r"C:\Users\awt\Sync\Obsidian\01\Recipes"
+# Output directory for attachments, stored once per distinct content (SHA-256)
+ATTACHMENTS_DIR = r"C:\Users\awt\Sync\Obsidian\09 - Attachments"
+# Base64 / quoted-printable text decoded per step when saving an attachment
+ATTACHMENT_CHUNK_CHARS = 1024 * 1024
+# Approximate mbox bytes handed to a worker process at a time
+SHARD_BYTES = 16 * 1024 * 1024
+# Work files (import ledger, URL cache) for the import
+WORK_DIR = os.path.join(os.path.expanduser("~"), "mbox_work")
+# Imported messages: Message-ID -> note path, body hash (skips them next run)
+LEDGER_DB = os.path.join(WORK_DIR, "import_ledger.db")
+# Notes whose messages were merged into another thread note are moved here, not deleted
+SUPERSEDED_DIR = os.path.join(WORK_DIR, "superseded_notes")
+# Scratch store for converted messages until their threads are complete (recreated each run)
+THREAD_STAGE_DB = os.path.join(WORK_DIR, "thread_stage.db")
+# Fetched pages for recipe detection: url -> text, is_recipe, fetched_at
+URL_CACHE_DB = os.path.join(WORK_DIR, "url_cache.db")
+# Cached pages are reused for this long; failed fetches are retried sooner
+URL_CACHE_TTL_DAYS = 90
+URL_RETRY_HOURS = 24
+# Concurrent page fetches, and the per-domain request rate (requests/sec, burst)
+URL_FETCH_WORKERS = 16
+URL_DOMAIN_RATE = 1.0
+URL_DOMAIN_BURST = 2
+# Converted messages held back waiting on their URL fetches before the writer blocks
+MAX_PENDING_WRITES = 2000
 
 # ==================== HTML TO TEXT CONVERTER ====================
 class HTMLToText(HTMLParser):
@@ -100,10 +143,10 @@ def get_email_body(message):
         # Walk through all message parts
         for part in message.walk():
             content_type = part.get_content_type()
-            content_disposition = str(part.get("Content-Disposition", ""))
 
-            # Skip attachments
-            if "attachment" in content_disposition:
+            # Only decode the text bodies; attachments and embedded images
+            # are streamed to disk by extract_attachments(), never held here
+            if content_type not in ("text/plain", "text/html") or is_attachment(part):
                 continue
 
             try:
@@ -150,25 +193,279 @@ def get_email_body(message):
     else:
         return "", False
 
+# ==================== ATTACHMENT EXTRACTION ====================
+def is_attachment(part):
+    """
+    True for a message part saved as a file: anything marked attachment,
+    plus inline parts that carry a file (named parts and embedded images)
+    other than the text/plain and text/html bodies.
+    Args:
+        part: Leaf email.message.Message part
+    """
+    if part.get_content_disposition() == 'attachment':
+        return True
+    content_type = part.get_content_type()
+    if content_type in ('text/plain', 'text/html'):
+        return False
+    return bool(part.get_filename()) or part.get_content_maintype() == 'image'
+
+def iter_part_bytes(part):
+    """
+    Decode a part's payload piece by piece, so a large attachment never
+    exists as one decoded bytes object (get_payload(decode=True) builds
+    the whole thing, plus a whitespace-free copy of the base64 text).
+    Args:
+        part: Leaf email.message.Message part
+    Yields:
+        Decoded byte chunks, in order
+    """
+    encoding = str(part.get('Content-Transfer-Encoding', '')).strip().lower()
+    payload = part.get_payload()
+    if encoding not in ('base64', 'quoted-printable') or not isinstance(payload, str):
+        # 7bit / 8bit / binary / uuencode: rare for attachments, decoded whole
+        data = part.get_payload(decode=True)
+        if data:
+            yield data
+        return
+
+    if encoding == 'base64':
+        carry = ''
+        for start in range(0, len(payload), ATTACHMENT_CHUNK_CHARS):
+            chunk = carry + ''.join(payload[start:start + ATTACHMENT_CHUNK_CHARS].split())
+            usable = len(chunk) - len(chunk) % 4
+            carry = chunk[usable:]
+            try:
+                yield binascii.a2b_base64(chunk[:usable])
+            except binascii.Error:
+                return  # Corrupt payload: keep what decoded so far
+        if carry.rstrip('='):
+            try:
+                yield binascii.a2b_base64(carry + '=' * (-len(carry) % 4))
+            except binascii.Error:
+                pass  # Truncated final quantum
+        return
+
+    # quoted-printable: cut only at line ends so "=XX" and soft breaks stay whole
+    start = 0
+    while start < len(payload):
+        end = payload.find('\n', start + ATTACHMENT_CHUNK_CHARS)
+        end = len(payload) if end == -1 else end + 1
+        yield binascii.a2b_qp(payload[start:end].encode('ascii', errors='replace'))
+        start = end
+
+def attachment_extension(part):
+    """
+    File extension for an attachment: from its filename, else guessed from
+    its content type, else ".bin".
+    Args:
+        part: Leaf email.message.Message part
+    Returns:
+        Lowercase extension including the dot
+    """
+    ext = os.path.splitext(decode_subject(part.get_filename()) or '')[1].lower()
+    if not re.fullmatch(r'\.[a-z0-9]{1,8}', ext):
+        ext = mimetypes.guess_extension(part.get_content_type()) or '.bin'
+    return ext
+
+def save_attachment(part, attachments_dir):
+    """
+    Store one attachment under its content hash (<sha256[:16]><ext>), so a
+    logo or PDF repeated across thousands of messages is kept once.
+    The payload is decoded twice at most: first only to hash it, then, if
+    no file with that hash exists yet, straight to a temporary file that is
+    hard-linked into place. The link fails if another worker stored the
+    same content first, which counts as a duplicate like any other.
+    Args:
+        part: Leaf email.message.Message part (see is_attachment())
+        attachments_dir: Directory for attachment files
+    Returns:
+        Dict with name (original filename), file (stored file name),
+        sha256, size and new (False if the content was already stored),
+        or None for an empty part or one that couldn't be written
+    """
+    hasher = hashlib.sha256()
+    size = 0
+    for chunk in iter_part_bytes(part):
+        hasher.update(chunk)
+        size += len(chunk)
+    if not size:
+        return None
+    digest = hasher.hexdigest()
+    ext = attachment_extension(part)
+    filename = digest[:16] + ext
+    name = sanitize_filename(decode_subject(part.get_filename()) or '', max_length=120)
+    if name == "Untitled":
+        name = f"{part.get_content_maintype()}{ext}"
+    info = {'name': name, 'file': filename, 'sha256': digest, 'size': size, 'new': False}
+
+    filepath = os.path.join(attachments_dir, filename)
+    if os.path.exists(filepath):
+        return info
+    temp_path = f"{filepath}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(attachments_dir, exist_ok=True)
+        with open(temp_path, 'wb') as f:
+            for chunk in iter_part_bytes(part):
+                f.write(chunk)
+        try:
+            os.link(temp_path, filepath)
+            info['new'] = True
+        except FileExistsError:
+            pass
+    except OSError as e:
+        print(f"  Error saving attachment {name}: {e}\n", end="")
+        return None
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+    return info
+
+def extract_attachments(message, attachments_dir):
+    """
+    Save every attachment of a message (see save_attachment()).
+    Args:
+        message: email.message.Message object
+        attachments_dir: Directory for attachment files
+    Returns:
+        List of save_attachment() dicts, in message order
+    """
+    attachments = []
+    for part in message.walk():
+        if part.is_multipart() or not is_attachment(part):
+            continue
+        info = save_attachment(part, attachments_dir)
+        if info:
+            attachments.append(info)
+    return attachments
+
+def with_attachment_links(body, attachments):
+    """
+    Append a Markdown list linking a note body to its attachments.
+    Args:
+        body: Note body text
+        attachments: List of extract_attachments() dicts
+    Returns:
+        The body, followed by the list if there are attachments
+    """
+    if not attachments:
+        return body
+    lines = [body.rstrip(), "", "Attachments:"]
+    for info in attachments:
+        size = f"{info['size'] / 1024:,.0f} KB" if info['size'] >= 1024 else f"{info['size']} B"
+        lines.append(f"- [[{info['file']}|{info['name']}]] ({size})")
+    return '\n'.join(lines)
+
 # ==================== RECIPE DETECTION ====================
-# Keywords that strongly indicate recipe content
-RECIPE_KEYWORDS = [
+# Keywords that indicate recipe content, by scoring category. Words match
+# whole (so "oz" doesn't hit "cozy"), case-insensitively, with plural and
+# -d/-ed/-ing endings: list base forms only
+RECIPE_KEYWORDS = {
     # Measurement terms
-    'cup', 'cups', 'tablespoon', 'tablespoons', 'tbsp', 'teaspoon', 'teaspoons', 'tsp',
-    'ounce', 'ounces', 'oz', 'pound', 'pounds', 'lb', 'lbs',
+    'measurement': ['cup', 'tablespoon', 'tbsp', 'teaspoon', 'tsp',
+                    'ounce', 'oz', 'pound', 'lb'],
     # Recipe structure terms
-    'ingredients', 'directions', 'instructions', 'preheat', 'bake', 'cook',
-    'simmer', 'stir', 'mix', 'combine', 'serving', 'servings', 'prep time',
-    'cook time', 'yield', 'makes', 'serves',
+    'structure': ['ingredients', 'directions', 'instructions', 'preheat', 'bake', 'cook',
+                  'simmer', 'stir', 'mix', 'combine', 'serving', 'prep time',
+                  'cook time', 'yield', 'makes', 'serves'],
     # Common cooking actions
-    'chop', 'dice', 'mince', 'slice', 'saute', 'fry', 'roast', 'grill',
-    'marinate', 'whisk', 'fold', 'knead', 'dough'
-]
+    'action': ['chop', 'dice', 'mince', 'slice', 'saute', 'fry', 'roast', 'grill',
+               'marinate', 'whisk', 'fold', 'knead', 'dough'],
+}
+
+# Score for each distinct keyword found, per category, and for each
+# quantity-with-unit ("2 cups", "1/2 tsp", "1 ½ lb") found. Units and
+# cooking verbs show up in receipts too ("16 oz", "Grill cover", "Dice
+# game"), so they count for less than recipe structure words
+RECIPE_WEIGHTS = {
+    'measurement': 0.5,
+    'structure': 1.0,
+    'action': 0.5,
+    'quantity': 1.25,
+}
+# Texts scoring at least this are recipes: e.g. three quantities with their
+# units plus one structure word, or five structure words
+RECIPE_MIN_SCORE = 5.0
+
+def trie_regex(words):
+    """
+    Build a regex alternation matching any of words, factored into a prefix
+    trie ("c(?:ook(?: time)?|up)") so the engine follows one branch per
+    character instead of trying every word at every position.
+    Args:
+        words: Iterable of literal words
+    Returns:
+        Regex source string (no surrounding group)
+    """
+    trie = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[''] = {}  # end-of-word marker
+
+    def build(node):
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ''
+        alt = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        # Greedy optional: the longer word is tried first
+        return f'(?:{alt})?' if '' in node else alt
+
+    return build(trie)
+
+def compile_recipe_scanner(keywords):
+    """
+    Compile the single-pass recipe scanner: any keyword, with optional
+    plural / -d / -ed / -ing ending, up to a word boundary. The pattern
+    starts with a plain set of first letters, which lets the regex engine
+    skip straight to candidate positions; the start-of-word check is done
+    on each match instead (see score_recipe_text()).
+    Args:
+        keywords: RECIPE_KEYWORDS-style dict of category -> base words
+    Returns:
+        Tuple of (compiled regex, dict of base word -> category)
+    """
+    category_of = {word: category for category, words in keywords.items() for word in words}
+    pattern = rf'({trie_regex(category_of)})(?:s|es|d|ed|ing)?\b'
+    return re.compile(pattern), category_of
+
+RECIPE_SCAN_RE, RECIPE_CATEGORY_OF = compile_recipe_scanner(RECIPE_KEYWORDS)
+
+# A quantity ending right before a measurement unit: "2 ", "1/2", "1 ½ ", "3"
+QUANTITY_BEFORE_RE = re.compile(r'(?:\d|[½¼¾⅓⅔])\s*$')
+
+def score_recipe_text(text):
+    """
+    Score text for recipe content in one pass of RECIPE_SCAN_RE.
+    Each distinct keyword scores its category's weight once; every
+    measurement unit preceded by a quantity ("2 cups", "1/2 tsp", "3oz")
+    also scores RECIPE_WEIGHTS['quantity'].
+    Args:
+        text: The body text to analyze
+    Returns:
+        Tuple of (score, distinct_keyword_count, quantity_count)
+    """
+    text = text.lower()
+    found = set()
+    quantities = 0
+    for m in RECIPE_SCAN_RE.finditer(text):
+        start = m.start()
+        # Whole words only ("oz" not in "cozy"); a digit may precede ("12oz")
+        if start and text[start - 1].isalpha():
+            continue
+        word = m.group(1)
+        found.add(word)
+        if RECIPE_CATEGORY_OF[word] == 'measurement' and \
+                QUANTITY_BEFORE_RE.search(text, max(0, start - 8), start):
+            quantities += 1
+    score = quantities * RECIPE_WEIGHTS['quantity']
+    score += sum(RECIPE_WEIGHTS[RECIPE_CATEGORY_OF[word]] for word in found)
+    return score, len(found), quantities
 
 def is_recipe_content(text, subject=""):
     """
     Determine if text content appears to be a recipe.
-    Uses keyword matching and pattern detection.
+    Uses the weighted keyword / quantity score from score_recipe_text().
     Args:
         text: The body text to analyze
         subject: Email subject line for additional context
@@ -178,23 +475,11 @@ def is_recipe_content(text, subject=""):
     if not text:
         return False
 
-    text_lower = text.lower()
-    subject_lower = subject.lower() if subject else ""
-
     # Check if subject explicitly mentions recipe
-    if 'recipe' in subject_lower:
+    if subject and 'recipe' in subject.lower():
         return True
 
-    # Count recipe-related keywords found
-    keyword_count = sum(1 for kw in RECIPE_KEYWORDS if kw in text_lower)
-
-    # Look for measurement patterns like "2 cups", "1/2 tsp", etc.
-    measurement_pattern = r'\d+\s*(?:cup|tbsp|tsp|oz|lb|pound|ounce|tablespoon|teaspoon)'
-    measurements_found = len(re.findall(measurement_pattern, text_lower))
-
-    # Require multiple recipe indicators to avoid false positives
-    # Need at least 5 keywords OR 3+ measurements
-    return keyword_count >= 5 or measurements_found >= 3
+    return score_recipe_text(text)[0] >= RECIPE_MIN_SCORE
 
 # ==================== URL EXTRACTION AND FETCHING ====================
 def extract_urls(text):
@@ -210,20 +495,25 @@ def extract_urls(text):
     urls = re.findall(url_pattern, text)
     return urls
 
+# Domains whose pages are treated as recipes regardless of content
+RECIPE_DOMAINS = ['allrecipes', 'food.com', 'epicurious', 'bonappetit',
+                  'seriouseats', 'foodnetwork', 'tasty', 'delish',
+                  'simplyrecipes', 'budgetbytes', 'minimalistbaker']
+
+# SSL context that doesn't verify certificates (for compatibility); built once
+SSL_CONTEXT = ssl.create_default_context()
+SSL_CONTEXT.check_hostname = False
+SSL_CONTEXT.verify_mode = ssl.CERT_NONE
+
 def fetch_url_content(url):
     """
     Fetch content from a URL and convert to text.
     Args:
         url: URL to fetch
     Returns:
-        Tuple of (text_content, is_recipe_boolean)
+        Tuple of (text_content, is_recipe_boolean); (None, False) on failure
     """
     try:
-        # Create SSL context that doesn't verify certificates (for compatibility)
-        ctx = ssl.create_default_context()
-        ctx.check_hostname = False
-        ctx.verify_mode = ssl.CERT_NONE
-
         # Set up request with browser-like headers
         req = urllib.request.Request(
             url,
@@ -233,7 +523,7 @@ def fetch_url_content(url):
         )
 
         # Fetch with timeout
-        with urllib.request.urlopen(req, timeout=10, context=ctx) as response:
+        with urllib.request.urlopen(req, timeout=10, context=SSL_CONTEXT) as response:
             html = response.read().decode('utf-8', errors='replace')
             text = html_to_text(html)
 
@@ -241,17 +531,136 @@ def fetch_url_content(url):
             is_recipe = is_recipe_content(text)
 
             # Also check for recipe-related URLs/domains
-            recipe_domains = ['allrecipes', 'food.com', 'epicurious', 'bonappetit',
-                            'seriouseats', 'foodnetwork', 'tasty', 'delish',
-                            'simplyrecipes', 'budgetbytes', 'minimalistbaker']
-            if any(domain in url.lower() for domain in recipe_domains):
+            if any(domain in url.lower() for domain in RECIPE_DOMAINS):
                 is_recipe = True
 
             return text, is_recipe
     except Exception as e:
-        print(f"  Failed to fetch {url}: {e}")
+        # One write call, so lines from concurrent fetch threads don't interleave
+        print(f"  Failed to fetch {url}: {e}\n", end="")
         return None, False
 
+class TokenBucket:
+    """
+    Thread-safe token bucket: acquire() blocks until a request may be sent.
+    Args:
+        rate: Tokens added per second (sustained requests/sec)
+        burst: Bucket capacity (requests that may go out back-to-back)
+    """
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        # Start full so the first requests to a domain go out immediately
+        self.tokens = float(burst)
+        self.stamp = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Take one token, sleeping until one is available"""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.stamp) * self.rate)
+                self.stamp = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+class UrlFetcher:
+    """
+    Fetches pages for recipe detection on a bounded thread pool.
+
+    submit(url) returns a Future of (text, is_recipe). Results come from the
+    SQLite cache (url -> text, is_recipe, fetched_at) when fresh, and a URL
+    is requested at most once per run. Each domain has its own TokenBucket.
+    Only the main thread touches the database: finished fetches are saved
+    by store() when the writer consumes them.
+    """
+    def __init__(self, cache_path=URL_CACHE_DB, workers=URL_FETCH_WORKERS):
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        self.db = sqlite3.connect(cache_path)
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS url_cache ("
+            "url TEXT PRIMARY KEY, text TEXT, is_recipe INTEGER NOT NULL, "
+            "fetched_at REAL NOT NULL)"
+        )
+        self.pool = ThreadPoolExecutor(max_workers=workers)
+        # URL -> Future for fetches not yet stored
+        self.inflight = {}
+        # Domain -> TokenBucket
+        self.buckets = {}
+        self.buckets_lock = threading.Lock()
+        # Counters: requests made, and submits answered by the cache or an earlier fetch
+        self.fetched = 0
+        self.reused = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.pool.shutdown(wait=True, cancel_futures=True)
+        self.db.commit()
+        self.db.close()
+
+    def submit(self, url):
+        """
+        Start (or reuse) the fetch of url.
+        Args:
+            url: URL to fetch
+        Returns:
+            Future resolving to (text_content, is_recipe_boolean)
+        """
+        if url in self.inflight:
+            self.reused += 1
+            return self.inflight[url]
+        row = self.db.execute(
+            "SELECT text, is_recipe, fetched_at FROM url_cache WHERE url = ?", (url,)
+        ).fetchone()
+        if row:
+            text, is_recipe, fetched_at = row
+            # Failures are retried sooner than good pages are refreshed
+            max_age = URL_CACHE_TTL_DAYS * 86400 if text is not None else URL_RETRY_HOURS * 3600
+            if time.time() - fetched_at < max_age:
+                self.reused += 1
+                future = Future()
+                future.set_result((text, bool(is_recipe)))
+                return future
+        future = self.pool.submit(self._fetch, url)
+        self.inflight[url] = future
+        return future
+
+    def _fetch(self, url):
+        """Worker thread: wait for the domain's rate limit, then fetch"""
+        domain = urllib.parse.urlsplit(url).hostname or ""
+        with self.buckets_lock:
+            bucket = self.buckets.get(domain)
+            if bucket is None:
+                bucket = self.buckets[domain] = TokenBucket(URL_DOMAIN_RATE, URL_DOMAIN_BURST)
+        bucket.acquire()
+        return fetch_url_content(url)
+
+    def store(self, url, future):
+        """
+        Save a finished fetch to the cache (no-op for cache hits).
+        Args:
+            url: URL that was fetched
+            future: Its Future from submit()
+        """
+        if self.inflight.get(url) is not future:
+            return
+        del self.inflight[url]
+        text, is_recipe = future.result()
+        self.db.execute(
+            "INSERT OR REPLACE INTO url_cache (url, text, is_recipe, fetched_at) "
+            "VALUES (?, ?, ?, ?)",
+            (url, text, int(is_recipe), time.time())
+        )
+        self.fetched += 1
+        if self.fetched % 100 == 0:
+            self.db.commit()
+
 # ==================== FILE NAME SANITIZATION ====================
 def sanitize_filename(name, max_length=80):
     """
@@ -275,7 +684,8 @@ def sanitize_filename(name, max_length=80):
     return name.strip() or "Untitled"
 
 # ==================== MARKDOWN FILE CREATION ====================
-def create_markdown_file(output_dir, filename, yaml_frontmatter, content, is_recipe=False):
+def create_markdown_file(output_dir, filename, yaml_frontmatter, content, is_recipe=False,
+                         existing_path=None, extra_tags=()):
     """
     Write a markdown file with YAML frontmatter.
     Args:
@@ -284,6 +694,8 @@ def create_markdown_file(output_dir, filename, yaml_frontmatter, content, is_rec
         yaml_frontmatter: Dict of YAML frontmatter fields
         content: Markdown body content
         is_recipe: Whether this is a recipe file (adds recipe tag)
+        existing_path: Overwrite this file instead of creating a new one
+        extra_tags: Tags to add after email-import (e.g. email-thread)
     Returns:
         Path to created file, or None if failed
     """
@@ -292,11 +704,11 @@ def create_markdown_file(output_dir, filename, yaml_frontmatter, content, is_rec
 
     # Build the file path
     safe_filename = sanitize_filename(filename)
-    filepath = os.path.join(output_dir, f"{safe_filename}.md")
+    filepath = existing_path or os.path.join(output_dir, f"{safe_filename}.md")
 
     # Handle filename collisions by appending counter
     counter = 1
-    while os.path.exists(filepath):
+    while not existing_path and os.path.exists(filepath):
         filepath = os.path.join(output_dir, f"{safe_filename} {counter}.md")
         counter += 1
 
@@ -317,6 +729,8 @@ def create_markdown_file(output_dir, filename, yaml_frontmatter, content, is_rec
     else:
         yaml_lines.append("tags:")
         yaml_lines.append("  - email-import")
+    for tag in extra_tags:
+        yaml_lines.append(f"  - {tag}")
 
     yaml_lines.append("---")
 
@@ -332,115 +746,791 @@ def create_markdown_file(output_dir, filename, yaml_frontmatter, content, is_rec
         print(f"  Error writing {filepath}: {e}")
         return None
 
+def set_aside_note(path):
+    """
+    Move a note out of the vault into SUPERSEDED_DIR, keeping any edits made
+    to it; a name already taken there gets a counter appended.
+    Args:
+        path: Note whose messages now live in another note
+    Returns:
+        New path of the note, or None if it no longer exists
+    """
+    if not os.path.exists(path):
+        return None
+    os.makedirs(SUPERSEDED_DIR, exist_ok=True)
+    stem, ext = os.path.splitext(os.path.basename(path))
+    dest = os.path.join(SUPERSEDED_DIR, stem + ext)
+    counter = 1
+    while os.path.exists(dest):
+        dest = os.path.join(SUPERSEDED_DIR, f"{stem} {counter}{ext}")
+        counter += 1
+    shutil.move(path, dest)
+    return dest
+
+# ==================== MESSAGE CONVERSION ====================
+# A Message-ID inside a header value: "<id@host>"
+MESSAGE_ID_RE = re.compile(r'<[^<>\s]+>')
+
+def decode_subject(subject):
+    """
+    Decode an RFC 2047 encoded subject line (=?utf-8?...?=) to plain text.
+    Args:
+        subject: Raw Subject header value
+    Returns:
+        Decoded subject, or the raw value if it can't be decoded
+    """
+    if not subject:
+        return subject
+    try:
+        decoded_parts = email.header.decode_header(subject)
+        return ''.join(
+            part.decode(charset or 'utf-8') if isinstance(part, bytes) else part
+            for part, charset in decoded_parts
+        )
+    except:
+        return subject
+
+def convert_message(message, attachments_dir=None):
+    """
+    Extract headers and body from one message, detect recipes, pick
+    the URLs to fetch for short link-only messages, and save attachments.
+    Args:
+        message: email.message.Message object
+        attachments_dir: Directory to save attachments to (None: skip them)
+    Returns:
+        Dict with subject, yaml_data, body (attachment links appended),
+        attachments (extract_attachments() dicts), is_recipe, fetch_urls,
+        references (thread parent and ancestor Message-IDs), timestamp
+        and sent (send time, for ordering a thread) and log (progress
+        lines for the writer to print)
+    """
+    log = []
+
+    # Extract email headers
+    subject = decode_subject(message.get('Subject', 'No Subject'))
+    from_addr = message.get('From', 'Unknown')
+    to_addr = message.get('To', '')
+    date_str = message.get('Date', '')
+    message_id = message.get('Message-ID', '')
+    gmail_labels = message.get('X-Gmail-Labels', '')
+
+    # Parse date into ISO format
+    date_iso = ""
+    timestamp = None
+    sent = ""
+    if date_str:
+        try:
+            dt = parsedate_to_datetime(date_str)
+            date_iso = dt.strftime('%Y-%m-%d')
+            sent = dt.strftime('%Y-%m-%d %H:%M')
+            # "-0000" dates parse as naive; treat them as UTC for ordering
+            if dt.tzinfo is None:
+                dt = dt.replace(tzinfo=timezone.utc)
+            timestamp = dt.timestamp()
+        except:
+            date_iso = date_str
+
+    # Thread links: the parent (In-Reply-To), then the ancestors (References)
+    references = []
+    for header in ('In-Reply-To', 'References'):
+        for ref in MESSAGE_ID_RE.findall(str(message.get(header, ''))):
+            if ref not in references:
+                references.append(ref)
+
+    # Get email body content
+    body, was_html = get_email_body(message)
+
+    # Build YAML frontmatter dictionary
+    yaml_data = {
+        'from': from_addr,
+        'to': to_addr,
+        'date': date_iso,
+        'subject': subject,
+        'gmail_labels': gmail_labels
+    }
+
+    # Check if body content is a recipe
+    is_recipe = is_recipe_content(body, subject)
+
+    # If body is mostly just URLs, try to fetch recipe content
+    body_stripped = body.strip()
+    urls = extract_urls(body_stripped)
+
+    # Short link-only messages: the writer fetches these URLs (UrlFetcher)
+    # and uses the first one that turns out to be a recipe
+    fetch_urls = []
+    if not is_recipe and urls and len(body_stripped) < 500:
+        log.append(f"  Found {len(urls)} URL(s), checking for recipes...")
+        fetch_urls = urls[:3]  # Limit to first 3 URLs
+
+    attachments = extract_attachments(message, attachments_dir) if attachments_dir else []
+    body = with_attachment_links(body, attachments)
+
+    return {
+        'subject': subject,
+        'yaml_data': yaml_data,
+        'body': body,
+        'attachments': attachments,
+        'is_recipe': is_recipe,
+        'fetch_urls': fetch_urls,
+        'references': references,
+        'timestamp': timestamp,
+        'sent': sent,
+        'log': log,
+    }
+
+# ==================== IMPORT LEDGER ====================
+def open_ledger(ledger_path=LEDGER_DB):
+    """
+    Open (creating if needed) the ledger of imported messages.
+    One row per message: its key (Message-ID), the note written for it,
+    a SHA-256 of the note body, and when it was imported. Messages of email
+    notes also keep their converted data (thread_messages), so a thread
+    note can be re-rendered when later mail joins it.
+    Args:
+        ledger_path: Path to the SQLite file
+    Returns:
+        sqlite3.Connection
+    """
+    os.makedirs(os.path.dirname(ledger_path), exist_ok=True)
+    conn = sqlite3.connect(ledger_path)
+    # Committed after every note: WAL keeps those commits cheap
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = NORMAL")
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS imported ("
+        "message_id TEXT PRIMARY KEY, note_path TEXT, body_hash TEXT, "
+        "imported_at REAL NOT NULL)"
+    )
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS thread_messages ("
+        "message_id TEXT PRIMARY KEY, note_path TEXT NOT NULL, message TEXT NOT NULL)"
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS thread_messages_note ON thread_messages (note_path)"
+    )
+    conn.commit()
+    return conn
+
+def load_imported_keys(ledger_path=LEDGER_DB):
+    """
+    Read every message key already in the ledger.
+    Args:
+        ledger_path: Path to the SQLite file
+    Returns:
+        frozenset of message keys (empty if there is no ledger yet)
+    """
+    if not os.path.exists(ledger_path):
+        return frozenset()
+    conn = sqlite3.connect(ledger_path)
+    try:
+        return frozenset(row[0] for row in conn.execute("SELECT message_id FROM imported"))
+    finally:
+        conn.close()
+
+def message_key(headers, header_bytes):
+    """
+    Identify a message for the ledger: its Message-ID, or for the rare
+    message without one, a SHA-256 of its raw header block.
+    Args:
+        headers: email.message.Message with the parsed headers
+        header_bytes: The raw header block those were parsed from
+    Returns:
+        Key string
+    """
+    message_id = str(headers.get('Message-ID') or '').strip()
+    if message_id:
+        return message_id
+    return 'sha256:' + hashlib.sha256(header_bytes).hexdigest()
+
+# Message keys already imported, and where attachments go; set in each worker process by init_worker()
+_imported_keys = frozenset()
+_attachments_dir = None
+
+def init_worker(ledger_path, reimport, attachments_dir):
+    """
+    Worker process initializer: load the ledger's keys once per process.
+    Args:
+        ledger_path: Path to the SQLite ledger
+        reimport: True to convert every message regardless of the ledger
+        attachments_dir: Directory workers save attachments to
+    """
+    global _imported_keys, _attachments_dir
+    _imported_keys = frozenset() if reimport else load_imported_keys(ledger_path)
+    _attachments_dir = attachments_dir
+
+# ==================== THREAD INDEX ====================
+# Reply / forward markers at the start of a subject: "Re:", "RE[2]:", "Fwd:", "FW:", "AW:"...
+REPLY_PREFIX_RE = re.compile(r'^(?:\s*(?:re|fwd?|aw|sv|antw)\s*(?:\[\d+\])?\s*:)+\s*', re.IGNORECASE)
+# Subjects too generic to group mail by
+GENERIC_SUBJECTS = {'', 'no subject', '(no subject)'}
+# A "Re:" message without usable thread headers joins a same-subject thread
+# only if it was sent within this many days of that thread's latest message
+THREAD_SUBJECT_WINDOW_DAYS = 14
+
+def split_reply_prefix(subject):
+    """
+    Separate "Re:" / "Fwd:" markers from a subject line.
+    Args:
+        subject: Decoded subject line
+    Returns:
+        Tuple of (had_prefix, subject_without_prefix)
+    """
+    subject = subject or ''
+    match = REPLY_PREFIX_RE.match(subject)
+    if not match:
+        return False, subject.strip()
+    return True, subject[match.end():].strip()
+
+def thread_node(message_key_value):
+    """
+    The union-find node for a message key: its bracketed Message-ID as it
+    appears in other messages' References, or the key itself (sha256 keys).
+    """
+    match = MESSAGE_ID_RE.search(message_key_value)
+    return match.group(0) if match else message_key_value
+
+class ThreadIndex:
+    """
+    Groups messages into threads with a union-find over Message-IDs.
+
+    add() unions a message with every ID in its In-Reply-To / References,
+    so replies whose parent is missing from the mailbox still meet through
+    the shared ancestor. threads() then links reply-subject messages that
+    are still alone ("Re: Cake" with no usable headers) to the most recent
+    thread with the same base subject, if it was active within
+    THREAD_SUBJECT_WINDOW_DAYS. Unions are near-constant time (path
+    halving, union by size), so assembly is linear in the number of
+    messages apart from sorting by date.
+    """
+    def __init__(self):
+        # Node -> parent node, and root -> component size
+        self.parent = {}
+        self.size = {}
+        # (seq, node, base_subject, is_reply, timestamp) per message, in mbox order
+        self.members = []
+
+    def __len__(self):
+        return len(self.members)
+
+    def find(self, node):
+        """Return node's root, halving the path on the way"""
+        parent = self.parent
+        if node not in parent:
+            parent[node] = node
+            self.size[node] = 1
+            return node
+        while parent[node] != node:
+            parent[node] = parent[parent[node]]
+            node = parent[node]
+        return node
+
+    def union(self, a, b):
+        """Merge the threads containing a and b"""
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a == root_b:
+            return
+        if self.size[root_a] < self.size[root_b]:
+            root_a, root_b = root_b, root_a
+        self.parent[root_b] = root_a
+        self.size[root_a] += self.size.pop(root_b)
+
+    def add(self, seq, key, references, subject, timestamp):
+        """
+        Register one message.
+        Args:
+            seq: Caller's handle for the message (returned by threads())
+            key: The message's ledger key (Message-ID)
+            references: Message-IDs from its In-Reply-To and References
+            subject: Decoded subject line
+            timestamp: Send time (epoch seconds), or None if unknown
+        """
+        node = thread_node(key)
+        self.find(node)
+        for ref in references:
+            self.union(node, ref)
+        is_reply, base = split_reply_prefix(subject)
+        base = ' '.join(base.split()).lower()
+        if base in GENERIC_SUBJECTS:
+            base = ''
+        self.members.append((seq, node, base, is_reply, timestamp))
+
+    def threads(self):
+        """
+        Assemble the threads.
+        Returns:
+            List of threads, each a list of seq values in date order
+            (undated messages last); threads ordered by first appearance
+            in the mbox
+        """
+        # Subject fallback, only for dated reply-subject messages the headers left alone
+        real = Counter(self.find(node) for _, node, _, _, _ in self.members)
+        window = THREAD_SUBJECT_WINDOW_DAYS * 86400
+        anchors = {}  # base subject -> [node, latest timestamp, set by a lone reply]
+        dated = sorted((m for m in self.members if m[2] and m[4] is not None), key=lambda m: m[4])
+        for _, node, base, is_reply, timestamp in dated:
+            lone_reply = is_reply and real[self.find(node)] == 1
+            anchor = anchors.get(base)
+            if anchor and timestamp - anchor[1] <= window and (lone_reply or anchor[2]):
+                # A lone reply joins the subject's thread; an original sent
+                # after its lone replies (clock skew) takes them in
+                self.union(node, anchor[0])
+                anchor[1] = timestamp
+                anchor[2] = anchor[2] and lone_reply
+            else:
+                anchors[base] = [node, timestamp, lone_reply]
+
+        groups = {}
+        for seq, node, _, _, timestamp in self.members:
+            groups.setdefault(self.find(node), []).append((timestamp is None, timestamp or 0, seq))
+        return [[seq for _, _, seq in sorted(group)] for group in groups.values()]
+
+def render_thread(members):
+    """
+    Render messages as consecutive sections of a thread note.
+    Args:
+        members: Staged message dicts, in the order to show them
+    Returns:
+        Markdown body: one "## <sent> · <from>" section per message
+    """
+    sections = []
+    for member in members:
+        yaml_data = member['yaml_data']
+        heading = f"## {member['sent'] or yaml_data['date'] or 'Undated'} · {yaml_data['from']}"
+        sections.append(f"{heading}\n\n{member['body'].strip()}\n")
+    return '\n'.join(sections)
+
+def thread_frontmatter(members):
+    """
+    Frontmatter for a thread note: the first message's subject (without
+    "Re:"), every sender, the date range and the union of Gmail labels.
+    Args:
+        members: Staged message dicts in date order
+    Returns:
+        Dict of YAML frontmatter fields
+    """
+    first, last = members[0]['yaml_data'], members[-1]['yaml_data']
+    senders, labels = [], []
+    for member in members:
+        sender = member['yaml_data']['from']
+        if sender not in senders:
+            senders.append(sender)
+        for label in (member['yaml_data']['gmail_labels'] or '').split(','):
+            label = label.strip()
+            if label and label not in labels:
+                labels.append(label)
+    return {
+        'from': first['from'],
+        'to': first['to'],
+        'participants': ', '.join(senders),
+        'date': first['date'],
+        'last_date': last['date'],
+        'messages': len(members),
+        'subject': split_reply_prefix(first['subject'])[1] or first['subject'],
+        'gmail_labels': ','.join(labels),
+    }
+
+def open_stage(stage_path=THREAD_STAGE_DB):
+    """
+    Create an empty scratch store for converted messages, so bodies wait
+    for their threads on disk rather than in memory.
+    Args:
+        stage_path: Path to the SQLite file (replaced if it exists)
+    Returns:
+        sqlite3.Connection with table staged (seq, result JSON)
+    """
+    os.makedirs(os.path.dirname(stage_path), exist_ok=True)
+    if os.path.exists(stage_path):
+        os.remove(stage_path)
+    conn = sqlite3.connect(stage_path)
+    # Throwaway data: no journal, no fsync
+    conn.execute("PRAGMA journal_mode = OFF")
+    conn.execute("PRAGMA synchronous = OFF")
+    conn.execute("CREATE TABLE staged (seq INTEGER PRIMARY KEY, result TEXT NOT NULL)")
+    return conn
+
+# ==================== MBOX INDEXING AND SHARDING ====================
+def index_mbox(mm):
+    """
+    Record the byte range of every message in an mbox.
+    A message starts at a "From " line (start of file or after a newline),
+    the same rule mailbox.mbox uses, and ends where the next one starts
+    (less the blank separator line, as mailbox.mbox does).
+    Args:
+        mm: mmap (or bytes) of the whole mbox file
+    Returns:
+        List of (start, end) byte offsets, "From " line included
+    """
+    starts = [0] if mm[:5] == b'From ' else []
+    pos = mm.find(b'\nFrom ')
+    while pos != -1:
+        starts.append(pos + 1)
+        pos = mm.find(b'\nFrom ', pos + 1)
+    ranges = []
+    for start, end in zip(starts, starts[1:] + [len(mm)]):
+        # A blank line before the next "From " belongs to the separator
+        if mm[end - 2:end] == b'\n\n':
+            end -= 1
+        elif mm[end - 4:end] == b'\r\n\r\n':
+            end -= 2
+        ranges.append((start, end))
+    return ranges
+
+def shard_ranges(ranges, shard_bytes=SHARD_BYTES):
+    """
+    Group consecutive message ranges into shards of about shard_bytes each,
+    so one huge message doesn't leave the other workers idle.
+    Args:
+        ranges: List of (start, end) offsets from index_mbox()
+        shard_bytes: Target bytes per shard
+    Returns:
+        List of shards, each a list of (start, end) offsets
+    """
+    shards, current, size = [], [], 0
+    for start, end in ranges:
+        current.append((start, end))
+        size += end - start
+        if size >= shard_bytes:
+            shards.append(current)
+            current, size = [], 0
+    if current:
+        shards.append(current)
+    return shards
+
+def convert_shard(mbox_path, ranges):
+    """
+    Worker: parse and convert one shard of messages straight from an mmap
+    of the mbox file. Runs in a separate process, so it takes and returns
+    plain values; only attachments (content-addressed, so workers can't
+    collide) are written here. Only the header block is parsed
+    until the message key has been checked against the ledger, so already
+    imported messages are skipped without decoding their bodies.
+    Args:
+        mbox_path: Path to the mbox file
+        ranges: List of (start, end) byte offsets, one per message
+    Returns:
+        List of dicts in the order of ranges: convert_message() results
+        plus 'message_id', or {'message_id', 'skipped': True}
+    """
+    parser = BytesParser()
+    header_parser = BytesHeaderParser()
+    results = []
+    with open(mbox_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        for start, end in ranges:
+            # Skip the "From sender date" separator line; parse the rest
+            body_start = mm.find(b'\n', start, end) + 1 or end
+
+            # Header block ends at the first blank line (LF or CRLF files)
+            header_end = mm.find(b'\n\n', body_start, end)
+            crlf_end = mm.find(b'\r\n\r\n', body_start, end)
+            if crlf_end != -1 and (header_end == -1 or crlf_end < header_end):
+                header_end = crlf_end
+            header_bytes = mm[body_start:end if header_end == -1 else header_end]
+            key = message_key(header_parser.parsebytes(header_bytes), header_bytes)
+            if key in _imported_keys:
+                results.append({'message_id': key, 'skipped': True})
+                continue
+
+            message = parser.parsebytes(mm[body_start:end])
+            result = convert_message(message, _attachments_dir)
+            result['message_id'] = key
+            results.append(result)
+    return results
+
 # ==================== MAIN PROCESSING ====================
-def process_mbox():
+def ledger_note(ledger, key):
+    """
+    The email note an earlier run recorded for a message, if it is still
+    there (recipe notes don't count: thread notes live in GMAIL_OUTPUT_DIR).
+    Args:
+        ledger: Ledger connection from open_ledger()
+        key: Message key (Message-ID)
+    Returns:
+        Note path, or None
+    """
+    row = ledger.execute("SELECT note_path FROM imported WHERE message_id = ?", (key,)).fetchone()
+    path = row[0] if row else None
+    if path and os.path.dirname(os.path.abspath(path)) == os.path.abspath(GMAIL_OUTPUT_DIR) \
+            and os.path.exists(path):
+        return path
+    return None
+
+def process_mbox(mbox_path=MBOX_PATH, workers=None, reimport=False):
     """
     Main function to process the mbox file and create Obsidian markdown files.
-    Iterates through all messages, extracts content, detects recipes,
-    and creates appropriate markdown files.
+    Indexes message byte offsets in one pass, converts shards of messages
+    on a process pool, fetches linked pages on a thread pool, and writes
+    every file from this process so filename collision handling stays
+    race-free. Messages whose Message-ID is in the import ledger are
+    skipped, so a new Takeout export only adds mail not seen before.
+    Recipes get their own note as soon as they're converted; other mail
+    is staged and grouped by ThreadIndex, then written as one note per
+    thread (messages in date order) once the whole mbox has been read.
+    Replies to a thread imported by an earlier run are merged into its note.
+    Args:
+        mbox_path: Path to the mbox file
+        workers: Worker processes (default: one per CPU)
+        reimport: Convert messages already recorded in the ledger again
     """
-    print(f"Opening mbox file: {MBOX_PATH}")
+    print(f"Opening mbox file: {mbox_path}")
+    started = time.time()
 
-    # Open the mbox file
-    mbox = mailbox.mbox(MBOX_PATH)
+    # Index message boundaries without parsing anything
+    with open(mbox_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            ranges = []
+        else:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                ranges = index_mbox(mm)
+    shards = shard_ranges(ranges)
+    print(f"Indexed {len(ranges)} messages in {time.time() - started:.1f}s "
+          f"({len(shards)} shards)")
 
     # Counters for summary
-    total_messages = 0
-    gmail_files_created = 0
-    recipe_files_created = 0
-    urls_checked = 0
-
-    # Process each message
-    for key, message in mbox.items():
-        total_messages += 1
-
-        # Extract email headers
-        subject = message.get('Subject', 'No Subject')
-        # Decode encoded subject lines
-        if subject:
-            try:
-                decoded_parts = email.header.decode_header(subject)
-                subject = ''.join(
-                    part.decode(charset or 'utf-8') if isinstance(part, bytes) else part
-                    for part, charset in decoded_parts
-                )
-            except:
-                pass
-
-        from_addr = message.get('From', 'Unknown')
-        to_addr = message.get('To', '')
-        date_str = message.get('Date', '')
-        message_id = message.get('Message-ID', '')
-        gmail_labels = message.get('X-Gmail-Labels', '')
-
-        # Parse date into ISO format
-        date_iso = ""
-        if date_str:
+    counts = {'total': 0, 'skipped': 0, 'gmail': 0, 'recipe': 0, 'urls_checked': 0,
+              'threads': 0, 'appended': 0, 'superseded': 0,
+              'attachments': 0, 'attachments_new': 0, 'attachment_bytes': 0, 'dedup_bytes': 0}
+    ledger = open_ledger(LEDGER_DB)
+    stage = open_stage(THREAD_STAGE_DB)
+    index = ThreadIndex()
+    # Message keys handled in this run (the same mail can appear twice in a Takeout export)
+    seen = set()
+
+    def record(key, filepath, body):
+        """Add a written message to the ledger (committed once its note is written)"""
+        body_hash = hashlib.sha256(body.encode('utf-8')).hexdigest()
+        ledger.execute(
+            "INSERT OR REPLACE INTO imported (message_id, note_path, body_hash, imported_at) "
+            "VALUES (?, ?, ?, ?)",
+            (key, filepath, body_hash, time.time())
+        )
+
+    def stage_result(result):
+        """Hold a message for its thread; only its thread links stay in memory"""
+        del result['log'], result['fetch_urls'], result['attachments']
+        cursor = stage.execute("INSERT INTO staged (result) VALUES (?)", (json.dumps(result),))
+        index.add(cursor.lastrowid, result['message_id'], result['references'],
+                  result['subject'], result['timestamp'])
+
+    def write_result(result, futures):
+        """Resolve a message's URL fetches (waiting if needed); write recipes, stage the rest"""
+        counts['total'] += 1
+        key = result['message_id']
+        row = ledger.execute(
+            "SELECT note_path FROM imported WHERE message_id = ?", (key,)
+        ).fetchone()
+        if result.get('skipped') or key in seen or (row and not reimport):
+            counts['skipped'] += 1
+            return
+        seen.add(key)
+        subject = result['subject']
+        print(f"\n[{counts['total']}] Processing: {subject[:60]}...")
+        for line in result['log']:
+            print(line)
+        for info in result['attachments']:
+            counts['attachments'] += 1
+            counts['attachment_bytes'] += info['size']
+            if info['new']:
+                counts['attachments_new'] += 1
+            else:
+                counts['dedup_bytes'] += info['size']
+
+        # First fetched URL (in message order) that is a recipe wins
+        for url, future in zip(result['fetch_urls'], futures):
+            counts['urls_checked'] += 1
+            fetched_content, url_is_recipe = future.result()
+            fetcher.store(url, future)
+            if url_is_recipe and fetched_content:
+                print(f"  Recipe found at: {url[:60]}...")
+                result['is_recipe'] = True
+                # Append fetched content to body
+                result['body'] = with_attachment_links(f"Source: {url}\n\n{fetched_content}",
+                                                       result['attachments'])
+                result['yaml_data']['source_url'] = url
+                break
+        # Save fetches that weren't needed for the decision as well
+        for url, future in zip(result['fetch_urls'], futures):
+            if future.done():
+                fetcher.store(url, future)
+
+        if not result['is_recipe']:
+            stage_result(result)
+            return
+
+        # --reimport rewrites the note recorded for the message, if still there
+        existing_path = row[0] if row and row[0] and os.path.exists(row[0]) else None
+        filepath = create_markdown_file(RECIPE_OUTPUT_DIR, subject, result['yaml_data'],
+                                        result['body'], is_recipe=True,
+                                        existing_path=existing_path)
+        if filepath:
+            counts['recipe'] += 1
+            print(f"  Created RECIPE: {os.path.basename(filepath)}")
+            record(key, filepath, result['body'])
+            ledger.commit()
+            # Its thread shows a link in the message's place
+            note_name = os.path.splitext(os.path.basename(filepath))[0]
+            result['body'] = f"Recipe: [[{note_name}]]"
+            result['recipe'] = True
+            stage_result(result)
+
+    def write_thread(members):
+        """
+        Write the email note for one thread of staged messages. When messages
+        of the thread already have notes (the thread's parent, from an earlier
+        import, or the messages' own under --reimport), the first of those
+        notes is re-rendered with every message recorded for any of them, so
+        mail imported before is kept and the frontmatter stays current.
+        """
+        messages = [m for m in members if not m.get('recipe')]
+        if not messages:
+            return  # Recipes only; each already has its note
+        keys = {m['message_id'] for m in members}
+        notes = []
+        for key in [m['message_id'] for m in messages] + \
+                [ref for m in members for ref in m['references'] if ref not in keys]:
+            path = ledger_note(ledger, key)
+            if path and path not in notes:
+                notes.append(path)
+
+        # Messages those notes already hold; all of them must be known to re-render
+        earlier, unknown = [], False
+        for path in notes:
+            stored = dict(ledger.execute(
+                "SELECT message_id, message FROM thread_messages WHERE note_path = ?", (path,)))
+            for (key,) in ledger.execute(
+                    "SELECT message_id FROM imported WHERE note_path = ?", (path,)):
+                if key not in stored and key not in keys:
+                    unknown = True
+            earlier += [json.loads(m) for key, m in stored.items() if key not in keys]
+        target = notes[0] if notes else None
+
+        if unknown:
+            # Written before thread data was kept in the ledger: don't rewrite, add what's missing
+            recorded = {key for (key,) in ledger.execute(
+                "SELECT message_id FROM imported WHERE note_path = ?", (target,))}
+            members = [m for m in members if m['message_id'] not in recorded]
+            if not members:
+                return
             try:
-                dt = parsedate_to_datetime(date_str)
-                date_iso = dt.strftime('%Y-%m-%d')
-            except:
-                date_iso = date_str
-
-        print(f"\n[{total_messages}] Processing: {subject[:60]}...")
-
-        # Get email body content
-        body, was_html = get_email_body(message)
-
-        # Build YAML frontmatter dictionary
-        yaml_data = {
-            'from': from_addr,
-            'to': to_addr,
-            'date': date_iso,
-            'subject': subject,
-            'gmail_labels': gmail_labels
-        }
-
-        # Check if body content is a recipe
-        is_recipe = is_recipe_content(body, subject)
-
-        # If body is mostly just URLs, try to fetch recipe content
-        body_stripped = body.strip()
-        urls = extract_urls(body_stripped)
-
-        # Check if message is primarily a URL (short body with URL)
-        if not is_recipe and urls and len(body_stripped) < 500:
-            print(f"  Found {len(urls)} URL(s), checking for recipes...")
-            for url in urls[:3]:  # Limit to first 3 URLs
-                urls_checked += 1
-                fetched_content, url_is_recipe = fetch_url_content(url)
-                if url_is_recipe and fetched_content:
-                    print(f"  Recipe found at: {url[:60]}...")
-                    is_recipe = True
-                    # Append fetched content to body
-                    body = f"Source: {url}\n\n{fetched_content}"
-                    yaml_data['source_url'] = url
-                    break
-
-        # Determine output directory and create file
-        if is_recipe:
-            output_dir = RECIPE_OUTPUT_DIR
-            filepath = create_markdown_file(output_dir, subject, yaml_data, body, is_recipe=True)
-            if filepath:
-                recipe_files_created += 1
-                print(f"  Created RECIPE: {os.path.basename(filepath)}")
+                with open(target, 'r', encoding='utf-8') as f:
+                    separator = '\n' if f.read().endswith('\n') else '\n\n'
+                with open(target, 'a', encoding='utf-8') as f:
+                    f.write(separator + render_thread(members))
+                filepath = target
+            except Exception as e:
+                print(f"  Error writing {target}: {e}")
+                return
+            notes = [target]
+            combined = members
         else:
-            output_dir = GMAIL_OUTPUT_DIR
-            filepath = create_markdown_file(output_dir, subject, yaml_data, body, is_recipe=False)
-            if filepath:
-                gmail_files_created += 1
-                print(f"  Created email: {os.path.basename(filepath)}")
+            combined = sorted(earlier + members,
+                              key=lambda m: (m['timestamp'] is None, m['timestamp'] or 0))
+            if len(combined) == 1:
+                message = combined[0]
+                filepath = create_markdown_file(GMAIL_OUTPUT_DIR, message['subject'],
+                                                message['yaml_data'], message['body'],
+                                                existing_path=target)
+            else:
+                yaml_data = thread_frontmatter(combined)
+                filepath = create_markdown_file(GMAIL_OUTPUT_DIR, yaml_data['subject'], yaml_data,
+                                                render_thread(combined), existing_path=target,
+                                                extra_tags=('email-thread',))
+            if not filepath:
+                return
+
+        if target and not reimport:
+            counts['appended'] += len(messages)
+            print(f"\n  Added {len(messages)} message(s) to: {os.path.basename(filepath)}")
+        else:
+            counts['gmail'] += 1
+            if len(combined) > 1:
+                counts['threads'] += 1
+                print(f"\n  Created thread ({len(combined)} messages): "
+                      f"{os.path.basename(filepath)}")
+            else:
+                print(f"\n  Created email: {os.path.basename(filepath)}")
+
+        for m in combined:
+            if not m.get('recipe'):
+                record(m['message_id'], filepath, m['body'])
+            ledger.execute(
+                "INSERT OR REPLACE INTO thread_messages (message_id, note_path, message) "
+                "VALUES (?, ?, ?)",
+                (m['message_id'], filepath, json.dumps(m))
+            )
+        ledger.commit()
+        # The other notes' messages now live in this one
+        for path in notes[1:]:
+            moved = set_aside_note(path)
+            if moved:
+                print(f"  Merged {os.path.basename(path)} into {os.path.basename(filepath)}; "
+                      f"old note moved to {moved}")
+                counts['superseded'] += 1
+
+    # Shards convert in parallel; map() hands results back in mbox order.
+    # URL fetches start as soon as a message arrives, but results are handled
+    # strictly in mbox order (so collision numbering is stable): a message
+    # waits in `pending` until its fetches finish or the queue is full.
+    pending = deque()  # (result, [Future, ...]) in mbox order
+    try:
+        with UrlFetcher() as fetcher, ProcessPoolExecutor(
+                max_workers=workers, initializer=init_worker,
+                initargs=(LEDGER_DB, reimport, ATTACHMENTS_DIR)) as pool:
+            for results in pool.map(convert_shard, repeat(mbox_path), shards):
+                for result in results:
+                    pending.append((result, [fetcher.submit(u) for u in result.get('fetch_urls', ())]))
+                    while pending and (len(pending) > MAX_PENDING_WRITES
+                                       or all(f.done() for f in pending[0][1])):
+                        write_result(*pending.popleft())
+            while pending:
+                write_result(*pending.popleft())
+
+        # Every message is in: write one note per thread
+        threaded = time.time()
+        threads = index.threads()
+        print(f"\nGrouped {len(index)} messages into {len(threads)} threads "
+              f"in {time.time() - threaded:.2f}s")
+        for seqs in threads:
+            write_thread([json.loads(stage.execute(
+                "SELECT result FROM staged WHERE seq = ?", (seq,)).fetchone()[0]) for seq in seqs])
+    finally:
+        # Interrupted or not, every note written so far stays in the ledger
+        ledger.commit()
+        ledger.close()
+        stage.close()
+    os.remove(THREAD_STAGE_DB)
+    total_messages = counts['total']
+
+    elapsed = time.time() - started
+    rate = total_messages / elapsed if elapsed else 0
 
     # Print summary
     print("\n" + "="*60)
     print("PROCESSING COMPLETE")
     print("="*60)
     print(f"Total messages processed: {total_messages}")
-    print(f"Gmail files created:      {gmail_files_created}")
-    print(f"Recipe files created:     {recipe_files_created}")
-    print(f"URLs checked for recipes: {urls_checked}")
+    print(f"Already imported:         {counts['skipped']}")
+    print(f"Gmail files created:      {counts['gmail']} ({counts['threads']} threads of 2+ messages)")
+    print(f"Added to earlier threads: {counts['appended']}")
+    if counts['superseded']:
+        print(f"Notes merged into threads: {counts['superseded']} (old copies in {SUPERSEDED_DIR})")
+    print(f"Recipe files created:     {counts['recipe']}")
+    print(f"Attachments:              {counts['attachments']} "
+          f"({counts['attachment_bytes'] / 1e6:,.1f} MB), {counts['attachments_new']} new files; "
+          f"{counts['dedup_bytes'] / 1e6:,.1f} MB deduplicated")
+    print(f"URLs checked for recipes: {counts['urls_checked']} "
+          f"({fetcher.fetched} fetched, {fetcher.reused} reused from cache or this run)")
+    print(f"Elapsed:                  {elapsed:.1f}s ({rate:.1f} messages/sec)")
     print(f"\nGmail output:  {GMAIL_OUTPUT_DIR}")
     print(f"Recipe output: {RECIPE_OUTPUT_DIR}")
+    print(f"Attachments:   {ATTACHMENTS_DIR}")
 
 if __name__ == "__main__":
-    process_mbox()
+    parser = argparse.ArgumentParser(description="Convert a Gmail mbox export to Obsidian notes")
+    parser.add_argument("--mbox", default=MBOX_PATH, help="mbox file to import")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes (default: one per CPU)")
+    parser.add_argument("--reimport", action="store_true",
+                        help="convert messages already in the import ledger again")
+    args = parser.parse_args()
+    process_mbox(args.mbox, args.workers, args.reimport)
@@ -9,55 +9,102 @@ Run modes:
   python security_now_downloader.py              # continuous run (catch-up then weekly)
   python security_now_downloader.py --dry-run    # scrape + report what's missing, no downloads
   python security_now_downloader.py --test 5     # download 5 newest missing episodes, then exit
-  python security_now_downloader.py --reset      # delete state file and rebuild from scratch
+  python security_now_downloader.py --reset      # delete state and rebuild from scratch
 
-Catch-up mode:  runs every 60 seconds, newest episodes first.
+Progress is kept in sn_state.db (SQLite) in the download folder; an
+sn_state.json from earlier versions is migrated into it automatically.
+
+Catch-up mode:  downloads every pending episode concurrently, newest first,
+                limited by a per-host token bucket (--rate) and a cap on
+                requests in flight (--workers); failed files are retried
+                on the next pass.
 Maintenance mode: runs once per Wednesday after all historical files are present.
+
+Testing against a local server (e.g. `python -m http.server` serving a
+folder laid out like GRC's, with sn/sn-NNNN.txt files):
+  python security_now_downloader.py --base-url http://127.0.0.1:8000 \
+      --download-dir ./sn_test --rate 50 --workers 8 --test 20
 """
 
 import argparse
 import json
 import logging
 import os
+import random
 import re
+import sqlite3
 import sys
+import threading
 import time
-from datetime import datetime, date
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime, date, timezone
+from email.utils import parsedate_to_datetime
 from pathlib import Path
+from urllib.parse import urlparse
 
 import requests
 from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import HTTPError as Urllib3Error
 
 # ─── Configuration constants ──────────────────────────────────────────────────
 
 # Local folder where all downloaded files are saved (flat, no subfolders)
 DOWNLOAD_DIR = Path(r"D:\Documents\Computer Docs\Security now")
 
-# State file: tracks per-episode download status and run mode (JSON)
+# State database: per-episode download status and run mode (SQLite)
+STATE_DB = DOWNLOAD_DIR / "sn_state.db"
+
+# Legacy JSON state file: migrated into STATE_DB on first load
 STATE_FILE = DOWNLOAD_DIR / "sn_state.json"
 
 # Log file: appended each session
 LOG_FILE = DOWNLOAD_DIR / "sn_download.log"
 
+# Archive page cache: validators (ETag / Last-Modified) and extracted episode numbers
+PAGE_CACHE_FILE = DOWNLOAD_DIR / "sn_page_cache.json"
+
 # GRC base URL for building all download links
 BASE_URL = "https://www.grc.com"
 
 # Main archive page (lists current + recent episodes)
 MAIN_PAGE_URL = f"{BASE_URL}/securitynow.htm"
 
-# Yearly archive pages: one per year from 2005 through 2025
+# Yearly archive pages: one per year from 2005 through the current year
 ARCHIVE_URL_TMPL = f"{BASE_URL}/sn/past/{{year}}.htm"
-ARCHIVE_YEARS = list(range(2025, 2004, -1))  # [2025, 2024, ..., 2005]
+ARCHIVE_YEARS = list(range(datetime.today().year, 2004, -1))  # [this year, ..., 2005]
 
 # HTTP settings
 REQUEST_TIMEOUT = 30   # seconds to wait for a single HTTP response
-RETRY_WAIT      = 10   # seconds to wait before retrying a failed request once
 INTER_FILE_WAIT = 30   # seconds between the two file downloads within one tick
 
+# Download streaming: chunk size adapts between these bounds so each read
+# takes roughly CHUNK_TARGET_SECS (small on slow links, large on fast ones)
+CHUNK_MIN         = 64 * 1024
+CHUNK_MAX         = 4 * 1024 * 1024
+CHUNK_TARGET_SECS = 0.5
+PART_SUFFIX       = ".part"   # in-progress downloads; renamed when verified
+VALIDATOR_SUFFIX  = ".validator"   # beside a .part: the ETag / Last-Modified it came from
+
+# Retry policy: exponential backoff with full jitter, honouring Retry-After
+MAX_ATTEMPTS    = 4                              # tries per request, including the first
+BACKOFF_BASE    = 5                              # seconds; attempt n waits up to BASE * 2**n
+BACKOFF_MAX     = 120                            # cap on any single backoff wait
+RETRY_STATUSES  = {408, 429, 500, 502, 503, 504} # transient — retry; other statuses are final
+
+# Latency percentiles in the [HTTP-STATS] line cover this many recent responses
+LATENCY_SAMPLES = 1000
+
 # Loop timing
-CATCHUP_TICK_SECS     = 120   # seconds between ticks during catch-up mode
+CATCHUP_TICK_SECS     = 120   # seconds between catch-up passes (retrying errors)
 MAINTENANCE_TICK_SECS = 3600  # seconds between ticks during maintenance mode (1 hour)
 
+# Concurrent catch-up politeness budget (per host)
+CATCHUP_MAX_IN_FLIGHT = 4     # episodes downloading at the same time
+CATCHUP_RATE_PER_SEC  = 0.5   # sustained requests per second to one host
+CATCHUP_BURST         = 2     # requests allowed back-to-back after idling
+
 # Browser-like User-Agent so GRC doesn't reject the requests
 HEADERS = {
     "User-Agent": (
@@ -93,15 +140,8 @@ def setup_logging() -> None:
 
 # ─── State file helpers ───────────────────────────────────────────────────────
 
-def load_state() -> dict:
-    """
-    Load the download state from sn_state.json.
-    Returns a fresh default dict if the file does not exist.
-    """
-    if STATE_FILE.exists():
-        with open(STATE_FILE, "r", encoding="utf-8") as fh:
-            return json.load(fh)
-    # Fresh state: catch-up mode, no episodes known yet
+def default_state() -> dict:
+    """Fresh state: catch-up mode, no episodes known yet."""
     return {
         "mode":                  "catching_up",  # "catching_up" or "maintenance"
         "episodes":              {},              # str(ep_int) -> {"txt": status, "notes": status}
@@ -110,10 +150,144 @@ def load_state() -> dict:
     }
 
 
-def save_state(state: dict) -> None:
-    """Write the current state dict to sn_state.json (atomic overwrite)."""
-    with open(STATE_FILE, "w", encoding="utf-8") as fh:
-        json.dump(state, fh, indent=2)
+class StateStore:
+    """
+    SQLite-backed store for the state dict (sn_state.db, WAL journal).
+
+    Two tables: meta (top-level keys, JSON-encoded values) and episodes
+    (one row per episode).  The store remembers what it last wrote, so
+    save() only upserts rows whose status changed — one row after a
+    catch-up episode instead of re-serialising every episode — and each
+    save is a single transaction, so a crash never loses earlier progress.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        with self.conn:
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+            )
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS episodes ("
+                "ep INTEGER PRIMARY KEY, txt TEXT NOT NULL, notes TEXT NOT NULL)"
+            )
+        self._lock = threading.Lock()
+        self._saved_meta: dict = {}                      # key -> value as last written
+        self._saved_eps:  dict[str, tuple[str, str]] = {}  # key -> (txt, notes) as last written
+
+    def is_empty(self) -> bool:
+        return self.conn.execute("SELECT 1 FROM meta LIMIT 1").fetchone() is None
+
+    def load(self) -> dict:
+        """Read the whole state dict from the database."""
+        state = default_state()
+        for key, value in self.conn.execute("SELECT key, value FROM meta"):
+            state[key] = json.loads(value)
+        for ep, txt, notes in self.conn.execute("SELECT ep, txt, notes FROM episodes"):
+            state["episodes"][str(ep)] = {"txt": txt, "notes": notes}
+        self._saved_meta = {k: v for k, v in state.items() if k != "episodes"}
+        self._saved_eps  = {k: (r["txt"], r["notes"]) for k, r in state["episodes"].items()}
+        return state
+
+    def save(self, state: dict, keys: list[str] | None = None) -> None:
+        """
+        Write changed top-level values and episode rows in one transaction.
+        keys: episodes known to have changed (skips comparing the rest).
+        """
+        with self._lock:
+            meta = [
+                (k, json.dumps(v)) for k, v in state.items()
+                if k != "episodes" and self._saved_meta.get(k, object()) != v
+            ]
+            rows = []
+            for key in (state["episodes"] if keys is None else keys):
+                rec = state["episodes"][key]
+                row = (rec["txt"], rec["notes"])
+                if self._saved_eps.get(key) != row:
+                    rows.append((int(key), *row))
+            if not meta and not rows:
+                return
+            with self.conn:
+                self.conn.executemany(
+                    "INSERT INTO meta (key, value) VALUES (?, ?) "
+                    "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+                    meta,
+                )
+                self.conn.executemany(
+                    "INSERT INTO episodes (ep, txt, notes) VALUES (?, ?, ?) "
+                    "ON CONFLICT(ep) DO UPDATE SET txt = excluded.txt, notes = excluded.notes",
+                    rows,
+                )
+            for k, v in meta:
+                self._saved_meta[k] = json.loads(v)
+            for ep, txt, notes in rows:
+                self._saved_eps[str(ep)] = (txt, notes)
+
+    def close(self) -> None:
+        self.conn.close()
+
+
+_store: StateStore | None = None   # opened lazily by load_state()
+
+
+def get_store() -> StateStore:
+    """Open STATE_DB on first use, migrating a legacy sn_state.json into it."""
+    global _store
+    if _store is None:
+        _store = StateStore(STATE_DB)
+        if _store.is_empty() and STATE_FILE.exists():
+            migrate_json_state(_store)
+    return _store
+
+
+def migrate_json_state(store: StateStore) -> None:
+    """
+    Import the legacy sn_state.json into an empty store, then rename the JSON
+    to sn_state.json.migrated so it is kept as a backup but not re-imported.
+    """
+    try:
+        with open(STATE_FILE, "r", encoding="utf-8") as fh:
+            legacy = json.load(fh)
+    except (OSError, ValueError) as exc:
+        logging.error(f"[STATE] Could not read {STATE_FILE.name} for migration — {exc}")
+        return
+    state = default_state()
+    state.update(legacy)
+    store.save(state)
+    STATE_FILE.replace(STATE_FILE.with_name(STATE_FILE.name + ".migrated"))
+    logging.info(
+        f"[STATE] Migrated {len(state['episodes'])} episode(s) from {STATE_FILE.name} to {STATE_DB.name}"
+    )
+
+
+def load_state() -> dict:
+    """
+    Load the download state from sn_state.db.
+    Returns a fresh default dict if nothing has been saved yet.
+    """
+    return get_store().load()
+
+
+def save_state(state: dict, keys: list[str] | None = None) -> None:
+    """
+    Persist the state dict to sn_state.db.  Only changed rows are written;
+    pass keys (episode keys just updated) to skip comparing the others.
+    """
+    get_store().save(state, keys)
+
+
+def reset_state() -> None:
+    """Delete the state database (and any legacy JSON) for a fresh rebuild."""
+    global _store
+    if _store is not None:
+        _store.close()
+        _store = None
+    for path in (STATE_DB, STATE_DB.with_name(STATE_DB.name + "-wal"),
+                 STATE_DB.with_name(STATE_DB.name + "-shm"), STATE_FILE):
+        path.unlink(missing_ok=True)
 
 
 # ─── Episode number formatting ────────────────────────────────────────────────
@@ -150,72 +324,387 @@ def ep_to_url_notes(ep: int) -> str:
     return f"{BASE_URL}/sn/sn-{ep_to_url_str(ep)}-notes.pdf"
 
 
-# ─── HTTP helpers ─────────────────────────────────────────────────────────────
+# ─── Rate limiting ────────────────────────────────────────────────────────────
 
-def fetch_html(url: str) -> str | None:
+class TokenBucket:
     """
-    Fetch a GRC archive page and return its HTML as a string.
-    Returns None on any HTTP error or network failure.
+    Thread-safe token bucket: acquire() blocks until a request may be sent.
+
+    rate  : tokens added per second (sustained requests/sec)
+    burst : bucket capacity (requests that may go out back-to-back)
     """
-    try:
-        resp = requests.get(url, headers=HEADERS, timeout=REQUEST_TIMEOUT)
-        if resp.status_code == 200:
-            return resp.text
-        logging.warning(f"[HTTP-{resp.status_code}] {url}")
+
+    def __init__(self, rate: float, burst: int):
+        self.rate   = rate
+        self.burst  = burst
+        self._tokens = float(burst)          # start full
+        self._stamp  = time.monotonic()      # last refill time
+        self._lock   = threading.Lock()
+
+    def acquire(self) -> None:
+        """Take one token, sleeping until one is available."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._stamp) * self.rate)
+                self._stamp  = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+# Per-host buckets, created on first use with the current rate settings
+_host_buckets: dict[str, TokenBucket] = {}
+_host_buckets_lock = threading.Lock()
+
+
+def host_bucket(url: str) -> TokenBucket:
+    """Return the shared TokenBucket for url's host."""
+    host = urlparse(url).netloc.lower()
+    with _host_buckets_lock:
+        bucket = _host_buckets.get(host)
+        if bucket is None:
+            bucket = TokenBucket(CATCHUP_RATE_PER_SEC, CATCHUP_BURST)
+            _host_buckets[host] = bucket
+        return bucket
+
+
+# ─── HTTP client ──────────────────────────────────────────────────────────────
+
+class HttpStats:
+    """
+    Thread-safe request counters and latency samples for the run log.
+    Only the last LATENCY_SAMPLES latencies are kept, so continuous mode
+    doesn't grow the list forever.
+    """
+
+    def __init__(self):
+        self._lock      = threading.Lock()
+        self.requests   = 0            # HTTP attempts sent (including retries)
+        self.retries    = 0            # attempts after the first for a URL
+        self.failures   = 0            # network errors / timeouts
+        self.by_status: dict[int, int] = {}
+        self.latencies: deque[float] = deque(maxlen=LATENCY_SAMPLES)   # seconds to response headers
+
+    def record(self, status: int | None, latency: float, retry: bool) -> None:
+        with self._lock:
+            self.requests += 1
+            if retry:
+                self.retries += 1
+            if status is None:
+                self.failures += 1
+            else:
+                self.by_status[status] = self.by_status.get(status, 0) + 1
+                self.latencies.append(latency)
+
+    def summary(self) -> str:
+        """One-line summary: counts, statuses and p50/p90/p99 latency."""
+        with self._lock:
+            lat = sorted(self.latencies)
+            statuses = ", ".join(f"{code}: {n}" for code, n in sorted(self.by_status.items()))
+            counts = (
+                f"{self.requests} request(s), {self.retries} retried, "
+                f"{self.failures} network error(s)"
+            )
+        if not lat:
+            return counts
+
+        def pct(p: float) -> float:
+            return lat[min(len(lat) - 1, int(p * len(lat)))] * 1000
+
+        return (
+            f"{counts}  |  status {{{statuses}}}  |  "
+            f"latency p50 {pct(0.50):.0f} ms, p90 {pct(0.90):.0f} ms, p99 {pct(0.99):.0f} ms"
+        )
+
+
+http_stats = HttpStats()
+
+# One keep-alive Session per thread (requests.Session is not thread-safe)
+_thread_http = threading.local()
+
+
+def get_session() -> requests.Session:
+    """Return this thread's pooled Session, creating it on first use."""
+    session = getattr(_thread_http, "session", None)
+    if session is None:
+        session = requests.Session()
+        session.headers.update(HEADERS)
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=4)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        _thread_http.session = session
+    return session
+
+
+def retry_after_secs(resp: requests.Response) -> float | None:
+    """Parse a Retry-After header (delta-seconds or HTTP-date); None if absent."""
+    value = resp.headers.get("Retry-After")
+    if not value:
         return None
-    except requests.RequestException as exc:
-        logging.error(f"[NET-ERROR] {url} — {exc}")
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
         return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+def backoff_secs(attempt: int) -> float:
+    """Full-jitter exponential backoff for the given 0-based retry attempt."""
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt))
+
+
+def http_get(
+    url: str,
+    stream: bool = False,
+    headers: dict | None = None,
+) -> requests.Response | None:
+    """
+    GET url through this thread's pooled Session with the retry policy.
+
+    Every attempt first waits on the host's token bucket.  Network errors
+    and RETRY_STATUSES are retried up to MAX_ATTEMPTS times with jittered
+    exponential backoff (or the server's Retry-After, capped at BACKOFF_MAX);
+    any other status is returned immediately for the caller to interpret.
+
+    Returns the final Response, or None if every attempt failed at the
+    network level.  Streamed responses must be closed by the caller.
+    """
+    session = get_session()
+    for attempt in range(MAX_ATTEMPTS):
+        host_bucket(url).acquire()
+        start = time.perf_counter()
+        try:
+            resp = session.get(url, timeout=REQUEST_TIMEOUT, stream=stream, headers=headers)
+        except requests.RequestException as exc:
+            http_stats.record(None, time.perf_counter() - start, attempt > 0)
+            kind = "TIMEOUT" if isinstance(exc, requests.Timeout) else "NET-ERROR"
+            logging.warning(f"[{kind}] {url} — {exc}")
+            resp, wait = None, backoff_secs(attempt)
+        else:
+            http_stats.record(resp.status_code, time.perf_counter() - start, attempt > 0)
+            if resp.status_code not in RETRY_STATUSES:
+                return resp
+            logging.warning(f"[HTTP-{resp.status_code}] {url}")
+            wait = retry_after_secs(resp)
+            wait = backoff_secs(attempt) if wait is None else min(wait, BACKOFF_MAX)
+
+        if attempt + 1 < MAX_ATTEMPTS:
+            if resp is not None:
+                resp.close()
+            logging.info(f"[RETRY] {url} in {wait:.1f}s (attempt {attempt + 2}/{MAX_ATTEMPTS})")
+            time.sleep(wait)
+    return resp
+
+
+def log_http_stats() -> None:
+    """Write the accumulated request counts and latency percentiles to the log."""
+    logging.info(f"[HTTP-STATS] {http_stats.summary()}")
+
+
+# ─── HTTP helpers ─────────────────────────────────────────────────────────────
+
+def part_path(dest: Path) -> Path:
+    """Return the in-progress .part path used while downloading dest."""
+    return dest.with_name(dest.name + PART_SUFFIX)
+
+
+def validator_path(part: Path) -> Path:
+    """Return the file holding the validator of the response part came from."""
+    return part.with_name(part.name + VALIDATOR_SUFFIX)
+
+
+def response_validator(resp: requests.Response) -> str | None:
+    """
+    The value to send as If-Range when resuming this response's body: a
+    strong ETag, else Last-Modified, else None (weak ETags aren't allowed).
+    """
+    etag = resp.headers.get("ETag")
+    if etag and not etag.startswith("W/"):
+        return etag
+    return resp.headers.get("Last-Modified")
+
+
+def discard_part(part: Path) -> None:
+    """Delete a .part file and its validator."""
+    part.unlink(missing_ok=True)
+    validator_path(part).unlink(missing_ok=True)
+
+
+def expected_size(resp: requests.Response, offset: int) -> int | None:
+    """
+    Total file size implied by a 200/206 response, or None if the server
+    didn't say.  For 206 this is the '/total' of Content-Range, falling back
+    to offset + Content-Length.
+    """
+    if resp.status_code == 206:
+        m = re.match(r"bytes\s+\d+-\d+/(\d+)", resp.headers.get("Content-Range", ""))
+        if m:
+            return int(m.group(1))
+    length = resp.headers.get("Content-Length")
+    if length and length.isdigit():
+        return int(length) + (offset if resp.status_code == 206 else 0)
+    return None
+
+
+def stream_to_part(resp: requests.Response, fh) -> None:
+    """
+    Copy the raw (identity-encoded) response body into fh, adapting the
+    read size so each chunk takes about CHUNK_TARGET_SECS: doubling on fast
+    links, halving on slow.
+    """
+    chunk = CHUNK_MIN
+    while True:
+        start = time.perf_counter()
+        data  = resp.raw.read(chunk)
+        if not data:
+            return
+        fh.write(data)
+        elapsed = time.perf_counter() - start
+        if elapsed < CHUNK_TARGET_SECS / 2 and chunk < CHUNK_MAX:
+            chunk *= 2
+        elif elapsed > CHUNK_TARGET_SECS * 2 and chunk > CHUNK_MIN:
+            chunk //= 2
 
 
 def download_file(url: str, dest: Path) -> str:
     """
     Download a single binary file (text or PDF) from url to dest.
     Returns one of: STATUS_DONE, STATUS_NA, STATUS_ERROR.
-    Does NOT retry — caller is responsible for retry logic.
+
+    Bytes go to dest + '.part'; if a .part file is already there (an earlier
+    transfer was cut off) the download resumes with an HTTP Range request.
+    The resume is conditional: If-Range carries the ETag / Last-Modified
+    saved beside the .part, so a file changed on the server comes back whole
+    (200) instead of being spliced onto old bytes.  A .part without a saved
+    validator, or a 206 that doesn't start at the .part's end, is discarded
+    and the download starts again from zero.
+    The finished .part is checked against the server's size and only then
+    renamed onto dest, so dest never holds a truncated file.  An incomplete
+    transfer leaves the .part in place for the next attempt to resume.
+
+    Transient failures are retried inside http_get(); STATUS_ERROR means
+    they were exhausted (or the server gave a non-retryable error).
     """
+    part      = part_path(dest)
+    offset    = part.stat().st_size if part.exists() else 0
+    validator = None
+    if offset:
+        try:
+            validator = validator_path(part).read_text(encoding="utf-8").strip() or None
+        except OSError:
+            pass
+        if validator is None:
+            # Nothing to prove the .part matches the current file
+            logging.info(f"[RESTART] {dest.name}  (no validator saved with {part.name})")
+            discard_part(part)
+            offset = 0
+
+    # identity encoding so Content-Length and Range refer to the bytes we write
+    headers = {"Accept-Encoding": "identity"}
+    if offset:
+        headers["Range"]    = f"bytes={offset}-"
+        headers["If-Range"] = validator
+
+    resp = http_get(url, stream=True, headers=headers)
+    if resp is None:
+        return STATUS_ERROR
     try:
-        resp = requests.get(url, headers=HEADERS, timeout=REQUEST_TIMEOUT, stream=True)
-
-        if resp.status_code == 200:
-            # Write in binary mode so both .txt and .pdf files are saved faithfully
-            with open(dest, "wb") as fh:
-                for chunk in resp.iter_content(chunk_size=8192):
-                    fh.write(chunk)
-            size_kb = dest.stat().st_size // 1024
-            logging.info(f"[DOWNLOAD] {dest.name}  ({size_kb} KB)")
-            return STATUS_DONE
-
-        elif resp.status_code == 404:
+        if resp.status_code == 404:
             # File simply doesn't exist on GRC's server — not an error
+            discard_part(part)
             return STATUS_NA
 
-        else:
+        if resp.status_code == 416 and offset:
+            # Range starts at/after the end: the .part may already be complete
+            m = re.match(r"bytes\s+\*/(\d+)", resp.headers.get("Content-Range", ""))
+            if m and int(m.group(1)) == offset:
+                os.replace(part, dest)
+                validator_path(part).unlink(missing_ok=True)
+                logging.info(f"[DOWNLOAD] {dest.name}  ({offset // 1024} KB, completed from .part)")
+                return STATUS_DONE
+            logging.warning(f"[HTTP-416] {url} — discarding {part.name}")
+            discard_part(part)
+            return STATUS_ERROR
+
+        if resp.status_code not in (200, 206):
             logging.warning(f"[HTTP-{resp.status_code}] {url}")
             return STATUS_ERROR
 
-    except requests.Timeout:
-        logging.warning(f"[TIMEOUT] {url}")
-        return STATUS_ERROR
-    except requests.RequestException as exc:
+        encoding = resp.headers.get("Content-Encoding", "identity").strip().lower()
+        if encoding not in ("", "identity"):
+            # Compressed despite the identity request: Content-Length and
+            # Range would count encoded bytes, so neither resume nor the size
+            # check could be trusted — leave any .part for a later attempt
+            logging.warning(f"[HTTP-ENCODING] {url} — unexpected Content-Encoding: {encoding}")
+            return STATUS_ERROR
+
+        if resp.status_code == 206:
+            m = re.match(r"bytes\s+(\d+)-", resp.headers.get("Content-Range", ""))
+            if not m or int(m.group(1)) != offset:
+                logging.warning(
+                    f"[HTTP-206] {url} — range {resp.headers.get('Content-Range')!r} "
+                    f"doesn't continue {part.name} at {offset}; starting over"
+                )
+                resp.close()
+                discard_part(part)
+                return download_file(url, dest)
+        else:
+            # Full body: the server ignored Range, or If-Range found the file
+            # changed — start over and remember this body's validator
+            offset = 0
+            validator = response_validator(resp)
+            if validator:
+                validator_path(part).write_text(validator, encoding="utf-8")
+            else:
+                validator_path(part).unlink(missing_ok=True)
+        total = expected_size(resp, offset)
+
+        # Write in binary mode so both .txt and .pdf files are saved faithfully
+        with open(part, "ab" if offset else "wb") as fh:
+            stream_to_part(resp, fh)
+
+        size = part.stat().st_size
+        if total is not None and size != total:
+            logging.warning(
+                f"[INCOMPLETE] {dest.name}  ({size} of {total} bytes; "
+                f"{'will resume' if size < total else 'discarded'})"
+            )
+            if size > total:
+                discard_part(part)
+            return STATUS_ERROR
+
+        os.replace(part, dest)
+        validator_path(part).unlink(missing_ok=True)
+        resumed = f", resumed at {offset // 1024} KB" if offset else ""
+        logging.info(f"[DOWNLOAD] {dest.name}  ({size // 1024} KB{resumed})")
+        return STATUS_DONE
+
+    except (requests.RequestException, Urllib3Error, OSError) as exc:
+        # Connection dropped mid-body (urllib3 errors surface via resp.raw);
+        # whatever arrived stays in the .part for the next attempt
         logging.error(f"[NET-ERROR] {url} — {exc}")
         return STATUS_ERROR
+    finally:
+        resp.close()
 
 
 def download_with_retry(url: str, dest: Path, tag: str) -> str:
     """
-    Attempt to download url to dest. If STATUS_ERROR, wait RETRY_WAIT seconds
-    and try once more. Logs the result with the given tag prefix.
+    Download url to dest (retrying transient failures per the http_get()
+    policy) and log the result with the given tag prefix.
     Returns final status string.
     """
     result = download_file(url, dest)
 
-    if result == STATUS_ERROR:
-        # One automatic retry after a short wait
-        logging.info(f"[RETRY] {dest.name} in {RETRY_WAIT}s...")
-        time.sleep(RETRY_WAIT)
-        result = download_file(url, dest)
-
     if result == STATUS_NA:
         logging.info(f"[{tag}_NA] {dest.name}  (404 — not on GRC server)")
     elif result == STATUS_ERROR:
@@ -241,37 +730,129 @@ def extract_episode_numbers(html: str) -> list[int]:
     return sorted(nums)
 
 
+class PageCache:
+    """
+    Conditional-request cache for GRC archive pages, kept in sn_page_cache.json.
+
+    Per URL it stores the ETag / Last-Modified validators from the last 200
+    response, the episode numbers extracted from that page, and the date the
+    page was last fetched or revalidated, so a 304 Not Modified can be
+    answered from the cache without re-parsing anything.
+    """
+
+    def __init__(self, path: Path):
+        self.path  = path
+        self.pages: dict[str, dict] = {}   # url -> {"etag", "last_modified", "episodes", "checked"}
+        if path.exists():
+            try:
+                self.pages = json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, ValueError) as exc:
+                logging.warning(f"[CACHE] Ignoring unreadable {path.name} — {exc}")
+
+    def conditional_headers(self, url: str) -> dict:
+        """If-None-Match / If-Modified-Since headers for url (empty if uncached)."""
+        entry = self.pages.get(url) or {}
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def is_frozen(self, url: str, year: int) -> bool:
+        """
+        True if url (the archive page for year) was fetched or revalidated
+        after year ended, so it can no longer gain episodes.  A page cached
+        during its own year is still revalidated after New Year.
+        """
+        checked = (self.pages.get(url) or {}).get("checked")
+        return bool(checked) and int(checked[:4]) > year
+
+    def mark_checked(self, url: str) -> None:
+        """Record that url's cached entry was confirmed current today."""
+        self.pages[url]["checked"] = date.today().isoformat()
+
+    def store(self, url: str, resp: requests.Response, episodes: list[int]) -> None:
+        self.pages[url] = {
+            "etag":          resp.headers.get("ETag"),
+            "last_modified": resp.headers.get("Last-Modified"),
+            "episodes":      episodes,
+            "checked":       date.today().isoformat(),
+        }
+
+    def save(self) -> None:
+        """Write the cache (temp file + os.replace)."""
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self.pages, indent=2), encoding="utf-8")
+        os.replace(tmp, self.path)
+
+
+def scrape_episode_numbers(url: str, cache: PageCache, frozen: bool = False) -> list[int] | None:
+    """
+    Return the episode numbers listed on one archive page.
+
+    Sends a conditional GET using the cached validators; a 304 reuses the
+    cached numbers.  frozen=True (see PageCache.is_frozen) skips the request
+    entirely and returns the cached numbers.
+    Returns None if the page could not be fetched.
+    """
+    entry = cache.pages.get(url)
+    if frozen and entry:
+        return entry["episodes"]
+
+    resp = http_get(url, headers=cache.conditional_headers(url))
+    if resp is None:
+        return None
+    if resp.status_code == 304 and entry:
+        logging.info(f"  Not modified: {url}")
+        cache.mark_checked(url)
+        return entry["episodes"]
+    if resp.status_code == 200:
+        found = extract_episode_numbers(resp.text)
+        cache.store(url, resp, found)
+        return found
+    logging.warning(f"[HTTP-{resp.status_code}] {url}")
+    return None
+
+
 def build_master_list(state: dict, force: bool = False) -> dict:
     """
     Scrape all GRC archive pages and the main page to discover every episode number.
     Adds any newly found episodes to state["episodes"] with STATUS_PENDING.
     Already-known episodes are left untouched (their download progress is preserved).
     Sets state["master_list_built"] = True when complete.
+
+    Pages go through the PageCache: a past year's page last checked after
+    that year ended is not requested at all, and every other page is
+    revalidated with a conditional GET, so a rescrape after the first one
+    is cheap.
     """
     if state["master_list_built"] and not force:
         logging.info("Master list already built — skipping rescrape (use --reset to force)")
         return state
 
     all_nums: set[int] = set()
+    cache = PageCache(PAGE_CACHE_FILE)
 
     # Main page covers the most recent episodes (current year)
     logging.info(f"Scraping main page: {MAIN_PAGE_URL}")
-    html = fetch_html(MAIN_PAGE_URL)
-    if html:
-        found = extract_episode_numbers(html)
+    found = scrape_episode_numbers(MAIN_PAGE_URL, cache)
+    if found is not None:
         logging.info(f"  Main page: {len(found)} episode numbers")
         all_nums.update(found)
 
-    # Each yearly archive page (newest year first)
+    # Each yearly archive page (newest year first); pacing comes from the
+    # host token bucket in http_get()
     for year in ARCHIVE_YEARS:
         url = ARCHIVE_URL_TMPL.format(year=year)
-        logging.info(f"Scraping {year} archive ({url})")
-        html = fetch_html(url)
-        if html:
-            found = extract_episode_numbers(html)
+        frozen = cache.is_frozen(url, year)
+        if not frozen:
+            logging.info(f"Scraping {year} archive ({url})")
+        found = scrape_episode_numbers(url, cache, frozen=frozen)
+        if found is not None:
             logging.info(f"  {year}: {len(found)} episodes")
             all_nums.update(found)
-        time.sleep(1)  # 1-second pause between archive page requests — polite
+    cache.save()
 
     # Add newly discovered episodes with pending status; preserve existing records
     new_count = 0
@@ -283,6 +864,7 @@ def build_master_list(state: dict, force: bool = False) -> dict:
 
     total = len(state["episodes"])
     logging.info(f"Master list complete: {total} total episodes ({new_count} newly added)")
+    log_http_stats()
     state["master_list_built"] = True
     save_state(state)
     return state
@@ -292,8 +874,9 @@ def build_master_list(state: dict, force: bool = False) -> dict:
 
 def prescan_disk(state: dict) -> dict:
     """
-    Walk the download directory and mark any already-present files as STATUS_DONE
-    in the state without actually downloading them.
+    Walk the download directory and mark any already-present, complete files
+    as STATUS_DONE in the state without actually downloading them.
+    Truncated files (see file_on_disk) and .part files are left pending.
 
     This is run once after the master list is built so that the 554+ existing
     .txt files are recognized immediately rather than being logged as [SKIP]
@@ -305,33 +888,41 @@ def prescan_disk(state: dict) -> dict:
     txt_re   = re.compile(r'^sn-(\d+)\.txt$',        re.IGNORECASE)
     notes_re = re.compile(r'^sn-(\d+)-notes\.pdf$',  re.IGNORECASE)
 
-    txt_count = notes_count = unmatched = 0
+    txt_count = notes_count = unmatched = truncated = 0
 
     for f in DOWNLOAD_DIR.iterdir():
-        if not f.is_file() or f.stat().st_size == 0:
-            continue  # skip empty files and subdirectories
+        if not f.is_file() or f.name.endswith((PART_SUFFIX, VALIDATOR_SUFFIX)):
+            continue  # skip subdirectories and interrupted downloads
 
-        m = txt_re.match(f.name)
-        if m:
-            key = str(int(m.group(1)))  # normalize "001" -> "1"
-            if key in state["episodes"] and state["episodes"][key]["txt"] != STATUS_DONE:
-                state["episodes"][key]["txt"] = STATUS_DONE
-            txt_count += 1
+        for pattern, field in ((txt_re, "txt"), (notes_re, "notes")):
+            m = pattern.match(f.name)
+            if m:
+                break
+        else:
+            # File exists but doesn't match either pattern (e.g., sn-635-notes - Unknown.pdf)
+            unmatched += 1
             continue
 
-        m = notes_re.match(f.name)
-        if m:
-            key = str(int(m.group(1)))  # normalize "001" -> "1"
-            if key in state["episodes"] and state["episodes"][key]["notes"] != STATUS_DONE:
-                state["episodes"][key]["notes"] = STATUS_DONE
-            notes_count += 1
+        key = str(int(m.group(1)))  # normalize "001" -> "1"
+        rec = state["episodes"].get(key)
+        if not file_on_disk(f):
+            # Empty or truncated: make sure it is fetched again
+            if f.stat().st_size:
+                truncated += 1
+            if rec and rec[field] == STATUS_DONE:
+                rec[field] = STATUS_PENDING
             continue
 
-        # File exists but doesn't match either pattern (e.g., sn-635-notes - Unknown.pdf)
-        unmatched += 1
+        if rec and rec[field] != STATUS_DONE:
+            rec[field] = STATUS_DONE
+        if field == "txt":
+            txt_count += 1
+        else:
+            notes_count += 1
 
     logging.info(
         f"Pre-scan complete: {txt_count} TXT, {notes_count} notes PDFs on disk"
+        + (f", {truncated} truncated (will re-download)" if truncated else "")
         + (f", {unmatched} unrecognized files (skipped)" if unmatched else "")
     )
     save_state(state)
@@ -341,17 +932,36 @@ def prescan_disk(state: dict) -> dict:
 # ─── Per-episode download logic ───────────────────────────────────────────────
 
 def file_on_disk(path: Path) -> bool:
-    """Return True if a file exists at path with non-zero size."""
-    return path.exists() and path.stat().st_size > 0
+    """
+    Return True if a complete file exists at path.
 
+    Downloads only reach their final name after the size check in
+    download_file(), but files saved by older versions of this script (or
+    copied in by hand) may be truncated: they must be non-empty, and a PDF
+    must end with its %%EOF trailer.
+    """
+    try:
+        size = path.stat().st_size
+    except OSError:
+        return False
+    if size == 0:
+        return False
+    if path.suffix.lower() == ".pdf":
+        with open(path, "rb") as fh:
+            fh.seek(max(0, size - 1024))
+            return b"%%EOF" in fh.read()
+    return True
 
-def attempt_episode(ep: int, rec: dict, dry_run: bool = False) -> dict:
+
+def attempt_episode(ep: int, rec: dict, dry_run: bool = False, pace: bool = True) -> dict:
     """
     Attempt to download any missing files for episode ep.
     rec: {"txt": status, "notes": status}
     Returns the updated rec dict.
 
-    Download order: txt first, then notes.pdf (INTER_FILE_WAIT seconds apart).
+    Download order: txt first, then notes.pdf (INTER_FILE_WAIT seconds apart
+    when pace is True; the concurrent catch-up passes pace=False and relies
+    on the per-host token bucket instead).
     Checks disk before each download in case the file appeared outside this script.
     """
     txt_path   = DOWNLOAD_DIR / ep_to_filename_txt(ep)
@@ -386,7 +996,7 @@ def attempt_episode(ep: int, rec: dict, dry_run: bool = False) -> dict:
             print(f"  [DRY-RUN] would download: {notes_url}")
         else:
             # Insert polite delay between the two downloads if txt was just fetched
-            if downloaded_txt:
+            if downloaded_txt and pace:
                 time.sleep(INTER_FILE_WAIT)
             result = download_with_retry(notes_url, notes_path, "NOTES")
             rec["notes"] = result
@@ -434,35 +1044,82 @@ def sorted_ep_keys(state: dict, descending: bool = True) -> list[str]:
     return sorted(state["episodes"].keys(), key=int, reverse=descending)
 
 
-# ─── Catch-up tick ────────────────────────────────────────────────────────────
+# ─── Concurrent catch-up ──────────────────────────────────────────────────────
+
+def is_resolved(rec: dict) -> bool:
+    """True when both files of an episode record are done or na."""
+    return rec["txt"] in (STATUS_DONE, STATUS_NA) and rec["notes"] in (STATUS_DONE, STATUS_NA)
+
 
-def run_catchup_tick(state: dict) -> dict:
+def run_catchup_pass(state: dict, limit: int | None = None) -> dict:
     """
-    One catch-up tick: find the single next episode with pending/error files
-    and attempt to download them (txt + notes). Saves state after each episode.
-    Episodes are processed newest-first.
+    One catch-up pass: attempt every episode with pending/error files,
+    newest first, with up to CATCHUP_MAX_IN_FLIGHT episodes downloading at
+    once.  Request pacing comes from the per-host token bucket.
+
+    Worker threads only download and return an updated copy of the episode
+    record; state is updated and saved here, on the calling thread, as each
+    episode completes — the same per-episode transitions as the old
+    one-episode-per-tick loop.  Episodes are submitted only as slots free
+    up, so on Ctrl-C nothing is queued: the episodes already downloading
+    finish, are saved, and the interrupt is re-raised.
+
+    limit : attempt at most this many episodes (used by --test)
     Returns the updated state.
     """
-    for key in sorted_ep_keys(state):
-        rec = state["episodes"][key]
-        if rec["txt"] in (STATUS_DONE, STATUS_NA) and rec["notes"] in (STATUS_DONE, STATUS_NA):
-            continue  # this episode is fully resolved, move on
+    keys = [k for k in sorted_ep_keys(state) if not is_resolved(state["episodes"][k])]
+    if limit is not None:
+        keys = keys[:limit]
+    if not keys:
+        return state
 
-        # Found an episode that needs work
-        ep = int(key)
-        logging.info(f"--- Episode #{ep} ---")
-        state["episodes"][key] = attempt_episode(ep, rec)
-        save_state(state)
+    logging.info(
+        f"[CATCHUP] {len(keys)} episode(s) to attempt — "
+        f"{CATCHUP_MAX_IN_FLIGHT} in flight, {CATCHUP_RATE_PER_SEC:g} req/s per host"
+    )
+    def finish(future, key):
+        """Store one finished episode's record and print progress."""
+        try:
+            state["episodes"][key] = future.result()
+        except Exception as exc:
+            logging.error(f"[ERROR] Episode #{key}: {exc}")
+            return
+        save_state(state, [key])
 
         # Print a running progress summary after each episode
         p = count_progress(state)
         logging.info(
-            f"[PROGRESS] TXT: {p['txt_done']} done / {p['txt_na']} NA / {p['txt_pending']} pending  |  "
+            f"[PROGRESS] #{key} — TXT: {p['txt_done']} done / {p['txt_na']} NA / {p['txt_pending']} pending  |  "
             f"Notes: {p['notes_done']} done / {p['notes_na']} NA / {p['notes_pending']} pending"
         )
-        return state  # one episode per tick; caller will sleep then call again
 
-    # All episodes fully resolved — nothing to download this tick
+    queue   = iter(keys)
+    futures = {}   # Future -> episode key, at most CATCHUP_MAX_IN_FLIGHT
+    pool    = ThreadPoolExecutor(max_workers=CATCHUP_MAX_IN_FLIGHT)
+    try:
+        while True:
+            for key in queue:
+                futures[pool.submit(
+                    attempt_episode, int(key), dict(state["episodes"][key]), pace=False
+                )] = key
+                if len(futures) >= CATCHUP_MAX_IN_FLIGHT:
+                    break
+            if not futures:
+                break
+            done, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for future in done:
+                finish(future, futures.pop(future))
+    except KeyboardInterrupt:
+        logging.info(f"[CATCHUP] Interrupted — finishing {len(futures)} episode(s) in flight")
+        pool.shutdown(wait=True, cancel_futures=True)
+        for future, key in futures.items():
+            if not future.cancelled():
+                finish(future, key)
+        raise
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+    log_http_stats()
     return state
 
 
@@ -490,8 +1147,9 @@ def already_ran_this_week(state: dict) -> bool:
 def run_maintenance_check(state: dict) -> dict:
     """
     Wednesday maintenance run: check for new episodes published since last week.
-    Scrapes main page and the 2025 archive for new episode numbers, downloads
-    any missing files, and records the run date in state.
+    Revalidates only the main page and the current year's archive (conditional
+    GET through the PageCache) for new episode numbers, downloads any missing
+    files, and records the run date in state.
     """
     today_str = date.today().isoformat()
     logging.info(f"[WEEKLY_CHECK] Wednesday maintenance check — {today_str}")
@@ -503,11 +1161,13 @@ def run_maintenance_check(state: dict) -> dict:
         ARCHIVE_URL_TMPL.format(year=current_year),
     ]
 
+    cache = PageCache(PAGE_CACHE_FILE)
     new_eps: set[int] = set()
     for url in urls_to_check:
-        html = fetch_html(url)
-        if html:
-            new_eps.update(extract_episode_numbers(html))
+        found = scrape_episode_numbers(url, cache)
+        if found:
+            new_eps.update(found)
+    cache.save()
 
     # Register any newly discovered episodes
     added = 0
@@ -523,7 +1183,7 @@ def run_maintenance_check(state: dict) -> dict:
     downloaded_ep_count = 0
     for key in sorted_ep_keys(state):
         rec = state["episodes"][key]
-        if rec["txt"] in (STATUS_DONE, STATUS_NA) and rec["notes"] in (STATUS_DONE, STATUS_NA):
+        if is_resolved(rec):
             continue  # nothing to do for this episode
         ep = int(key)
         logging.info(f"--- Maintenance: Episode #{ep} ---")
@@ -536,6 +1196,7 @@ def run_maintenance_check(state: dict) -> dict:
     logging.info(
         f"[WEEKLY_CHECK] Done — {downloaded_ep_count} episode(s) had files downloaded/checked."
     )
+    log_http_stats()
     return state
 
 
@@ -567,7 +1228,7 @@ def run_dry_run() -> None:
     shown = 0
     for key in sorted_ep_keys(state):
         rec = state["episodes"][key]
-        if rec["txt"] in (STATUS_DONE, STATUS_NA) and rec["notes"] in (STATUS_DONE, STATUS_NA):
+        if is_resolved(rec):
             continue
         ep = int(key)
         attempt_episode(ep, rec, dry_run=True)
@@ -587,18 +1248,9 @@ def run_test(n: int) -> None:
         state = build_master_list(state)
     state = prescan_disk(state)
 
-    done = 0
-    for key in sorted_ep_keys(state):
-        rec = state["episodes"][key]
-        if rec["txt"] in (STATUS_DONE, STATUS_NA) and rec["notes"] in (STATUS_DONE, STATUS_NA):
-            continue
-        ep = int(key)
-        logging.info(f"--- TEST: Episode #{ep} ({done+1}/{n}) ---")
-        state["episodes"][key] = attempt_episode(ep, rec)
-        save_state(state)
-        done += 1
-        if done >= n:
-            break
+    pending = sum(1 for rec in state["episodes"].values() if not is_resolved(rec))
+    done    = min(n, pending)
+    state   = run_catchup_pass(state, limit=n)
 
     logging.info(f"[TEST] Complete — processed {done} episode(s). Exiting.")
 
@@ -607,7 +1259,8 @@ def run_continuous() -> None:
     """
     Main continuous run loop.
 
-    Phase 1 (catch-up): downloads missing files 1 episode per minute, newest first.
+    Phase 1 (catch-up): downloads missing files concurrently, newest first,
+                        then retries errored files every CATCHUP_TICK_SECS.
     Phase 2 (maintenance): checks for new episodes every Wednesday.
 
     The loop runs forever until killed (Ctrl-C or process termination).
@@ -635,7 +1288,7 @@ def run_continuous() -> None:
         while True:
             # ── Catch-up phase ────────────────────────────────────────────────
             if state["mode"] == "catching_up":
-                state = run_catchup_tick(state)
+                state = run_catchup_pass(state)
 
                 if is_all_complete(state):
                     p = count_progress(state)
@@ -672,6 +1325,33 @@ def run_continuous() -> None:
 
 # ─── CLI argument parsing ─────────────────────────────────────────────────────
 
+def configure(
+    download_dir: Path | None = None,
+    base_url: str | None = None,
+    workers: int | None = None,
+    rate: float | None = None,
+) -> None:
+    """Override the module-level paths, URLs and catch-up budget from the CLI."""
+    global DOWNLOAD_DIR, STATE_DB, STATE_FILE, LOG_FILE, PAGE_CACHE_FILE
+    global BASE_URL, MAIN_PAGE_URL, ARCHIVE_URL_TMPL
+    global CATCHUP_MAX_IN_FLIGHT, CATCHUP_RATE_PER_SEC
+
+    if download_dir is not None:
+        DOWNLOAD_DIR    = Path(download_dir)
+        STATE_DB        = DOWNLOAD_DIR / "sn_state.db"
+        STATE_FILE      = DOWNLOAD_DIR / "sn_state.json"
+        LOG_FILE        = DOWNLOAD_DIR / "sn_download.log"
+        PAGE_CACHE_FILE = DOWNLOAD_DIR / "sn_page_cache.json"
+    if base_url is not None:
+        BASE_URL         = base_url.rstrip("/")
+        MAIN_PAGE_URL    = f"{BASE_URL}/securitynow.htm"
+        ARCHIVE_URL_TMPL = f"{BASE_URL}/sn/past/{{year}}.htm"
+    if workers is not None:
+        CATCHUP_MAX_IN_FLIGHT = max(1, workers)
+    if rate is not None:
+        CATCHUP_RATE_PER_SEC = max(0.01, rate)
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(
         description="Security Now! transcript and show-notes downloader",
@@ -682,6 +1362,8 @@ def main() -> None:
             "  python security_now_downloader.py --dry-run    # preview only\n"
             "  python security_now_downloader.py --test 5     # download 5 episodes\n"
             "  python security_now_downloader.py --reset      # wipe state and restart\n"
+            "  python security_now_downloader.py --base-url http://127.0.0.1:8000 \\\n"
+            "      --download-dir ./sn_test --rate 50 --test 20  # local test server\n"
         )
     )
     parser.add_argument(
@@ -694,18 +1376,42 @@ def main() -> None:
     )
     parser.add_argument(
         "--reset", action="store_true",
-        help="Delete the state file so the master list is rebuilt from scratch"
+        help="Delete the saved state so the master list is rebuilt from scratch"
+    )
+    parser.add_argument(
+        "--workers", type=int, metavar="N", default=CATCHUP_MAX_IN_FLIGHT,
+        help=f"Episodes downloading at once during catch-up (default {CATCHUP_MAX_IN_FLIGHT})"
+    )
+    parser.add_argument(
+        "--rate", type=float, metavar="R", default=CATCHUP_RATE_PER_SEC,
+        help=f"Max requests per second to one host (default {CATCHUP_RATE_PER_SEC:g})"
+    )
+    parser.add_argument(
+        "--base-url", metavar="URL",
+        help="Download from this server instead of GRC (e.g. a local test server)"
+    )
+    parser.add_argument(
+        "--download-dir", type=Path, metavar="DIR",
+        help="Save files, state and log in DIR instead of the default folder"
     )
     args = parser.parse_args()
+    configure(
+        download_dir=args.download_dir,
+        base_url=args.base_url,
+        workers=args.workers,
+        rate=args.rate,
+    )
 
     # Ensure the download folder exists before setting up logging (log file lives there)
     DOWNLOAD_DIR.mkdir(parents=True, exist_ok=True)
     setup_logging()
 
     if args.reset:
-        if STATE_FILE.exists():
-            STATE_FILE.unlink()
-            logging.info("[RESET] State file deleted — will rebuild master list on next run")
+        if STATE_DB.exists() or STATE_FILE.exists():
+            reset_state()
+            logging.info("[RESET] State database deleted — will rebuild master list on next run")
+        if PAGE_CACHE_FILE.exists():
+            PAGE_CACHE_FILE.unlink()   # rebuild from scratch means refetching every page
 
     if args.dry_run:
         run_dry_run()
@@ -0,0 +1,393 @@
+#!/usr/bin/env python3
+"""
+security_now_to_vault.py
+
+Converts the Security Now! transcripts fetched by security_now_downloader.py
+(sn-NNNN.txt) into Obsidian notes and keeps an SQLite FTS5 full-text index
+of every transcript paragraph for fast searching.
+
+Usage:
+  python security_now_to_vault.py                    # convert new/changed transcripts + index
+  python security_now_to_vault.py --force            # reconvert and reindex everything
+  python security_now_to_vault.py --prune            # also drop episodes whose transcript is gone
+  python security_now_to_vault.py --query "zero trust"         # search the index
+  python security_now_to_vault.py --query "NEAR(spinrite ssd)" --limit 50
+
+Conversion:
+  - Frontmatter from the transcript header (EPISODE / DATE / TITLE / HOSTS / SOURCE)
+  - Hard-wrapped lines reflowed into paragraphs; speaker labels ("STEVE:") in bold
+  - Transcripts are converted in parallel worker processes; the SHA-256 of each
+    source file is recorded so unchanged transcripts are skipped on later runs
+  - With --prune, a deleted transcript's note and index rows are removed too
+
+Index (sn_transcripts.db beside the transcripts):
+  episodes   — one row per episode: source hash, title, date, note path
+  paragraphs — FTS5 table of reflowed paragraphs (porter stemming); rowid is
+               episode * PARA_STRIDE + paragraph number
+--query takes FTS5 syntax (words, "phrases", AND/OR/NOT, NEAR, prefix*).
+"""
+
+import argparse
+import hashlib
+import re
+import sqlite3
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+
+from obsidian_yaml import yaml_quote
+
+# ─── Configuration constants ──────────────────────────────────────────────────
+
+# Folder the downloader saves sn-NNNN.txt transcripts into
+TRANSCRIPT_DIR = Path(r"D:\Documents\Computer Docs\Security now")
+
+# Vault folder for the converted episode notes; created if absent
+VAULT_OUTPUT = Path(r"C:\Users\awt\Sync\Obsidian\01\Technology\Security Now")
+
+# Full-text index + conversion record
+INDEX_DB_NAME = "sn_transcripts.db"
+
+# Worker processes for conversion (None = one per CPU)
+DEFAULT_WORKERS = None
+
+# FTS rowid = episode * PARA_STRIDE + paragraph number (no transcript comes close)
+PARA_STRIDE = 100_000
+
+# Transcript filenames: plain and zero-padded episode numbers
+TRANSCRIPT_RE = re.compile(r"^sn-(\d+)\.txt$", re.IGNORECASE)
+
+# Header lines: "EPISODE:\t#1000", "DATE:\t\tNovember 26, 2024", ...
+HEADER_RE = re.compile(r"^([A-Z][A-Z ]{1,20}):\s+(.*\S)\s*$")
+
+# Speaker label at the start of a paragraph: "STEVE:  ", "LEO LAPORTE:  "
+SPEAKER_RE = re.compile(r"^([A-Z][A-Z.'\- ]{1,40}):\s+")
+
+# Header keys copied into the note frontmatter
+HEADER_KEYS = ("SERIES", "EPISODE", "DATE", "TITLE", "HOSTS", "SPEAKERS", "SOURCE")
+
+# Characters Windows doesn't allow in filenames
+UNSAFE_FILENAME_RE = re.compile(r'[<>:"/\\|?*\x00-\x1f]')
+
+
+# ─── Transcript parsing ───────────────────────────────────────────────────────
+
+def decode_transcript(data: bytes) -> str:
+    """Decode transcript bytes: UTF-8 when valid, else Windows-1252 (older episodes)."""
+    try:
+        return data.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        return data.decode("cp1252", errors="replace")
+
+
+def parse_transcript(text: str) -> tuple[dict, list[str]]:
+    """
+    Split a transcript into its header fields and reflowed body paragraphs.
+
+    The header is the leading block of "KEY:  value" lines (the GRC banner
+    line before it is skipped).  The body is split on blank lines and each
+    paragraph's hard-wrapped lines are joined with single spaces.
+
+    returns : (header dict keyed by upper-case field name, paragraph list)
+    """
+    header: dict[str, str] = {}
+    lines  = text.replace("\r\n", "\n").replace("\r", "\n").split("\n")
+
+    # Header: KEY: value lines near the top, up to the first body paragraph
+    body_start = 0
+    for i, line in enumerate(lines[:40]):
+        m = HEADER_RE.match(line)
+        if m and m.group(1) in HEADER_KEYS + ("ARCHIVE", "FILE ARCHIVE"):
+            header[m.group(1)] = m.group(2).strip()
+            body_start = i + 1
+        elif header and line.strip() and not m:
+            break
+
+    # Body: blank-line separated paragraphs, reflowed
+    paragraphs: list[str] = []
+    current:    list[str] = []
+    for line in lines[body_start:]:
+        if line.strip():
+            current.append(line.strip())
+        elif current:
+            paragraphs.append(" ".join(" ".join(current).split()))
+            current = []
+    if current:
+        paragraphs.append(" ".join(" ".join(current).split()))
+    return header, paragraphs
+
+
+def episode_date(raw: str) -> str | None:
+    """Convert a header date like 'November 26, 2024' to ISO 'YYYY-MM-DD'."""
+    for fmt in ("%B %d, %Y", "%b %d, %Y", "%B %d %Y"):
+        try:
+            return datetime.strptime(raw.strip(), fmt).strftime("%Y-%m-%d")
+        except ValueError:
+            continue
+    return None
+
+
+def note_filename(ep: int, title: str) -> str:
+    """'SN 1000 - The Journey to 1000.md', with unsafe characters removed."""
+    safe = UNSAFE_FILENAME_RE.sub("", title).strip(" .")
+    return f"SN {ep:04d} - {safe}.md" if safe else f"SN {ep:04d}.md"
+
+
+def build_note(ep: int, header: dict, paragraphs: list[str]) -> str:
+    """Assemble the full note text: frontmatter, H1 heading and body paragraphs."""
+    title = header.get("TITLE", f"Episode {ep}")
+    lines = ["---", f"title: {yaml_quote(title)}", f"episode: {ep}"]
+    iso = episode_date(header.get("DATE", ""))
+    if iso:
+        lines.append(f"date: {iso}")
+    hosts = header.get("HOSTS") or header.get("SPEAKERS")
+    if hosts:
+        lines.append(f"hosts: {yaml_quote(hosts)}")
+    if header.get("SOURCE"):
+        lines.append(f"source: {yaml_quote(header['SOURCE'])}")
+    lines.extend(["tags:", "  - security-now", "  - transcript", "---", ""])
+    lines.append(f"# Security Now! #{ep}: {title}")
+    lines.append("")
+
+    for para in paragraphs:
+        # Bold the speaker label so the conversation is easy to scan
+        lines.append(SPEAKER_RE.sub(lambda m: f"**{m.group(1)}:** ", para, count=1))
+        lines.append("")
+    return "\n".join(lines)
+
+
+def convert_transcript(src: str, ep: int, out_dir: str, old_note: str | None) -> dict:
+    """
+    Worker: convert one transcript to a note in out_dir.
+
+    Runs in a separate process, so it takes and returns plain values.
+    Removes old_note when the title (and so the filename) has changed.
+
+    returns : {"ep", "title", "date", "note", "paragraphs"}
+    """
+    header, paragraphs = parse_transcript(decode_transcript(Path(src).read_bytes()))
+    title = header.get("TITLE", f"Episode {ep}")
+    note  = Path(out_dir) / note_filename(ep, title)
+    note.write_text(build_note(ep, header, paragraphs), encoding="utf-8")
+    if old_note and Path(old_note) != note:
+        Path(old_note).unlink(missing_ok=True)
+    return {
+        "ep":         ep,
+        "title":      title,
+        "date":       episode_date(header.get("DATE", "")),
+        "note":       str(note),
+        "paragraphs": paragraphs,
+    }
+
+
+# ─── Index ────────────────────────────────────────────────────────────────────
+
+def open_index(db_path: Path) -> sqlite3.Connection:
+    """Open (creating if needed) the episodes table and FTS5 paragraph index."""
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    with conn:
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS episodes ("
+            "ep INTEGER PRIMARY KEY, src_hash TEXT NOT NULL, title TEXT, "
+            "date TEXT, note TEXT)"
+        )
+        conn.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS paragraphs USING fts5("
+            "text, tokenize = 'porter unicode61')"
+        )
+    return conn
+
+
+def index_episode(conn: sqlite3.Connection, result: dict, src_hash: str) -> None:
+    """Replace one episode's record and paragraph rows (caller commits)."""
+    ep   = result["ep"]
+    base = ep * PARA_STRIDE
+    conn.execute(
+        "DELETE FROM paragraphs WHERE rowid BETWEEN ? AND ?", (base, base + PARA_STRIDE - 1)
+    )
+    conn.executemany(
+        "INSERT INTO paragraphs (rowid, text) VALUES (?, ?)",
+        ((base + i, para) for i, para in enumerate(result["paragraphs"])),
+    )
+    conn.execute(
+        "INSERT INTO episodes (ep, src_hash, title, date, note) VALUES (?, ?, ?, ?, ?) "
+        "ON CONFLICT(ep) DO UPDATE SET src_hash = excluded.src_hash, "
+        "title = excluded.title, date = excluded.date, note = excluded.note",
+        (ep, src_hash, result["title"], result["date"], result["note"]),
+    )
+
+
+def remove_episode(conn: sqlite3.Connection, ep: int) -> None:
+    """Drop one episode's record and paragraph rows (caller commits)."""
+    base = ep * PARA_STRIDE
+    conn.execute(
+        "DELETE FROM paragraphs WHERE rowid BETWEEN ? AND ?", (base, base + PARA_STRIDE - 1)
+    )
+    conn.execute("DELETE FROM episodes WHERE ep = ?", (ep,))
+
+
+def find_transcripts(transcript_dir: Path) -> dict[int, Path]:
+    """Map episode number -> transcript path for every sn-NNNN.txt in the folder."""
+    found: dict[int, Path] = {}
+    for path in transcript_dir.iterdir():
+        m = TRANSCRIPT_RE.match(path.name)
+        if m and path.is_file():
+            found[int(m.group(1))] = path
+    return found
+
+
+def run_convert(
+    transcript_dir: Path,
+    out_dir: Path,
+    db_path: Path,
+    force: bool = False,
+    workers: int | None = DEFAULT_WORKERS,
+    prune: bool = False,
+) -> None:
+    """
+    Convert every new or changed transcript and update the index.
+
+    Source files are hashed up front; an episode is skipped when its hash
+    matches the indexed one and its note still exists.  With prune, episodes
+    whose transcript has gone lose their note and index rows; otherwise
+    they are left alone, so a partial transcripts folder can't wipe notes
+    (which may hold edits).  Conversions run in
+    a process pool and this process is the single writer to the index,
+    committing once per episode as results arrive.
+    """
+    out_dir.mkdir(parents=True, exist_ok=True)
+    conn = open_index(db_path)
+    known = {
+        ep: (src_hash, note)
+        for ep, src_hash, note in conn.execute("SELECT ep, src_hash, note FROM episodes")
+    }
+
+    # Decide what needs converting
+    todo: list[tuple[int, Path, str]] = []
+    transcripts = find_transcripts(transcript_dir)
+    for ep, path in sorted(transcripts.items(), reverse=True):
+        src_hash = hashlib.sha256(path.read_bytes()).hexdigest()
+        prev = known.get(ep)
+        if not force and prev and prev[0] == src_hash and prev[1] and Path(prev[1]).exists():
+            continue
+        todo.append((ep, path, src_hash))
+
+    # Drop episodes whose transcript no longer exists (only when asked)
+    gone = sorted(set(known) - set(transcripts)) if prune else []
+    for ep in gone:
+        note = known[ep][1]
+        if note and Path(note).exists():
+            print(f"  Removing sn-{ep}: {note}")
+            Path(note).unlink()
+        with conn:
+            remove_episode(conn, ep)
+
+    skipped = len(transcripts) - len(todo)
+    print(
+        f"Transcripts: {len(transcripts)} found, {skipped} unchanged, {len(todo)} to convert"
+        + (f", {len(gone)} removed" if gone else "")
+    )
+    if not todo:
+        conn.close()
+        return
+
+    start = time.perf_counter()
+    converted = failed = 0
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(
+                convert_transcript, str(path), ep, str(out_dir),
+                known.get(ep, (None, None))[1],
+            ): (ep, src_hash)
+            for ep, path, src_hash in todo
+        }
+        for future in as_completed(futures):
+            ep, src_hash = futures[future]
+            try:
+                result = future.result()
+            except Exception as exc:
+                print(f"  [ERROR] sn-{ep}: {exc}")
+                failed += 1
+                continue
+            with conn:
+                index_episode(conn, result, src_hash)
+            converted += 1
+
+    elapsed = time.perf_counter() - start
+    print(
+        f"Converted {converted} transcript(s) in {elapsed:.1f}s"
+        + (f", {failed} failed" if failed else "")
+        + f"  ->  {out_dir}"
+    )
+    conn.close()
+
+
+def run_query(db_path: Path, query: str, limit: int) -> int:
+    """Print the best-matching paragraphs for an FTS5 query; returns exit code."""
+    if not db_path.exists():
+        print(f"ERROR: index not found at {db_path} — run without --query first.")
+        return 1
+    conn = open_index(db_path)
+    start = time.perf_counter()
+    try:
+        rows = conn.execute(
+            "SELECT p.rowid, snippet(paragraphs, 0, '[', ']', '…', 16), e.title, e.date "
+            "FROM paragraphs p LEFT JOIN episodes e ON e.ep = p.rowid / ? "
+            "WHERE paragraphs MATCH ? ORDER BY rank LIMIT ?",
+            (PARA_STRIDE, query, limit),
+        ).fetchall()
+    except sqlite3.OperationalError as exc:
+        print(f"ERROR: bad query '{query}': {exc}")
+        return 1
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    for rowid, snippet, title, ep_date in rows:
+        ep, para = divmod(rowid, PARA_STRIDE)
+        print(f"#{ep} ¶{para}  {title or ''} ({ep_date or 'n.d.'})")
+        print(f"    {snippet}")
+    print(f"\n{len(rows)} hit(s) in {elapsed_ms:.1f} ms")
+    conn.close()
+    return 0
+
+
+# ─── CLI ──────────────────────────────────────────────────────────────────────
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Convert Security Now! transcripts to Obsidian notes and search them"
+    )
+    parser.add_argument("--query", metavar="TEXT",
+                        help="Search the full-text index instead of converting")
+    parser.add_argument("--limit", type=int, default=20,
+                        help="Maximum hits to show for --query (default 20)")
+    parser.add_argument("--force", action="store_true",
+                        help="Reconvert and reindex every transcript")
+    parser.add_argument("--prune", action="store_true",
+                        help="Delete notes and index rows of episodes whose transcript is gone")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                        help="Conversion worker processes (default: one per CPU)")
+    parser.add_argument("--transcripts", type=Path, default=TRANSCRIPT_DIR,
+                        help=f"Folder of sn-NNNN.txt files (default: {TRANSCRIPT_DIR})")
+    parser.add_argument("--vault", type=Path, default=VAULT_OUTPUT,
+                        help=f"Output folder for notes (default: {VAULT_OUTPUT})")
+    parser.add_argument("--db", type=Path,
+                        help=f"Index database (default: {INDEX_DB_NAME} in the transcripts folder)")
+    args = parser.parse_args()
+
+    db_path = args.db or args.transcripts / INDEX_DB_NAME
+    if args.query:
+        return run_query(db_path, args.query, args.limit)
+
+    if not args.transcripts.is_dir():
+        print(f"ERROR: transcript folder not found: {args.transcripts}")
+        return 1
+    run_convert(args.transcripts, args.vault, db_path, force=args.force, workers=args.workers,
+                prune=args.prune)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
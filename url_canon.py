@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+url_canon.py
+URL canonicalisation and duplicate detection for the bookmark tools
+(bookmark_cleanup.py merge/check phases, bookmark_organize.py).
+
+  strip_tracking(url): the URL to store and emit: tracking parameters removed,
+                       everything else (encoding, parameter order, blank
+                       values, fragment) exactly as given
+  canonical_url(url) : a normalised form, the basis of dedup_key(); lossy,
+                       so never written back as a bookmark URL
+                       - scheme and host lowercased, IDN hosts in punycode
+                       - default ports (:80 / :443) removed, empty path -> "/"
+                       - tracking parameters (utm_*, fbclid, gclid, ...) dropped
+                       - remaining query parameters sorted
+                       - plain #fragments dropped (#! and #/ app routes kept)
+  dedup_key(url)     : canonical_url() further folded so that variants of the
+                       same page collide: http/https, a leading "www." and a
+                       trailing slash are ignored
+  UrlIndex           : dict-backed hash index from dedup_key to a stored item
+
+Non-web URLs (chrome://, javascript:, mailto:, ...) are returned unchanged
+apart from trimming whitespace.
+"""
+
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# ─── Rules ────────────────────────────────────────────────────────────────────
+
+# Schemes that get full normalisation; anything else is left alone
+WEB_SCHEMES = {"http", "https"}
+
+# Ports that are implied by the scheme
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+# Query parameters that only carry click/campaign tracking
+TRACKING_PARAMS = {
+    "fbclid", "gclid", "dclid", "gbraid", "wbraid", "msclkid", "yclid",
+    "mc_cid", "mc_eid", "igshid", "_ga", "_gl", "_hsenc", "_hsmi",
+    "mkt_tok", "oly_anon_id", "oly_enc_id", "vero_id", "ref_src",
+}
+
+# Parameter name prefixes with the same meaning (utm_source, utm_medium, ...)
+TRACKING_PREFIXES = ("utm_",)
+
+# Characters left unescaped when re-encoding the query (as browsers send them)
+QUERY_SAFE = "/:@!$'()*,;"
+
+# Fragments that are client-side routes rather than in-page anchors
+ROUTE_FRAGMENT_PREFIXES = ("!", "/")
+
+
+# ─── Canonicalisation ─────────────────────────────────────────────────────────
+
+def _is_tracking(name):
+    """True if a query parameter name is a known tracking parameter."""
+    lname = name.lower()
+    return lname in TRACKING_PARAMS or lname.startswith(TRACKING_PREFIXES)
+
+
+def strip_tracking(url):
+    """
+    Return url without its tracking query parameters, otherwise untouched:
+    the remaining parameters keep their order, encoding and blank values,
+    and the fragment is kept.  Non-web URLs are only trimmed.
+    """
+    url = url.strip()
+    if url.split(":", 1)[0].lower() not in WEB_SCHEMES:
+        return url
+    rest, hash_, fragment = url.partition("#")
+    base, question, query = rest.partition("?")
+    if not question:
+        return url
+    kept = [p for p in query.split("&") if not _is_tracking(p.split("=", 1)[0])]
+    query = "&".join(kept)
+    return base + ("?" + query if query else "") + hash_ + fragment
+
+
+def _normalize_host(host):
+    """Lowercase host, drop a trailing dot, and encode IDN labels as punycode."""
+    host = host.lower().rstrip(".")
+    try:
+        host.encode("ascii")
+    except UnicodeEncodeError:
+        try:
+            host = host.encode("idna").decode("ascii")
+        except UnicodeError:
+            pass  # not valid IDNA — keep the lowercased Unicode form
+    return host
+
+
+def canonical_url(url):
+    """
+    Return the canonical form of url (see module docstring).
+    Malformed URLs (e.g. a non-numeric port) are returned trimmed but
+    otherwise unchanged.
+    """
+    url = url.strip()
+    try:
+        parts  = urlsplit(url)
+        scheme = parts.scheme.lower()
+        if scheme not in WEB_SCHEMES or not parts.hostname:
+            return url
+        port = parts.port
+    except ValueError:
+        return url
+
+    host = _normalize_host(parts.hostname)
+    if ":" in host:
+        host = f"[{host}]"  # IPv6 literal
+    if port is not None and port != DEFAULT_PORTS[scheme]:
+        host = f"{host}:{port}"
+    userinfo = parts.netloc.rpartition("@")[0]
+    netloc   = f"{userinfo}@{host}" if userinfo else host
+
+    path = parts.path or "/"
+
+    # Drop tracking parameters, then sort the rest by name (stable for repeats)
+    params = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+              if not _is_tracking(k)]
+    params.sort(key=lambda kv: kv[0])
+    query = urlencode(params, doseq=True, safe=QUERY_SAFE)
+
+    fragment = parts.fragment if parts.fragment.startswith(ROUTE_FRAGMENT_PREFIXES) else ""
+
+    return urlunsplit((scheme, netloc, path, query, fragment))
+
+
+def dedup_key(url):
+    """
+    Return the key under which variants of the same page collide:
+    canonical_url() without the scheme, a leading 'www.', or a trailing slash.
+    """
+    canon = canonical_url(url)
+    try:
+        parts = urlsplit(canon)
+    except ValueError:
+        return canon.lower()
+    if parts.scheme not in WEB_SCHEMES:
+        return canon.rstrip("/").lower()
+
+    netloc = parts.netloc
+    if netloc.startswith("www."):
+        netloc = netloc[4:]
+    path = parts.path.rstrip("/")
+    key  = netloc + path
+    if parts.query:
+        key += "?" + parts.query
+    if parts.fragment:
+        key += "#" + parts.fragment
+    return key
+
+
+# ─── Hash index ───────────────────────────────────────────────────────────────
+
+class UrlIndex:
+    """
+    Hash index of items by dedup_key(url).
+
+    add() stores an item under its URL's key and returns None, or returns
+    the item already stored under that key (a duplicate), leaving it in place.
+    """
+
+    def __init__(self):
+        self._items = {}   # dedup_key -> item
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, url):
+        return dedup_key(url) in self._items
+
+    def get(self, url, default=None):
+        """Return the item stored for url's key, or default."""
+        return self._items.get(dedup_key(url), default)
+
+    def add(self, url, item):
+        """Store item under url's key unless one is there; return the existing item."""
+        key = dedup_key(url)
+        existing = self._items.get(key)
+        if existing is None:
+            self._items[key] = item
+        return existing
+
+    def values(self):
+        """Stored items in insertion order."""
+        return list(self._items.values())